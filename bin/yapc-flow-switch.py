@@ -9,8 +9,11 @@ import yapc.comm.openflow as ofcomm
 import yapc.log.output as output
 import yapc.events.openflow as ofevents
 import yapc.netstate.swhost as switchhost
+import yapc.netstate.flowtable as flowtable
 import yapc.forwarding.switching as fswitch
 import yapc.forwarding.default as default
+import yapc.forwarding.flows as flows
+import yapc.pyopenflow as pyof
 import yapc.debug.openflow as ofdbg
 import sys
 import getopt
@@ -24,6 +27,14 @@ class flow_switch(yapc.daemon):
         self.port = 6633
         ##Send flow removed or not
         self.fpr = False
+        ##Number of workers to dispatch events over
+        self.workers = 0
+        ##Match of flow rules
+        self.mode = fswitch.learningswitch.EXACT
+        ##Idle timeout of flow rules
+        self.idle_timeout = flows.DEFAULT_TIMEOUT
+        ##Hard timeout of flow rules
+        self.hard_timeout = pyof.OFP_FLOW_PERMANENT
         
     def run(self):
         """Run server
@@ -42,15 +53,19 @@ class flow_switch(yapc.daemon):
         ofparse = ofevents.parser(server)
         #Switch-host binding
         swhost = switchhost.mac2sw_binding(server)
+        #Shadow flow tables
+        tables = flowtable.shadow_tables(server)
         #Flow switch
         fsw = fswitch.learningswitch(server, ofconn.connections,
-                                     self.fpr)
+                                     self.fpr, self.mode,
+                                     self.idle_timeout, self.hard_timeout,
+                                     tables)
         if (self.fpr):
             pfr = ofdbg.show_flow_removed(server)
         #Drop unhandled flows
         fp = default.floodpkt(server, ofconn.connections)
 
-        server.run()
+        server.run(workers=self.workers)
         
         sys.exit(0)
         
@@ -67,14 +82,21 @@ def usage():
     print "--very-verbose\n\tVery verbose output"
     print "-d/--daemon\n\tRun as daemon"
     print "-p/--port\n\tTCP port to run controller on (default: 6633)"
+    print "-w/--workers\n\tNumber of workers to dispatch switches' events over (default: 0)"
+    print "--match\n\tMatch of flow rules: exact, dl_dst or in_port,dl_dst (default: exact)"
+    print "--idle-timeout\n\tIdle timeout of flow rules (default: "+\
+        str(flows.DEFAULT_TIMEOUT)+")"
+    print "--hard-timeout\n\tHard timeout of flow rules (default: 0, i.e., none)"
 
 fs = flow_switch()
 
 #Parse options and arguments
 try:
-    opts, args = getopt.getopt(sys.argv[1:], "hvdp:",
+    opts, args = getopt.getopt(sys.argv[1:], "hvdp:w:",
                                ["help","verbose","daemon", 
-                                "very-verbose", "port=", "flow-removed"])
+                                "very-verbose", "port=", "flow-removed",
+                                "workers=", "match=", "idle-timeout=",
+                                "hard-timeout="])
 except getopt.GetoptError:
     print "Option error!"
     usage()
@@ -87,12 +109,26 @@ for opt,arg in opts:
         sys.exit(0)
     elif (opt in ("-p","--port")):
         fs.port = int(arg)
+    elif (opt in ("-w","--workers")):
+        fs.workers = int(arg)
     elif (opt in ("-v","--verbose")):
         fs.debug="DBG"
     elif (opt in ("--very-verbose")):
         fs.debug="VDBG"
     elif (opt in ("--flow-removed")):
         fs.fpr = True
+    elif (opt == "--match"):
+        modes = {"exact": fswitch.learningswitch.EXACT,
+                 "dl_dst": fswitch.learningswitch.DL_DST,
+                 "in_port,dl_dst": fswitch.learningswitch.IN_PORT_DL_DST}
+        if (arg not in modes):
+            print "Unknown match :"+arg
+            sys.exit(2)
+        fs.mode = modes[arg]
+    elif (opt == "--idle-timeout"):
+        fs.idle_timeout = int(arg)
+    elif (opt == "--hard-timeout"):
+        fs.hard_timeout = int(arg)
     elif (opt in ("-d","--daemon")):
         fs.daemon=True
     else:
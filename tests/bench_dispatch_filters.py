@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+##Compare dispatch of packet in to handlers checking packets themselves
+##against handlers registered with filters
+#
+import yapc.log.output as output
+import yapc.interface as yapc
+import yapc.core as core
+import yapc.events.openflow as ofevents
+import yapc.pyopenflow as pyof
+import time
+import sys
+
+output.set_mode("INFO")
+n = 100000
+if (len(sys.argv) > 1):
+    n = int(sys.argv[1])
+handlers = 50
+
+class checking_handler(yapc.component):
+    """Handler that checks Ethernet type of packet in itself
+    """
+    def __init__(self, dl_type):
+        self.dl_type = dl_type
+        self.count = 0
+
+    def processevent(self, event):
+        if (isinstance(event, ofevents.pktin) and
+            (event.match.dl_type == self.dl_type)):
+            self.count += 1
+        return True
+
+class filtered_handler(checking_handler):
+    """Handler that relies on filter
+    """
+    def processevent(self, event):
+        self.count += 1
+        return True
+
+#Packet ins of Ethernet types handled by handlers
+events = []
+for i in range(0, 256):
+    m = pyof.ofp_match()
+    m.dl_type = 0x8800+(i % handlers)
+    e = ofevents.pktin(None, pyof.ofp_header().pack())
+    e.match = m
+    events.append(e)
+events = (events * (n/len(events)+1))[:n]
+
+def measure(name, cls, filtered):
+    """Measure and output rate of dispatch
+
+    @param name name of setup
+    @param cls class of handler
+    @param filtered register with filter or not
+    @return time taken
+    """
+    d = core.event_dispatcher(None)
+    for i in range(0, handlers):
+        h = cls(0x8800+i)
+        if (filtered):
+            d.registereventhandler(ofevents.pktin.name, h,
+                                   {"dl_type": h.dl_type})
+        else:
+            d.registereventhandler(ofevents.pktin.name, h)
+    t = time.time()
+    for e in events:
+        d._dispatch_event(e)
+    t = time.time()-t
+    output.info("%s: %.0f packet in/s" % (name, n/t))
+    return t
+
+c = measure("Handlers checking (%d)" % handlers, checking_handler, False)
+f = measure("Handlers filtered (%d)" % handlers, filtered_handler, True)
+output.info("Speedup %.2fx" % (c/f))
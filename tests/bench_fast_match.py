@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+##Compare throughput of match from dpkt against match from fixed offsets
+#
+import yapc.log.output as output
+import yapc.util.openflow as ofutil
+import yapc.events.openflow as ofevents
+import yapc.pyopenflow as pyof
+import socket
+import time
+import dpkt
+import sys
+
+output.set_mode("INFO")
+n = 50000
+if (len(sys.argv) > 1):
+    n = int(sys.argv[1])
+
+#Form TCP packets
+pkts = []
+for i in range(0, 1000):
+    tcp = dpkt.tcp.TCP(sport=1024+i, dport=80)
+    ip = dpkt.ip.IP(src=socket.inet_aton("10.0.0.1"),
+                    dst=socket.inet_aton("10.0.1.%d" % (i % 250)),
+                    p=dpkt.ip.IP_PROTO_TCP, data=tcp)
+    ip.len = len(ip)
+    eth = dpkt.ethernet.Ethernet(src="\x00\x00\x00\x00\x00\x01",
+                                 dst="\x00\x00\x00\x00\x00\x02",
+                                 type=dpkt.ethernet.ETH_TYPE_IP, data=ip)
+    pkts.append(eth.pack())
+pkts = (pkts * (n/len(pkts)+1))[:n]
+
+def measure(name, function):
+    """Measure and output rate of function over packets
+
+    @param name name of function
+    @param function function taking in_port and packet
+    @return time taken
+    """
+    t = time.time()
+    for p in pkts:
+        function(1, p)
+    t = time.time()-t
+    output.info("%s: %.0f packets/s" % (name, n/t))
+    return t
+
+base = measure("get_ofp_match (dpkt)", ofutil.get_ofp_match)
+for (name, f) in [("get_fast_ofp_match", ofutil.get_fast_ofp_match),
+                  ("get_fast_match", ofutil.get_fast_match)]:
+    output.info("\t%.1fx" % (base/measure(name, f)))
+
+#Packet in events
+msgs = []
+for p in pkts:
+    pi = pyof.ofp_packet_in()
+    pi.in_port = 1
+    pi.total_len = len(p)
+    pi.header.length = pyof.OFP_PACKET_IN_BYTES+len(p)
+    msgs.append(pi.pack()+p)
+t = time.time()
+for m in msgs:
+    ofevents.pktin(None, m)
+output.info("pktin: %.0f events/s" % (n/(time.time()-t)))
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+##Compare decoding of flow stats replies by slicing against by offset,
+##and reassemble the replies of a large table
+#
+import yapc.log.output as output
+import yapc.events.openflow as ofevents
+import yapc.pyopenflow as pyof
+import yapc.ofcodec as ofcodec
+import time
+import sys
+
+output.set_mode("INFO")
+n = 100000
+if (len(sys.argv) > 1):
+    n = int(sys.argv[1])
+
+class fake_server:
+    """Server that collects events posted
+    """
+    def __init__(self):
+        self.events = []
+
+    def register_event_handler(self, eventname, handler):
+        pass
+
+    def post_event(self, event):
+        self.events.append(event)
+
+#Form flow stats replies (with one output action each), as many as
+#fits in each reply
+flow = pyof.ofp_flow_stats()
+oao = pyof.ofp_action_output()
+flow.length = pyof.OFP_FLOW_STATS_BYTES+oao.len
+perreply = (0xffff-pyof.OFP_STATS_REPLY_BYTES)/flow.length
+replies = []
+for i in range(0, n, perreply):
+    body = ""
+    for j in range(i, min(n, i+perreply)):
+        flow.cookie = j
+        oao.port = j % 48
+        body += flow.pack()+oao.pack()
+    sr = pyof.ofp_stats_reply()
+    sr.header.type = pyof.OFPT_STATS_REPLY
+    sr.header.xid = 42
+    sr.header.length = pyof.OFP_STATS_REPLY_BYTES+len(body)
+    sr.type = pyof.OFPST_FLOW
+    if (i+perreply < n):
+        sr.flags = pyof.OFPSF_REPLY_MORE
+    replies.append(sr.pack()+body)
+output.info("%d flows in %d replies" % (n, len(replies)))
+
+#Decoding by slicing as before
+unpacker = ofevents.action_unpacker()
+t = time.time()
+flows = []
+for r in replies:
+    remaining = r[pyof.OFP_STATS_REPLY_BYTES:]
+    while (len(remaining) >= pyof.OFP_FLOW_STATS_BYTES):
+        f = ofcodec.view(pyof.ofp_flow_stats, remaining)
+        unpacker.unpack_actions(remaining[pyof.OFP_FLOW_STATS_BYTES:f.length],
+                                f.actions)
+        remaining = remaining[f.length:]
+        flows.append(f)
+sliced = time.time()-t
+output.info("By slicing: %.0f flows/s" % (len(flows)/sliced))
+del flows
+
+#Decoding by offset and reassembling
+server = fake_server()
+assembler = ofevents.flow_stats_assembler(server)
+t = time.time()
+for r in replies:
+    assembler.processevent(ofevents.decode_stats_reply(None, r))
+complete = server.events[0]
+count = len(complete.flows)
+offset = time.time()-t
+output.info("By offset: %.0f flows/s (%.2fx) with %d flows in xid %d" % \
+                (count/offset, sliced/offset, count, complete.xid))
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+##Compare lookup in shadow flow table against linear search of flows,
+##and time overlap checks
+#
+import yapc.log.output as output
+import yapc.netstate.flowtable as flowtable
+import yapc.util.openflow as ofutil
+import yapc.pyopenflow as pyof
+import random
+import time
+import sys
+
+output.set_mode("INFO")
+n = 10000
+if (len(sys.argv) > 1):
+    n = int(sys.argv[1])
+lookups = 10000
+
+#Exact flows, and /24 and /16 prefixes of destination IP
+PREFIXES = [(8, 200), (16, 100)]
+table = flowtable.flow_table()
+flows = []
+for i in range(0, n):
+    flows.append(flowtable.flow(ofutil.match(in_port=1, dl_type=0x0800,
+                                             nw_dst=0x0a000000+i), 100))
+for (bits, priority) in PREFIXES:
+    wildcards = (pyof.OFPFW_ALL & ~pyof.OFPFW_DL_TYPE & \
+                     ~pyof.OFPFW_NW_DST_MASK) | \
+                     (bits << pyof.OFPFW_NW_DST_SHIFT)
+    for i in range(0, n/100):
+        flows.append(flowtable.flow(ofutil.match(wildcards, dl_type=0x0800,
+                                                 nw_dst=0x0b000000+(i << bits)),
+                                    priority))
+for f in flows:
+    table.add(f)
+
+pkts = [ofutil.match(in_port=1, dl_type=0x0800,
+                     nw_dst=random.choice([0x0a000000, 0x0b000000])+
+                     random.randint(0, n))
+        for i in range(0, lookups)]
+
+#Linear search
+t = time.time()
+for p in pkts[:lookups/10]:
+    values = flowtable.get_values(p)
+    best = None
+    for f in flows:
+        if (((best == None) or (f.priority > best.priority)) and
+            (flowtable.get_key(values, f.mask) == f.key)):
+            best = f
+linear = (time.time()-t)*10
+output.info("Linear search of %d flows: %.0f lookup/s" % \
+                (len(flows), lookups/linear))
+
+#Shadow flow table
+t = time.time()
+for p in pkts:
+    table.lookup(p)
+indexed = time.time()-t
+output.info("Flow table: %.0f lookup/s (%.0fx)" % \
+                (lookups/indexed, linear/indexed))
+
+#Overlap check of /30 prefixes (over exact flows too)
+wildcards = (pyof.OFPFW_ALL & ~pyof.OFPFW_DL_TYPE & \
+                 ~pyof.OFPFW_NW_DST_MASK) | (2 << pyof.OFPFW_NW_DST_SHIFT)
+queries = [ofutil.match(wildcards, dl_type=0x0800,
+                        nw_dst=0x0a000000+random.randint(0, n))
+           for i in range(0, lookups/10)]
+t = time.time()
+table.get_overlaps(queries[0], 100)
+output.info("Index of flows for overlap check built in %.3fs" % \
+                (time.time()-t))
+t = time.time()
+found = 0
+for q in queries:
+    found += len(table.get_overlaps(q, 100))
+overlap = time.time()-t
+output.info("Overlap check: %.0f check/s (%d overlaps found)" % \
+                (len(queries)/overlap, found))
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+##Compare pack/unpack of pyopenflow as generated against yapc.ofcodec
+#
+import yapc.log.output as output
+import yapc.pyopenflow as pyof
+import yapc.ofcodec as ofcodec
+import time
+import sys
+
+output.set_mode("INFO")
+n = 100000
+if (len(sys.argv) > 1):
+    n = int(sys.argv[1])
+
+#Form messages
+pi = pyof.ofp_packet_in()
+pi.header.length = pyof.OFP_PACKET_IN_BYTES
+fm = pyof.ofp_flow_mod()
+fm.match.dl_src = [0, 0, 0, 0, 0, 1]
+fm.match.nw_src = 0x0a000001
+fm.actions.append(pyof.ofp_action_output())
+fs = pyof.ofp_flow_stats()
+fs.actions.append(pyof.ofp_action_output())
+msgs = [pyof.ofp_header(), pyof.ofp_match(), pi, fm, fs]
+
+def measure():
+    """Measure time per pack and unpack of each message
+
+    @return list of (name, pack time, unpack time)
+    """
+    r = []
+    for m in msgs:
+        packed = m.pack()
+        o = m.__class__()
+        t = time.time()
+        for i in xrange(n):
+            m.pack()
+        p = time.time()-t
+        t = time.time()
+        for i in xrange(n):
+            o.unpack(packed)
+        r.append((m.__class__.__name__, p, time.time()-t))
+    return r
+
+codec = measure()
+ofcodec.uninstall()
+generated = measure()
+ofcodec.install()
+
+for i in range(0, len(msgs)):
+    (name, p, u) = codec[i]
+    (name, gp, gu) = generated[i]
+    output.info("%s: pack %.2f us (%.1fx), unpack %.2f us (%.1fx)" % \
+                    (name, p*1e6/n, gp/p, u*1e6/n, gu/u))
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+##Measure per packet overhead of debug output at INFO level
+#
+import yapc.log.output as output
+import yapc.events.openflow as ofevents
+import yapc.pyopenflow as pyof
+import time
+import sys
+
+output.set_mode("INFO")
+n = 100000
+if (len(sys.argv) > 1):
+    n = int(sys.argv[1])
+
+#Packet in of TCP packet
+pkt = "\x00\x00\x00\x00\x00\x02\x00\x00\x00\x00\x00\x01\x08\x00"+\
+    "\x45\x00\x00\x28\x00\x00\x00\x00\x40\x06\x00\x00"+\
+    "\x0a\x00\x00\x01\x0a\x00\x01\x01"+\
+    "\x04\x00\x00\x50"+"\x00"*16
+pi = pyof.ofp_packet_in()
+pi.in_port = 1
+pi.total_len = len(pkt)
+pi.header.length = pyof.OFP_PACKET_IN_BYTES+len(pkt)
+msg = pi.pack()+pkt
+e = ofevents.pktin(None, msg)
+
+def measure(name, function):
+    """Measure and output time per call of function
+
+    @param name name of function
+    @param function function to call
+    @return time per call
+    """
+    t = time.time()
+    for i in xrange(0, n):
+        function()
+    t = (time.time()-t)/n
+    output.info("%s: %.2f us" % (name, t*1e6))
+    return t
+
+measure("Nothing", lambda: None)
+measure("Disabled debug", lambda: output.vdbg("Packet in", "pktin"))
+measure("Disabled debug (%-style)",
+        lambda: output.vdbg("Packet in on port %d", "pktin", 1))
+eager = measure("Disabled debug (eager show)",
+                lambda: output.vdbg("Packet in\n"+e.pktin.show("\t")+\
+                                        "Packet has match\n"+\
+                                        e.match.show("\t"), "pktin"))
+lazy = measure("Disabled debug (lazy show)",
+               lambda: output.vdbg(lambda: "Packet in\n"+\
+                                       e.pktin.show("\t")+\
+                                       "Packet has match\n"+\
+                                       e.match.show("\t"), "pktin"))
+output.info("Lazy formatting saves %.2f us per packet (%.0fx)" % \
+                ((eager-lazy)*1e6, eager/lazy))
+measure("Packet in event", lambda: ofevents.pktin(None, msg))
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+##Benchmark shortest path routing on fat-tree topology
+#
+# Times computation of path trees to all switches, lookup of paths
+# with cached trees, and updates on link down and up against 
+# recomputing all trees.
+#
+import yapc.log.output as output
+import yapc.forwarding.routing as routing
+import random
+import time
+import sys
+
+output.set_mode("INFO")
+k = 16
+if (len(sys.argv) > 1):
+    k = int(sys.argv[1])
+
+def fat_tree(k):
+    """Form k-ary fat-tree of (k/2)^2 core, k^2/2 aggregation and 
+    k^2/2 edge switches
+
+    @return (graph, list of edge switches, list of links)
+    """
+    g = routing.graph()
+    ports = {}
+    links = []
+    def link(a, b):
+        ports[a] = ports.get(a, 0)+1
+        ports[b] = ports.get(b, 0)+1
+        g.add_link(a, ports[a], b, ports[b])
+        g.add_link(b, ports[b], a, ports[a])
+        links.append((a, ports[a], b, ports[b]))
+    h = k/2
+    core = range(0, h*h)
+    edges = []
+    for p in range(0, k):
+        aggs = [1000+p*h+i for i in range(0, h)]
+        for e in [2000+p*h+i for i in range(0, h)]:
+            edges.append(e)
+            for a in aggs:
+                link(e, a)
+        for i in range(0, h):
+            for c in core[i*h:(i+1)*h]:
+                link(aggs[i], c)
+    return (g, edges, links)
+
+(g, edges, links) = fat_tree(k)
+switches = set(g.links.keys())
+output.info("Fat-tree of k=%d: %d switches, %d links" % \
+                (k, len(switches), len(links)*2))
+
+#All-pairs path trees
+t = time.time()
+for sw in switches:
+    g.get_tree(sw)
+alltrees = time.time()-t
+output.info("Compute %d path trees: %.3fs" % (len(switches), alltrees))
+
+#Path lookup with cached trees
+n = 100000
+pairs = [(random.choice(edges), random.choice(edges)) for i in range(0, n)]
+t = time.time()
+for (s, d) in pairs:
+    g.get_path(s, d, 1, 1)
+lookup = time.time()-t
+output.info("Lookup of path between edge switches: %.0f/s" % (n/lookup))
+
+#Link down and up, updating path trees
+m = min(100, len(links))
+updated = 0
+t = time.time()
+for (a, ap, b, bp) in random.sample(links, m):
+    updated += g.remove_link(a, b)+g.remove_link(b, a)
+    for sw in switches:
+        g.get_tree(sw)
+    updated += g.add_link(a, ap, b, bp)+g.add_link(b, bp, a, ap)
+incremental = (time.time()-t)/m
+output.info("Link down and up: %.4fs (%.0f trees updated per link)" % \
+                (incremental, float(updated)/m))
+output.info("Recompute all path trees: %.4fs (%.0fx)" % \
+                (alltrees*2, alltrees*2/incremental))
@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+##Compare packing flow mod per packet in against patching a template
+#
+import yapc.log.output as output
+import yapc.forwarding.flows as flows
+import yapc.pyopenflow as pyof
+import time
+import sys
+import gc
+
+output.set_mode("INFO")
+n = 100000
+if (len(sys.argv) > 1):
+    n = int(sys.argv[1])
+
+matches = []
+for i in range(0, n):
+    m = pyof.ofp_match()
+    m.in_port = 1+(i % 48)
+    m.dl_type = 0x0800
+    m.nw_dst = 0x0a000000+i
+    matches.append(m)
+
+#Pack per packet in (as learningswitch did)
+gc.collect()
+t = time.time()
+for m in matches:
+    flow = flows.exact_entry(m)
+    flow.set_buffer(flows.UNBUFFERED_ID)
+    flow.add_output(2)
+    flow.get_flow_mod(pyof.OFPFC_MODIFY).pack()
+packed = time.time()-t
+output.info("Pack: %.0f flow mod/s" % (n/packed))
+
+#Template
+flow = flows.exact_entry(pyof.ofp_match())
+flow.add_output(pyof.OFPP_NONE)
+template = flow.get_flow_mod_template(pyof.OFPFC_MODIFY)
+gc.collect()
+t = time.time()
+for m in matches:
+    template.pack(m, [2], buffer_id=flows.UNBUFFERED_ID)
+patched = time.time()-t
+output.info("Template: %.0f flow mod/s (%.2fx)" % (n/patched, packed/patched))
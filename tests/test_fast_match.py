@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+##Check match read from fixed offsets against match from dpkt
+#
+# Packets are read from pcap files given (of Ethernet frames, or of
+# OpenFlow packet ins with -o), or generated if no file is given.
+#
+import yapc.log.output as output
+import yapc.util.openflow as ofutil
+import yapc.pyopenflow as pyof
+import socket
+import dpkt
+import sys
+import getopt
+
+##Print usage guide
+def usage():
+    """Display usage
+    """
+    print "Usage "+sys.argv[0]+" [options] [<file name> ...]"
+    print "\tpcap files should contain packets for parsing"
+    print "\t(generated packets are used if no file is given)"
+    print
+    print  "Options:"
+    print "-h/--help\n\tPrint this usage guide"
+    print "-o/--openflow\n\tpcap files contain OpenFlow packet-in's"
+
+def generate():
+    """Generate packets of various types
+
+    @return list of packets
+    """
+    pkts = []
+    src = socket.inet_aton("10.0.0.1")
+    dst = socket.inet_aton("10.0.1.2")
+    l4 = [(dpkt.ip.IP_PROTO_TCP, dpkt.tcp.TCP(sport=1234, dport=80)),
+          (dpkt.ip.IP_PROTO_UDP, dpkt.udp.UDP(sport=68, dport=67)),
+          (dpkt.ip.IP_PROTO_ICMP, dpkt.icmp.ICMP(type=8, code=0,
+                                                 data=dpkt.icmp.ICMP.Echo())),
+          (47, "\x00"*16)]
+    for (p, data) in l4:
+        for tos in [0, 0x2e]:
+            ip = dpkt.ip.IP(src=src, dst=dst, p=p, tos=tos, data=data)
+            ip.len = len(ip)
+            pkts.append(ip)
+            #With options
+            ip = dpkt.ip.IP(src=src, dst=dst, p=p, data=data, 
+                            opts="\x01\x01\x01\x00")
+            ip.v_hl = (4 << 4) | 6
+            ip.len = len(ip)
+            pkts.append(ip)
+    arp = dpkt.arp.ARP(spa=src, tpa=dst, op=dpkt.arp.ARP_OP_REQUEST)
+    pkts.append(arp)
+
+    frames = []
+    for p in pkts:
+        if (isinstance(p, dpkt.arp.ARP)):
+            t = dpkt.ethernet.ETH_TYPE_ARP
+        else:
+            t = dpkt.ethernet.ETH_TYPE_IP
+        eth = dpkt.ethernet.Ethernet(src="\x00\x11\x22\x33\x44\x55", 
+                                     dst="\xff\xee\xdd\xcc\xbb\xaa",
+                                     type=t, data=p)
+        frames.append(eth.pack())
+    #Truncated packets
+    for f in frames[:]:
+        for l in [16, 34, 38, 40]:
+            frames.append(f[:l])
+    #Other Ethertype
+    frames.append("\x00\x11\x22\x33\x44\x55"*2+"\x86\xdd"+"\x00"*40)
+    return frames
+
+def read(filename, openflow):
+    """Read packets from pcap file
+
+    @param filename name of pcap file
+    @param openflow pcap contains OpenFlow packet in or not
+    @return list of packets
+    """
+    pkts = []
+    for ts, pkt in dpkt.pcap.Reader(open(filename, "rb")):
+        if (openflow):
+            ofdata = dpkt.ethernet.Ethernet(pkt).data.data.data
+            if ((len(ofdata) <= pyof.OFP_PACKET_IN_BYTES) or
+                (ord(ofdata[1]) != pyof.OFPT_PACKET_IN)):
+                continue
+            pkt = ofdata[pyof.OFP_PACKET_IN_BYTES:]
+        pkts.append(pkt)
+    return pkts
+
+#Parse options and arguments
+try:
+    opts, args = getopt.getopt(sys.argv[1:], "ho",
+                               ["help", "openflow"])
+except getopt.GetoptError:
+    print "Option error!"
+    usage()
+    sys.exit(2)
+
+#Parse options
+openflow = False
+for opt,arg in opts:
+    if (opt in ("-h","--help")):
+        usage()
+        sys.exit(0)
+    elif (opt in ("-o","--openflow")):
+        openflow = True
+    else:
+        print "Unhandled option :"+opt
+        sys.exit(2)
+
+output.set_mode("INFO")
+pkts = []
+for filename in args:
+    pkts.extend(read(filename, openflow))
+if (len(args) == 0):
+    pkts = generate()
+
+failed = 0
+for pkt in pkts:
+    try:
+        (ofm, dpktp) = ofutil.get_ofp_match(1, pkt)
+    except (dpkt.UnpackError, AttributeError):
+        continue
+    fast = ofutil.get_fast_ofp_match(1, pkt)
+    if ((fast != ofm) or (ofutil.get_fast_match(1, pkt) != ofutil.get_match(ofm))):
+        failed += 1
+        output.warn("Match differs for "+`dpktp`+"\n"+\
+                        ofm.show("\t")+"but got\n"+fast.show("\t"))
+output.info("%d of %d packets matched" % (len(pkts)-failed, len(pkts)))
+if (failed > 0):
+    sys.exit(1)
@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+##Check shadow flow tables against flow mods sent
+#
+# Flow mods are sent on an OpenFlow connection (over a socket pair),
+# so that the shadow flow tables are updated as observers, and
+# identical flows are skipped when installed again (unless the switch
+# rejected them with an error).
+#
+import yapc.log.output as output
+import yapc.netstate.flowtable as flowtable
+import yapc.comm.core as comm
+import yapc.comm.openflow as ofcomm
+import yapc.events.openflow as ofevents
+import yapc.comm.transaction as transaction
+import yapc.forwarding.flows as flows
+import yapc.util.openflow as ofutil
+import yapc.pyopenflow as pyof
+import random
+import socket
+import time
+import sys
+
+output.set_mode("INFO")
+failed = 0
+
+def check(cond, msg):
+    """Count failure if condition is false
+
+    @param cond condition
+    @param msg message of failure
+    """
+    global failed
+    if (not cond):
+        failed += 1
+        output.warn(msg)
+
+class server:
+    """Core that only records handlers and events posted
+    """
+    def register_event_handler(self, name, handler, *args, **kwargs):
+        pass
+
+    def post_event(self, event, delay=None):
+        return None
+
+def get_entry(nw_dst, port, priority=ofutil.PRIORITY['DEFAULT'],
+              wildcards=0):
+    """Get flow entry to output port
+
+    @param nw_dst destination IP address
+    @param port output port
+    @param priority priority
+    @param wildcards wildcards of match
+    @return flow entry
+    """
+    m = ofutil.match(wildcards, in_port=1, dl_type=0x0800, nw_dst=nw_dst)
+    e = flows.exact_entry(m.to_ofp_match(), priority=priority,
+                          idle_timeout=2)
+    e.add_output(port)
+    return e
+
+(sock, peer) = socket.socketpair()
+peer.setblocking(False)
+conn = ofcomm.connection(sock)
+tables = flowtable.shadow_tables(server())
+tracker = transaction.tracker(server())
+
+#Flows sent are recorded
+entries = [(get_entry(0x0a000000+i, 2), pyof.OFPFC_ADD) for i in range(0, 4)]
+b = flows.install_flows(tracker, conn, entries, tables=tables)
+t = tables.tables.get(sock)
+check((t != None) and (len(t) == 4), "Flows sent not in shadow table")
+check((len(b) == 4) and (len(b.skipped) == 0), "Flows not installed skipped")
+
+#Identical flows are skipped, others are sent
+entries = [(get_entry(0x0a000000, 2), pyof.OFPFC_ADD),
+           (get_entry(0x0a000001, 3), pyof.OFPFC_ADD),
+           (get_entry(0x0a000001, 3), pyof.OFPFC_MODIFY_STRICT)]
+b = flows.install_flows(tracker, conn, entries, tables=tables)
+check(len(b.skipped) == 1, "%d flows skipped instead of 1" % len(b.skipped))
+check(len(b.transactions) == 2, "Flows sent not tracked")
+fm = get_entry(0x0a000001, 3).get_flow_mod(pyof.OFPFC_ADD).pack()
+fm = fm[:2]+ofutil.UINT16.pack(len(fm))+fm[4:]
+check(tables.is_duplicate(sock, fm), "Flow modified not installed")
+check(not tables.is_duplicate(peer, fm), "Flow installed on other switch")
+
+#Lookup by priority (with exact flows first)
+m = ofutil.match(in_port=1, dl_type=0x0800, nw_dst=0x0a000002)
+check(t.lookup(m).has_output(2), "Exact flow not found")
+wildcards = (pyof.OFPFW_ALL & ~pyof.OFPFW_DL_TYPE & \
+                 ~pyof.OFPFW_NW_DST_MASK) | (8 << pyof.OFPFW_NW_DST_SHIFT)
+high = ofutil.PRIORITY['DEFAULT']+1
+flows.install_flows(tracker, conn,
+                    [(get_entry(0x0a000000, 5, high, wildcards),
+                      pyof.OFPFC_ADD),
+                     (get_entry(0x0a000000, 6, high-1, wildcards),
+                      pyof.OFPFC_ADD)], tables=tables)
+check(t.lookup(m).has_output(2), "Exact flow not found before wildcards")
+m = ofutil.match(in_port=1, dl_type=0x0800, nw_dst=0x0a000009)
+check(t.lookup(m).has_output(5), "Flow of higher priority not found")
+m = ofutil.match(in_port=1, dl_type=0x0800, nw_dst=0x0b000000)
+check(t.lookup(m) == None, "Flow found for packet not matched")
+
+#Overlap and cover checks agree with linear search
+random.seed(1)
+table = flowtable.flow_table()
+installed = []
+for i in range(0, 500):
+    bits = random.choice([0, 8, 16, 32])
+    w = (pyof.OFPFW_ALL & ~pyof.OFPFW_DL_TYPE & ~pyof.OFPFW_NW_DST_MASK) | \
+        (bits << pyof.OFPFW_NW_DST_SHIFT)
+    if (random.randint(0, 3) == 0):
+        w = 0
+    f = flowtable.flow(ofutil.match(w, in_port=1, dl_type=0x0800,
+                                    nw_dst=0x0a000000+random.randint(0, 0xffff)),
+                       random.choice([100, 200]))
+    table.add(f)
+    installed = [x for x in installed+[f]
+                 if (table.get(x.match, x.priority) is x)]
+for i in range(0, 50):
+    bits = random.choice([8, 16, 24])
+    w = (pyof.OFPFW_ALL & ~pyof.OFPFW_DL_TYPE & ~pyof.OFPFW_NW_DST_MASK) | \
+        (bits << pyof.OFPFW_NW_DST_SHIFT)
+    q = ofutil.match(w, dl_type=0x0800,
+                     nw_dst=0x0a000000+random.randint(0, 0xffff))
+    mask = flowtable.get_masks(flowtable.normalize(w))
+    key = flowtable.get_key(flowtable.get_values(q), mask)
+    r = set(table.get_overlaps(q, 100))
+    check(r == set([f for f in installed if ((f.priority == 100) and
+                                             f.overlaps(key, mask))]),
+          "Overlaps differ from linear search")
+    r = set(table.get_covered(q))
+    check(r == set([f for f in installed if f.is_covered(key, mask)]),
+          "Flows covered differ from linear search")
+    table.delete(q, strict=False)
+    installed = [f for f in installed if not f.is_covered(key, mask)]
+check(len(table) == len(installed), "Flows left differ from linear search")
+
+#Delete of wildcard match removes flows covered
+d = flows.exact_entry(ofutil.match(wildcards, dl_type=0x0800,
+                                   nw_dst=0x0a000000).to_ofp_match())
+b = flows.install_flows(tracker, conn, [(d, pyof.OFPFC_DELETE)],
+                        tables=tables)
+check(len(b.skipped) == 0, "Delete skipped")
+check(len(t) == 0, "%d flows left after delete" % len(t))
+
+#Flow mod rejected by switch is undone
+def reject(b):
+    """Reply to flow mods of batch with error
+
+    @param b flow batch
+    """
+    for ft in b.transactions:
+        err = pyof.ofp_error_msg()
+        err.header.xid = ft.xid
+        err.type = pyof.OFPET_FLOW_MOD_FAILED
+        err.code = pyof.OFPFMFC_ALL_TABLES_FULL
+        tables.processevent(ofevents.error(sock, err.pack()))
+
+b = flows.install_flows(tracker, conn, [(get_entry(0x0a000000, 2),
+                                         pyof.OFPFC_ADD)], tables=tables)
+b = flows.install_flows(tracker, conn, [(get_entry(0x0a000000, 3),
+                                         pyof.OFPFC_ADD),
+                                        (get_entry(0x0a000001, 3),
+                                         pyof.OFPFC_ADD)], tables=tables)
+reject(b)
+m = ofutil.match(in_port=1, dl_type=0x0800, nw_dst=0x0a000000)
+check((len(t) == 1) and t.lookup(m).has_output(2),
+      "Flow replaced not restored on error")
+b = flows.install_flows(tracker, conn, [(get_entry(0x0a000000, 4),
+                                         pyof.OFPFC_MODIFY_STRICT)],
+                        tables=tables)
+reject(b)
+check(t.lookup(m).has_output(2), "Flow modified not restored on error")
+b = flows.install_flows(tracker, conn, [(get_entry(0x0a000001, 3),
+                                         pyof.OFPFC_ADD)], tables=tables)
+check(len(b.skipped) == 0, "Flow rejected skipped as installed")
+tables.processevent(comm.event(sock, comm.event.SOCK_CLOSE))
+check(sock not in tables.tables, "Table of switch closed kept")
+t = tables.get_table(sock)
+
+#Flows without flow removed expire after idle timeout
+flows.install_flows(tracker, conn, [(get_entry(0x0a000000, 2),
+                                     pyof.OFPFC_ADD)], tables=tables)
+check(t.expire(time.time()+1) == 0, "Flow expired before timeout")
+check(t.expire(time.time()+3) == 1, "Flow not expired after timeout")
+check(not tables.is_duplicate(sock, fm), "Flow expired still installed")
+
+output.info("%d failures" % failed)
+if (failed > 0):
+    sys.exit(1)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+##Check codecs of yapc.ofcodec against pyopenflow as generated
+#
+# Checks that yapc/pyopenflow_codec.py is up to date with
+# yapc/pyopenflow.py, and that messages packed and viewed with and
+# without codecs are the same.
+#
+import yapc.log.output as output
+import yapc.pyopenflow as pyof
+import yapc.ofcodec as ofcodec
+import yapc.pyopenflow_codec as codec
+import tempfile
+import types
+import sys
+import os
+
+output.set_mode("INFO")
+failed = 0
+
+#Generated module is up to date
+(fd, filename) = tempfile.mkstemp(".py")
+os.close(fd)
+left = ofcodec.write(filename)
+if (open(filename).read() != open(codec.__file__.replace(".pyc", ".py")).read()):
+    failed += 1
+    output.warn("yapc/pyopenflow_codec.py is not up to date")
+os.remove(filename)
+if (len(left) > 0):
+    failed += 1
+    output.warn("No codec generated for "+str(left))
+
+#Form messages
+pi = pyof.ofp_packet_in()
+pi.in_port = 3
+pi.header.length = pyof.OFP_PACKET_IN_BYTES
+fm = pyof.ofp_flow_mod()
+fm.match.dl_src = [0, 0, 0, 0, 0, 1]
+fm.match.nw_src = 0x0a000001
+fm.buffer_id = 42
+fm.actions.append(pyof.ofp_action_output())
+fm.header.length = len(fm.pack())
+fs = pyof.ofp_flow_stats()
+fs.actions.append(pyof.ofp_action_output())
+ps = pyof.ofp_port_stats()
+ps.port_no = 2
+ps.rx_packets = 1234
+vv = types.InstanceType(pyof.ofp_action_vlan_vid,
+                        {"type": pyof.OFPAT_SET_VLAN_VID, "len": 8,
+                         "vlan_vid": 3, "pad": [0, 0]})
+msgs = [pyof.ofp_header(), pyof.ofp_match(), pi, fm, fs, ps, vv]
+
+def get(msg):
+    """Get packed message and its fields viewed
+
+    @param msg message
+    @return (packed message, list of (field, value viewed))
+    """
+    packed = msg.pack()
+    v = ofcodec.view(msg.__class__, bytearray(packed))
+    fields = []
+    for name in sorted(vars(msg).keys()):
+        if (name not in ["actions", "data"]):
+            value = getattr(v, name)
+            if (hasattr(value, "pack")):
+                value = value.pack()
+            fields.append((name, value))
+    return (packed, fields)
+
+codecs = [get(m) for m in msgs]
+ofcodec.uninstall()
+generated = [get(m) for m in msgs[:-1]]
+ofcodec.install()
+for i in range(0, len(generated)):
+    if (codecs[i] != generated[i]):
+        failed += 1
+        output.warn(msgs[i].__class__.__name__+" differs with codec")
+if (codecs[-1][0] != "\x00\x01\x00\x08\x00\x03\x00\x00"):
+    failed += 1
+    output.warn("ofp_action_vlan_vid is not packed as expected")
+
+output.info("%d failures" % failed)
+if (failed > 0):
+    sys.exit(1)
@@ -11,6 +11,7 @@ import yapc.util.memcacheutil as mc
 import yapc.events.openflow as ofevents
 import yapc.comm.json as jsoncomm
 import yapc.comm.udpjson as udpjson
+import yapc.comm.transaction as transaction
 import yapc.forwarding.flows as flows
 import yapc.pyopenflow as pyof
 import yapc.packet.ofaction as ofpkt
@@ -281,10 +282,11 @@ class host_move(traffic_handler):
         self.timeout = timeout
         ##Last check time
         self.__lastcheck = time.time()
+        ##Tracker of flow stats requests
+        self.transactions = transaction.get_tracker(server)
 
         server.register_event_handler(ofevents.pktin.name, self)
         server.register_event_handler(udpjson.message.name, self)
-        server.register_event_handler(ofevents.flow_stats.name, self)
 
     def processevent(self, event):
         """Event handler
@@ -316,7 +318,8 @@ class host_move(traffic_handler):
                 ipflow = flows.ethertype_entry(dpkt.ethernet.ETH_TYPE_IP)
                 ipflow.set_nw_dst(old_ip)
                 (sr, fsr) = ipflow.get_flow_stats_request()
-                self.get_conn().send(sr.pack()+fsr.pack())
+                self.transactions.send(self.get_conn(), sr.pack()+fsr.pack(),
+                                       self._handle_reply)
 
             #Decide output port
             if (event.match.in_port == iport):
@@ -336,11 +339,18 @@ class host_move(traffic_handler):
             
         elif isinstance(event, udpjson.message):
             self._handle_json(event)
-        elif isinstance(event, ofevents.flow_stats):
-            self._handle_change(event)
 
         return True
 
+    def _handle_reply(self, t):
+        """Handle replies of flow stats request
+
+        @param t transaction of flow stats request
+        """
+        for reply in t.replies:
+            if isinstance(reply, ofevents.flow_stats):
+                self._handle_change(reply)
+
     def _handle_change(self, flow_stats):
         """Handle flows to be changed based on flow stats reply
         
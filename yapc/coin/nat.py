@@ -384,7 +384,10 @@ class arp_handler(core.component):
         core.component.__init__(self, ofconn)
 
         mc.get_client()
-        server.register_event_handler(ofevents.pktin.name, self)
+        #Outermost Ethertype (as in match), so VLAN-tagged ARP is not
+        #handled (as processevent does not)
+        server.register_event_handler(ofevents.pktin.name, self,
+                                      dl_type=dpkt.ethernet.ETH_TYPE_ARP)
         
     def processevent(self, event):
         """Event handler (for ARP only)
@@ -474,7 +477,7 @@ class arp_handler(core.component):
                         self.__class__.__name__)            
         else:
             flow.add_output(iport)
-            if (pu.array2val(pktin.match.dl_dst) != 0xffffffffffff):
+            if (ofutil.mac_array2val(pktin.match.dl_dst) != 0xffffffffffff):
                 ofpkt.dl_rewrite(pktin.dpkt, False, lointf[1])
             ofpkt.nw_rewrite(pktin.dpkt, False, lointf[0])
             self.get_conn().send(flow.get_packet_out().pack()+\
@@ -501,7 +504,10 @@ class ip_handler(core.component):
         self.server = server
 
         mc.get_client()
-        server.register_event_handler(ofevents.pktin.name, self)
+        #Outermost Ethertype (as in match), so VLAN-tagged IP is not
+        #handled (as processevent does not)
+        server.register_event_handler(ofevents.pktin.name, self,
+                                      dl_type=dpkt.ethernet.ETH_TYPE_IP)
         
         ##Interval to maintain bandwidth
         self.bwinterval = bwinterval
@@ -517,6 +523,8 @@ class ip_handler(core.component):
         ##Reference to last interface chosen
         self.__last_intf_choosen = 0
         self.cookie = 0
+        ##Flows being installed
+        self.pending = flows.pending_installs()
 
     def processevent(self, event):
         """Event handler
@@ -558,6 +566,11 @@ class ip_handler(core.component):
                            self.__class__.__name__)
                 return True
 
+            flow = self.pending.get(event.sock, event.compact_match)
+            if (flow != None):
+                self._send_pending(event, flow)
+                return False
+
             if (event.match.in_port == iport):
                 return self._process_outbound(event, intfs, iport, lointf) 
             else:
@@ -565,6 +578,21 @@ class ip_handler(core.component):
 
         return True     
 
+    def _send_pending(self, pktin, flow):
+        """Send packet of flow being installed with packet out
+
+        @param pktin packet in event
+        @param flow flow entry being installed
+        """
+        #Buffer id is set in packet out only, as flow is shared by
+        #packet ins of flow
+        po = flow.get_packet_out()
+        po.buffer_id = pktin.pktin.buffer_id
+        if (pktin.pktin.buffer_id == flows.UNBUFFERED_ID):
+            self.get_conn().send(po.pack()+pktin.dpkt.pack())
+        else:
+            self.get_conn().send(po.pack())
+
     def select_intf(self, intfs):
         """Get which interface to send
 
@@ -688,6 +716,7 @@ class ip_handler(core.component):
                     ofpkt.dl_rewrite(pktin.dpkt, True, ipr[2])
                     self.get_conn().send(flow.get_packet_out(pyof.OFPFC_ADD).pack()+\
                                              pktin.dpkt.pack())
+                self.pending.add(pktin.sock, pktin.compact_match, flow)
                 return False
 
         #Global address
@@ -731,6 +760,7 @@ class ip_handler(core.component):
                 ofpkt.dl_rewrite(pktin.dpkt, False, pu.hex_str2array(gwmac))
                 self.get_conn().send(flow.get_packet_out(pyof.OFPFC_ADD).pack()+\
                                          pktin.dpkt.pack())
+            self.pending.add(pktin.sock, pktin.compact_match, flow)
                     
             #Inbound
             rflow = flow.reverse(cport)
@@ -780,6 +810,7 @@ class ip_handler(core.component):
             ofpkt.dl_rewrite(pktin.dpkt, False, lointf[1])
             self.get_conn().send(flow.get_packet_out(pyof.OFPFC_ADD).pack()+\
                                      pktin.dpkt.pack())
+        self.pending.add(pktin.sock, pktin.compact_match, flow)
 
         gw = mc.get(nat.get_gw_key(flow.match.in_port))
         gwmac = mc.get(nat.get_gw_mac_key(gw))
@@ -6,7 +6,9 @@
 import select
 import socket
 import threading
+import errno
 import time
+import os
 import yapc.interface as yapc
 import yapc.log.output as output
 
@@ -52,6 +54,18 @@ class sockmanager:
         self.sock = sock
         ##Reference to scheduler
         self.scheduler = scheduler
+        ##Number of bytes received
+        self.bytes_received = 0
+        ##Number of receive calls
+        self.recv_calls = 0
+
+    def get_stats(self):
+        """Get receive statistics of socket
+
+        @return dictionary of bytes received and number of receive calls
+        """
+        return {"bytes_received": self.bytes_received,
+                "recv_calls": self.recv_calls}
 
     def parsepacket(self):
         """Parse and process packets
@@ -60,13 +74,29 @@ class sockmanager:
         self.processpacket(self.buffer)
         self.buffer = ""
 
+    def append(self, received):
+        """Append received data to buffer
+
+        @param received data received
+        """
+        self.buffer += received
+
     def receive(self, sock, recvthread):
         """Handle received
+
+        Reads till socket has no more data (if non-blocking), 
+        else reads once.
         """
-        while (len(select.select([sock], [], [], 0)[0]) != 0):
+        drain = (sock.gettimeout() == 0)
+        while True:
+            self.recv_calls += 1
             try:
                 received = sock.recv(self.maxlen)
-            except:
+            except socket.error, e:
+                if (e.args[0] in (errno.EAGAIN, errno.EWOULDBLOCK)):
+                    return
+                if (e.args[0] == errno.EINTR):
+                    continue
                 received = ""
             if (len(received) == 0):
                 recvthread.removeconnection(sock)
@@ -74,8 +104,11 @@ class sockmanager:
                                                 event.SOCK_CLOSE))
                 return
             else:
-                self.buffer += received
+                self.bytes_received += len(received)
+                self.append(received)
                 self.parsepacket()
+            if (not drain):
+                return
 
     def processpacket(self, packet):
         """Function to process packet
@@ -84,22 +117,336 @@ class sockmanager:
         """
         output.dbg("Receive "+str(packet), self.__class__.__name__)
 
+class selectreactor:
+    """Reactor that polls sockets using select
+
+    Limited to FD_SETSIZE file descriptors, and O(n) per poll.
+
+    @author ykk
+    @date Oct 2011
+    """
+    def __init__(self):
+        """Initialize
+        """
+        ##List of sockets to read
+        self.sockets = []
+        ##List of sockets to write
+        self.writers = []
+        ##List of sockets registered
+        self.registered = []
+
+    def register(self, sock):
+        """Register socket (for read)
+
+        @param sock socket to register
+        """
+        if (sock not in self.registered):
+            self.registered.append(sock)
+        self.set_interest(sock, True, False)
+
+    def unregister(self, sock):
+        """Unregister socket
+
+        @param sock socket to unregister
+        """
+        if (sock in self.registered):
+            self.registered.remove(sock)
+        self.set_interest(sock, False, False)
+
+    def set_interest(self, sock, read, write):
+        """Set if socket is polled for read and/or write
+
+        @param sock socket
+        @param read poll for read or not
+        @param write poll for write or not
+        """
+        for (l, want) in ((self.sockets, read), (self.writers, write)):
+            if (want and (sock not in l)):
+                l.append(sock)
+            elif ((not want) and (sock in l)):
+                l.remove(sock)
+
+    def poll(self, timeout):
+        """Poll for sockets ready
+
+        @param timeout time to wait
+        @return (list of sockets ready to read, 
+                 list of sockets ready to write, list of stale sockets)
+        """
+        if ((len(self.sockets) == 0) and (len(self.writers) == 0)):
+            time.sleep(timeout)
+            return ([], [], [])
+        try:
+            (r, w, e) = select.select(self.sockets, self.writers, [], timeout)
+            return (r, w, [])
+        except select.error, e:
+            if (e.args[0] == errno.EINTR):
+                return ([], [], [])
+            return ([], [], self.__stale())
+        except (socket.error, ValueError, TypeError):
+            return ([], [], self.__stale())
+
+    def __stale(self):
+        """Find stale sockets
+
+        @return list of stale sockets
+        """
+        r = []
+        for s in self.registered[:]:
+            try:
+                select.select([s], [], [], 0)
+            except:
+                r.append(s)
+        return r
+
+class pollreactor:
+    """Reactor that polls sockets using poll (level-triggered)
+
+    Sockets are registered incrementally, and poll is not limited 
+    to FD_SETSIZE.
+
+    @author ykk
+    @date Oct 2011
+    """
+    ##Events to poll for read
+    READ = select.POLLIN | select.POLLPRI
+    ##Events to poll for write
+    WRITE = select.POLLOUT
+    ##Events indicating socket is stale
+    STALE = select.POLLNVAL
+    def __init__(self):
+        """Initialize
+        """
+        ##Poll object
+        self.poller = select.poll()
+        ##Dictionary of file descriptor to socket
+        self.fdsock = {}
+        ##Dictionary of socket to file descriptor
+        self.sockfd = {}
+
+    def register(self, sock):
+        """Register socket (for read)
+
+        @param sock socket to register
+        """
+        if (sock in self.sockfd):
+            return
+        fd = sock.fileno()
+        if (fd in self.fdsock):
+            #File descriptor reused from closed socket
+            self.sockfd.pop(self.fdsock[fd], None)
+        self.sockfd[sock] = fd
+        self.fdsock[fd] = sock
+        try:
+            self.poller.register(fd, self.READ)
+        except IOError:
+            self.poller.modify(fd, self.READ)
+
+    def unregister(self, sock):
+        """Unregister socket
+
+        @param sock socket to unregister
+        """
+        fd = self.sockfd.pop(sock, None)
+        if ((fd == None) or (self.fdsock.get(fd) is not sock)):
+            return
+        del self.fdsock[fd]
+        try:
+            self.poller.unregister(fd)
+        except (KeyError, IOError, OSError, ValueError):
+            #Closed file descriptor is removed already
+            pass
+
+    def set_interest(self, sock, read, write):
+        """Set if socket is polled for read and/or write
+
+        @param sock socket
+        @param read poll for read or not
+        @param write poll for write or not
+        """
+        fd = self.sockfd.get(sock)
+        if (fd == None):
+            return
+        mask = 0
+        if (read):
+            mask |= self.READ
+        if (write):
+            mask |= self.WRITE
+        try:
+            self.poller.modify(fd, mask)
+        except (IOError, OSError):
+            pass
+
+    def poll(self, timeout):
+        """Poll for sockets ready
+
+        Sockets in error or hung up are returned as ready to read, 
+        so that the read reports the error or close.  If poll fails,
+        sockets with invalid file descriptors are returned as stale
+        (to be unregistered), and polling continues.
+
+        @param timeout time to wait
+        @return (list of sockets ready to read, 
+                 list of sockets ready to write, list of stale sockets)
+        """
+        try:
+            events = self.poller.poll(self.get_timeout(timeout))
+        except (select.error, IOError, OSError), e:
+            if (e.args[0] == errno.EINTR):
+                return ([], [], [])
+            stale = self.__stale()
+            output.warn("Poll failed ("+str(e)+") with "+\
+                            str(len(stale))+" stale socket(s)",
+                        self.__class__.__name__)
+            if (len(stale) == 0):
+                time.sleep(timeout)
+            return ([], [], stale)
+        ready = []
+        writable = []
+        stale = []
+        for (fd, ev) in events:
+            sock = self.fdsock.get(fd)
+            if (sock == None):
+                continue
+            if (ev & self.STALE):
+                stale.append(sock)
+                continue
+            if (ev & self.WRITE):
+                writable.append(sock)
+            if (ev & ~self.WRITE):
+                ready.append(sock)
+        return (ready, writable, stale)
+
+    def __stale(self):
+        """Find stale sockets
+
+        @return list of stale sockets
+        """
+        r = []
+        for (sock, fd) in self.sockfd.items():
+            try:
+                if (sock.fileno() != fd):
+                    r.append(sock)
+                else:
+                    os.fstat(fd)
+            except (socket.error, IOError, OSError):
+                r.append(sock)
+        return r
+
+    def get_timeout(self, timeout):
+        """Get timeout in unit used by poll (milliseconds)
+
+        @param timeout timeout in seconds
+        """
+        return int(timeout*1000)
+
+class epollreactor(pollreactor):
+    """Reactor that polls sockets using epoll (level-triggered)
+
+    Cost of each poll is O(ready sockets).
+
+    @author ykk
+    @date Oct 2011
+    """
+    def __init__(self):
+        """Initialize
+        """
+        pollreactor.__init__(self)
+        ##Poll object
+        self.poller = select.epoll()
+        ##Events to poll for read
+        self.READ = select.EPOLLIN | select.EPOLLPRI
+        ##Events to poll for write
+        self.WRITE = select.EPOLLOUT
+        ##No invalid file descriptor event for epoll
+        self.STALE = 0
+
+    def get_timeout(self, timeout):
+        """Get timeout in unit used by epoll (seconds)
+
+        @param timeout timeout in seconds
+        """
+        return timeout
+
+##Reactors by name
+REACTORS = {"select": selectreactor,
+            "poll": pollreactor,
+            "epoll": epollreactor}
+
+def get_reactor(name=None):
+    """Get reactor
+
+    @param name name of reactor (None for best available)
+    @return reactor
+    """
+    if (name == None):
+        if (hasattr(select, "epoll")):
+            name = "epoll"
+        elif (hasattr(select, "poll")):
+            name = "poll"
+        else:
+            name = "select"
+    return REACTORS[name]()
+
+##Per-thread batch of writers to flush
+batch = threading.local()
+
+def begin_batch():
+    """Start batching writes of current thread
+
+    Writers that support batching (e.g., OpenFlow connections) queue
+    messages until end_batch() is called.
+    """
+    batch.writers = []
+
+def add_to_batch(writer):
+    """Add writer to be flushed at end of current thread's batch
+
+    @param writer object with flush() method
+    @return if added (else thread is not batching)
+    """
+    writers = getattr(batch, "writers", None)
+    if (writers == None):
+        return False
+    if (writer not in writers):
+        writers.append(writer)
+    return True
+
+def end_batch():
+    """End batching writes of current thread and flush writers
+    """
+    writers = getattr(batch, "writers", None)
+    batch.writers = None
+    if (writers != None):
+        for w in writers:
+            w.flush()
+
 class receivethread(threading.Thread):
     """Receiver for messages
 
-    Stores connections and poll them for messages
+    Stores connections and poll them for messages.  Also waits for 
+    sockets to be writable on behalf of writers with pending data.
     
     @author ykk
     @date Oct 2010
     """
-    def __init__(self):
+    def __init__(self, reactor=None):
         """Initialize
+
+        @param reactor name of reactor (select, poll, epoll)
+                       or None for best available
         """
         threading.Thread.__init__(self)
         ##Dictionary of sockets and managers
         self.__sockDictionary = {}
-        ##List of sockets
-        self.__sockets = []
+        ##Dictionary of sockets and writers waiting for them
+        self.__writers = {}
+        ##Set of sockets with reading paused
+        self.__paused = set()
+        ##Lock for changing interest of sockets
+        self.__lock = threading.Lock()
+        ##Reactor to poll sockets with
+        self.reactor = get_reactor(reactor)
         ##Sleep time
         self.timeout = 0.1
         ##Boolean for run
@@ -110,48 +457,93 @@ class receivethread(threading.Thread):
     def addconnection(self, sock, manager):
         """Add socket and manager
         """
-        if (sock not in self.__sockets):
-            self.__sockets.append(sock)
         self.__sockDictionary[sock] = manager
-        output.dbg("Adding "+str(sock)+" to select list",
+        self.__lock.acquire()
+        self.reactor.register(sock)
+        self.__lock.release()
+        output.dbg("Adding "+str(sock)+" to poll list",
                    self.__class__.__name__)
 
+    def get_manager(self, sock):
+        """Get manager of socket
+
+        @param sock socket
+        @return manager (None if socket is not added)
+        """
+        return self.__sockDictionary.get(sock)
+
     def removeconnection(self, sock):
         """Remove socket
         """
         if (sock in self.__sockDictionary):
             del self.__sockDictionary[sock]
-        if (sock in self.__sockets):
-            self.__sockets.remove(sock)
-            output.dbg("Removing "+str(sock)+" to select list",
+            self.__lock.acquire()
+            self.__writers.pop(sock, None)
+            self.__paused.discard(sock)
+            self.reactor.unregister(sock)
+            self.__lock.release()
+            output.dbg("Removing "+str(sock)+" from poll list",
                        self.__class__.__name__)
 
-    def remove_stale_connection(self):
-        """Remove any stale connection
+    def __update_interest(self, sock):
+        """Update interest of socket in reactor
+
+        Must be called with lock held.
+        @param sock socket
         """
-        for s in self.__sockets:
-            try:
-                inputready, outputready, exceptready = \
-                    select.select([s], [], [], 0)
-            except:
-                self.removeconnection(s)
+        if (sock in self.__sockDictionary):
+            self.reactor.set_interest(sock, 
+                                      (sock not in self.__paused),
+                                      (sock in self.__writers))
+
+    def wait_writable(self, sock, writer):
+        """Call writer.writable() when socket is writable
+
+        @param sock socket
+        @param writer writer to call (None to stop waiting)
+        """
+        self.__lock.acquire()
+        if (writer == None):
+            self.__writers.pop(sock, None)
+        else:
+            self.__writers[sock] = writer
+        self.__update_interest(sock)
+        self.__lock.release()
+
+    def pause(self, sock, paused=True):
+        """Pause (or resume) reading from socket
+
+        @param sock socket
+        @param paused pause or resume
+        """
+        self.__lock.acquire()
+        if (paused):
+            self.__paused.add(sock)
+        else:
+            self.__paused.discard(sock)
+        self.__update_interest(sock)
+        self.__lock.release()
+        output.dbg(("Pause" if paused else "Resume")+" reading "+str(sock),
+                   self.__class__.__name__)
 
     def run(self):
         """Main loop for polling receiving messages
         """
-        inputready = []
+        output.dbg("Polling sockets with "+self.reactor.__class__.__name__,
+                   self.__class__.__name__)
         while self.running:
-            #Poll if any socket
-            if (len(self.__sockets) != 0):
-                try:
-                    inputready, outputready, exceptready = \
-                        select.select(self.__sockets, [], [], self.timeout)
-                except:
-                    self.remove_stale_connection()
-            else:
-                time.sleep(self.timeout)
+            (inputready, outputready, stale) = self.reactor.poll(self.timeout)
+            for s in stale:
+                self.removeconnection(s)
+
+            #Write any socket waited on
+            for writesock in outputready:
+                writer = self.__writers.get(writesock)
+                if (writer != None):
+                    writer.writable()
 
             #Read any socket with data
             for readsock in inputready:
-                sockmgr = self.__sockDictionary[readsock]
-                sockmgr.receive(readsock, self)
+                sockmgr = self.__sockDictionary.get(readsock)
+                if (sockmgr != None):
+                    sockmgr.receive(readsock, self)
@@ -6,36 +6,111 @@
 import yapc.interface as yapc
 import yapc.comm.core as comm
 import yapc.pyopenflow as pyopenflow
+import yapc.ofcodec as ofcodec
 import yapc.log.output as output
 import socket
+import struct
+import threading
+import select
+import errno
 import sys
 
+##Struct to unpack length from OpenFlow header
+HEADER_LENGTH = struct.Struct("!H")
+##Default amount to receive from OpenFlow socket per call
+RECV_SIZE = 65536
+##Bytes queued for sending above which reading from socket is paused
+HIGH_WATER = 4*1024*1024
+##Bytes queued for sending below which reading from socket is resumed
+LOW_WATER = 1024*1024
+
 class message(yapc.event):
     """OpenFlow message event
 
+    Structures of messages (including header) are views into the 
+    message, i.e., fields are decoded when first accessed.
+
     @author ykk
     @date Oct 2010
     """
     name = "OpenFlow Message"
+    ##Messages decoded as their events are seen by handlers of messages
+    dispatch_subclasses = True
     def __init__(self, sock, msg):
         """OpenFlow message event
         """
-        ##Header
-        self.header = pyopenflow.ofp_header()
-        self.header.unpack(msg)
+        ##Header (as view)
+        self.header = ofcodec.view(pyopenflow.ofp_header, msg)
         ##Connection message is received from
         self.sock = sock
         ##Message
         self.message = msg
 
+##Dictionary of decoders by OpenFlow message type, where decoder is
+##called with (socket, message) and returns the event to post
+##(message event for types without decoder)
+decoders = {}
+
+def register_decoder(msgtype, decoder):
+    """Register decoder for OpenFlow message type
+
+    @param msgtype OpenFlow message type (OFPT_*)
+    @param decoder callable taking (socket, message) and returning event
+                   (or None to remove decoder)
+    """
+    if (decoder == None):
+        decoders.pop(msgtype, None)
+    else:
+        decoders[msgtype] = decoder
+
+##Dictionary of list of observers by OpenFlow message type, where
+##observer is called with (socket, buffer, offset) of each message
+##of the type sent
+observers = {}
+
+def register_observer(msgtype, observer):
+    """Register observer of messages of OpenFlow message type sent
+
+    Observers are called by the thread sending the message.
+
+    @param msgtype OpenFlow message type (OFPT_*)
+    @param observer callable taking (socket, buffer, offset of message)
+    """
+    if (msgtype not in observers):
+        observers[msgtype] = []
+    observers[msgtype].append(observer)
+
+def unregister_observer(msgtype, observer):
+    """Unregister observer of messages of OpenFlow message type sent
+
+    @param msgtype OpenFlow message type (OFPT_*)
+    @param observer callable registered
+    """
+    if (observer in observers.get(msgtype, [])):
+        observers[msgtype].remove(observer)
+        if (len(observers[msgtype]) == 0):
+            del observers[msgtype]
+
 class connection:
     """Class to manage OpenFlow connection
 
+    Messages sent are queued per connection.  When sent from an event
+    handler, the queue is flushed after the event is dispatched, else
+    it is flushed immediately.  Each flush writes the queue with a
+    single send, and whatever the socket does not take is written when
+    the socket becomes writable.  Reading from the socket is paused
+    while more than HIGH_WATER bytes are queued, till the queue drops
+    below LOW_WATER.
+
     @author ykk
     @date Oct 2010
     """
-    def __init__(self, sock):
+    def __init__(self, sock, recv=None):
         """Initialize
+
+        @param sock socket
+        @param recv receive thread to wait for socket to be writable
+                    (else wait in send)
         """
         ##Status of handshake
         self.handshake = False
@@ -43,6 +118,22 @@ class connection:
         self.sock = sock
         ##Datapath id of connection
         self.dpid = None
+        ##Reference to receive thread
+        self.recv = recv
+        ##Queue of messages to send
+        self.queue = []
+        ##Number of bytes queued
+        self.queued = 0
+        ##Lock for queue
+        self.lock = threading.Lock()
+        ##Waiting for socket to be writable
+        self.waiting = False
+        ##Reading from socket paused
+        self.paused = False
+        ##Number of bytes sent
+        self.bytes_sent = 0
+        ##Number of send calls
+        self.send_calls = 0
 
     def __del__(self):
         """Destructor
@@ -63,8 +154,8 @@ class connection:
             self.send(sendmsg.pack())
 
         elif (msg.header.type == pyopenflow.OFPT_FEATURES_REPLY):
-            switch_feature = pyopenflow.ofp_switch_features()
-            switch_feature.unpack(msg.message)
+            switch_feature = ofcodec.view(pyopenflow.ofp_switch_features,
+                                          msg.message)
             self.dpid = switch_feature.datapath_id
             output.info("Connected to switch %x" % self.dpid,
                         self.__class__.__name__)
@@ -75,6 +166,20 @@ class connection:
                             pyopenflow.ofp_type[msg.header.type],
                         self.__class__.__name__)
 
+    def __observe(self, msg):
+        """Call observers of messages in buffer sent
+
+        @param msg buffer of message(s)
+        """
+        offset = 0
+        while (offset+pyopenflow.OFP_HEADER_BYTES <= len(msg)):
+            for o in observers.get(ord(msg[offset+1]), []):
+                o(self.sock, msg, offset)
+            length = HEADER_LENGTH.unpack_from(msg, offset+2)[0]
+            if (length < pyopenflow.OFP_HEADER_BYTES):
+                break
+            offset += length
+
     def replyecho(self, msg):
         """Handle echo request
         """
@@ -83,22 +188,131 @@ class connection:
         sendmsg.xid = msg.header.xid
         self.send(sendmsg.pack())
 
-    def send(self, msg):
+    def send(self, msg, setlength=True):
         """Send OpenFlow message
+
+        Length in header is set to length of message, unless the
+        message is a buffer of several messages (with their lengths set).
+
+        @param msg message
+        @param setlength set length in header to length of message
         """
-        header = pyopenflow.ofp_header()
-        if (len(msg) < len(header)):
+        if (len(msg) < pyopenflow.OFP_HEADER_BYTES):
             output.warn("Cannot send OpenFlow of length "+str(len(msg)))
-        else:
-            remain = header.unpack(msg)
-            header.length = len(msg)
-            output.vdbg("Send message "+header.show().strip().replace("\n",";"),
+            return
+
+        if (setlength and (HEADER_LENGTH.unpack_from(msg, 2)[0] != len(msg))):
+            msg = msg[:2]+HEADER_LENGTH.pack(len(msg))+msg[4:]
+        if (output.is_enabled("VDBG", self.__class__.__name__)):
+            header = pyopenflow.ofp_header()
+            header.unpack(msg)
+            output.vdbg("Send message "+\
+                            header.show().strip().replace("\n",";"),
                         self.__class__.__name__)
+        if (observers):
+            self.__observe(msg)
+
+        self.lock.acquire()
+        self.queue.append(msg)
+        self.queued += len(msg)
+        self.__pause()
+        self.lock.release()
+        if (not comm.add_to_batch(self)):
+            self.flush()
+
+    def flush(self):
+        """Write messages queued
+
+        Does nothing if waiting for socket to be writable.
+        """
+        self.lock.acquire()
+        try:
+            if ((not self.waiting) and (self.queued > 0)):
+                self.__write()
+        finally:
+            self.lock.release()
+
+    def writable(self):
+        """Write messages queued when socket is writable
+        """
+        self.lock.acquire()
+        try:
+            self.__write()
+        finally:
+            self.lock.release()
+
+    def __write(self):
+        """Write messages queued with a single send
+
+        Must be called with lock held.
+        """
+        data = "".join(self.queue)
+        while True:
             try:
-                self.sock.send(header.pack()+remain)
-            except socket.error:
-                output.warn("Broken pipe, message not sent",
-                            self.__class__.__name__)
+                sent = self.sock.send(data)
+            except socket.error, e:
+                if (e.args[0] not in (errno.EAGAIN, errno.EWOULDBLOCK,
+                                      errno.EINTR)):
+                    output.warn("Broken pipe, "+str(len(data))+\
+                                    " bytes not sent",
+                                self.__class__.__name__)
+                    self.queue = []
+                    self.queued = 0
+                    return
+                sent = 0
+            self.send_calls += 1
+            self.bytes_sent += sent
+            data = data[sent:]
+            if ((len(data) == 0) or (self.recv != None)):
+                break
+            #No receive thread to wait for, so wait here
+            select.select([], [self.sock], [])
+
+        if (len(data) == 0):
+            self.queue = []
+        else:
+            self.queue = [data]
+        self.queued = len(data)
+        self.__wait()
+
+    def __wait(self):
+        """Wait for socket to be writable if bytes remain queued
+
+        Must be called with lock held.
+        """
+        if (self.recv == None):
+            return
+        waiting = (self.queued > 0)
+        if (waiting != self.waiting):
+            self.waiting = waiting
+            if (waiting):
+                self.recv.wait_writable(self.sock, self)
+            else:
+                self.recv.wait_writable(self.sock, None)
+        self.__pause()
+
+    def __pause(self):
+        """Pause (or resume) reading from socket by number of bytes queued
+
+        Must be called with lock held.
+        """
+        if (self.recv == None):
+            return
+        if ((not self.paused) and (self.queued > HIGH_WATER)):
+            self.paused = True
+            self.recv.pause(self.sock, True)
+        elif (self.paused and (self.queued < LOW_WATER)):
+            self.paused = False
+            self.recv.pause(self.sock, False)
+
+    def get_stats(self):
+        """Get statistics of sending
+
+        @return dictionary of bytes queued, bytes sent and number of send calls
+        """
+        return {"queued": self.queued,
+                "bytes_sent": self.bytes_sent,
+                "send_calls": self.send_calls}
 
 class connections:
     """Class to manage OpenFlow connections
@@ -106,9 +320,13 @@ class connections:
     @author ykk
     @date Oct 2010
     """
-    def __init__(self):
+    def __init__(self, recv=None):
         """Initialize
+
+        @param recv receive thread (for connections to wait on)
         """
+        ##Reference to receive thread
+        self.recv = recv
         ##Dictionary of connections (indexed by socket)
         self.db = {}
         ##Dictionary of connections (indexed by dpid)
@@ -137,7 +355,7 @@ class connections:
     def add(self, sock):
         """Add connection
         """
-        self.db[sock] = connection(sock)
+        self.db[sock] = connection(sock, self.recv)
 
     def remove(self, sock):
         """Delete connection
@@ -155,38 +373,148 @@ class connections:
 class ofsockmanager(comm.sockmanager):
     """Class to manage OpenFlow 
 
+    Received data is kept in a growable bytearray that is reused 
+    across reads, with messages framed by offset.  Data is received
+    straight into the buffer, up to maxlen bytes per call, till the 
+    socket has no more.  Messages are delivered as strings, or with 
+    views as memoryview into the buffer (in which case handlers must 
+    treat the message as a buffer).
+
     @author ykk
     @date Oct 2010
     """
-    def __init__(self, sock, server):
+    def __init__(self, sock, server, views=False, maxlen=RECV_SIZE):
         """Initialize
+
+        @param sock socket
+        @param server yapc core
+        @param views deliver message as memoryview instead of string
+        @param maxlen maximum amount to receive per call
+        """
+        comm.sockmanager.__init__(self, sock, server, maxlen)
+        ##Buffer for received data
+        self.buffer = bytearray(self.maxlen)
+        ##Offset of first unprocessed byte in buffer
+        self.start = 0
+        ##Offset after last received byte in buffer
+        self.end = 0
+        ##Deliver messages as memoryview
+        self.views = views
+        ##Indicate if views into current buffer are given out
+        self.__exported = False
+
+    def reserve(self, size):
+        """Ensure there is space to receive size bytes in buffer
+
+        Unprocessed data is moved to the front of the buffer, or to
+        a larger (or fresh, if views are given out) buffer.
+
+        @param size number of bytes to receive
+        """
+        if ((self.end+size) <= len(self.buffer)):
+            return
+
+        remain = self.end-self.start
+        buflen = len(self.buffer)
+        while (buflen < (remain+size)):
+            buflen *= 2
+        if ((buflen == len(self.buffer)) and (not self.__exported)):
+            self.buffer[0:remain] = self.buffer[self.start:self.end]
+        else:
+            buf = bytearray(buflen)
+            buf[0:remain] = self.buffer[self.start:self.end]
+            self.buffer = buf
+            self.__exported = False
+        self.start = 0
+        self.end = remain
+
+    def append(self, received):
+        """Append received data to buffer
+
+        @param received data received
+        """
+        size = len(received)
+        self.reserve(size)
+        self.buffer[self.end:self.end+size] = received
+        self.end += size
+
+    def receive(self, sock, recvthread):
+        """Handle received
+
+        Receives into buffer till socket has no more data (if
+        non-blocking), else receives once.
         """
-        comm.sockmanager.__init__(self, sock, server, 2048)
-        ##Header object
-        self.__header = pyopenflow.ofp_header()
-       
+        drain = (sock.gettimeout() == 0)
+        while True:
+            self.reserve(self.maxlen)
+            view = memoryview(self.buffer)
+            self.recv_calls += 1
+            try:
+                size = sock.recv_into(view[self.end:], self.maxlen)
+            except socket.error, e:
+                if (e.args[0] in (errno.EAGAIN, errno.EWOULDBLOCK)):
+                    return
+                if (e.args[0] == errno.EINTR):
+                    continue
+                size = 0
+            finally:
+                del view
+
+            if (size == 0):
+                recvthread.removeconnection(sock)
+                self.scheduler.post_event(comm.event(self.sock,
+                                                     comm.event.SOCK_CLOSE))
+                return
+
+            self.bytes_received += size
+            self.end += size
+            self.parsepacket()
+            if (not drain):
+                return
+
     def parsepacket(self):
         """Parse and process packets
         """
-        if len(self.buffer) >= len(self.__header):
-            self.__header.unpack(self.buffer)
-            
-            while (len(self.buffer) >= self.__header.length):
-                self.processpacket(self.buffer[:self.__header.length])
-
-                self.buffer = self.buffer[self.__header.length:]
-                if len(self.buffer) >= len(self.__header):
-                    self.__header.unpack(self.buffer)
+        buf = self.buffer
+        view = memoryview(buf)
+        start = self.start
+        end = self.end
+        while ((end-start) >= pyopenflow.OFP_HEADER_BYTES):
+            length = HEADER_LENGTH.unpack_from(buf, start+2)[0]
+            if (length < pyopenflow.OFP_HEADER_BYTES):
+                output.warn("Dropping "+str(end-start)+" bytes with "+\
+                                "invalid OpenFlow length "+str(length),
+                            self.__class__.__name__)
+                start = end
+                break
+            if ((end-start) < length):
+                break
+
+            if (self.views):
+                self.__exported = True
+                self.processpacket(view[start:start+length])
+            else:
+                self.processpacket(view[start:start+length].tobytes())
+            start += length
+        del view
+
+        if ((start == end) and (not self.__exported)):
+            self.start = 0
+            self.end = 0
+        else:
+            self.start = start
 
     def processpacket(self, packet):
         """Function to process packet
         
-        (Dummy function that print packet verbatim)
+        Message is decoded once into event by its type (see decoders).
+
+        @param packet OpenFlow message
         """
-        output.vdbg("Receive OpenFlow packet of "+\
-                        self.__header.show().strip().replace("\n",";"),
+        msg = decoders.get(ord(packet[1]), message)(self.sock, packet)
+        output.vdbg(lambda: "Receive OpenFlow packet of "+\
+                        msg.header.show().strip().replace("\n",";"),
                    self.__class__.__name__)
-        msg = message(self.sock, packet)
         self.scheduler.post_event(msg)
 
 class ofserver(yapc.component, yapc.cleanup):
@@ -223,7 +551,7 @@ class ofserver(yapc.component, yapc.cleanup):
         server.register_cleanup(self)
 
         ##OpenFlow connections
-        self.connections = connections()
+        self.connections = connections(server.recv)
         server.register_event_handler(message.name,
                                       self)
         server.register_event_handler(comm.event.name,
@@ -273,11 +601,19 @@ class ofserversocket(comm.sockmanager):
     @author ykk
     @date Oct 2010
     """
-    def __init__(self, scheduler=None, nagle=False):
+    def __init__(self, scheduler=None, nagle=False, views=False,
+                 maxlen=RECV_SIZE):
         """Initialize
+
+        @param scheduler yapc core
+        @param nagle use Nagle's algorithm or not
+        @param views deliver messages as memoryview (see ofsockmanager)
+        @param maxlen maximum amount to receive per call
         """
         self.scheduler = scheduler
         self.nagle = nagle
+        self.views = views
+        self.maxlen = maxlen
 
     def receive(self, sock, recvthread):
         """Receive new connection
@@ -287,7 +623,8 @@ class ofserversocket(comm.sockmanager):
             client.setblocking(0)
         if (not self.nagle):
             client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
-        recvthread.addconnection(client, ofsockmanager(client, self.scheduler))
+        recvthread.addconnection(client, ofsockmanager(client, self.scheduler,
+                                                       self.views, self.maxlen))
         self.scheduler.post_event(comm.event(client,
                                              comm.event.SOCK_OPEN))
         output.dbg("Connection to "+str(address)+" added", self.__class__.__name__)
@@ -0,0 +1,396 @@
+##OpenFlow transactions
+#
+# Correlates requests sent to switches with their replies by xid, so
+# that components can have many requests outstanding per switch and
+# be called back with the reply (or error) of each.
+#
+# @author ykk
+# @date Oct 2011
+#
+import yapc.interface as yapc
+import yapc.log.output as output
+import yapc.comm.core as comm
+import yapc.comm.openflow as ofcomm
+import yapc.pyopenflow as pyof
+import yapc.util.openflow as ofutil
+import collections
+import threading
+import struct
+
+##Struct of xid in header
+HEADER_XID = struct.Struct("!L")
+##Struct of flags in stats reply
+STATS_FLAGS = struct.Struct("!H")
+
+##Dictionary of tracker by core
+trackers = {}
+
+##Type of reply by type of request (for requests that are replied)
+REPLY_TYPES = {pyof.OFPT_ECHO_REQUEST: pyof.OFPT_ECHO_REPLY,
+               pyof.OFPT_FEATURES_REQUEST: pyof.OFPT_FEATURES_REPLY,
+               pyof.OFPT_GET_CONFIG_REQUEST: pyof.OFPT_GET_CONFIG_REPLY,
+               pyof.OFPT_STATS_REQUEST: pyof.OFPT_STATS_REPLY,
+               pyof.OFPT_BARRIER_REQUEST: pyof.OFPT_BARRIER_REPLY,
+               pyof.OFPT_QUEUE_GET_CONFIG_REQUEST:
+               pyof.OFPT_QUEUE_GET_CONFIG_REPLY}
+
+class transaction:
+    """Request sent to switch, as handle to its outcome
+
+    @author ykk
+    @date Oct 2011
+    """
+    ##Waiting for reply (or barrier)
+    PENDING = 0
+    ##Replied, or processed as shown by barrier
+    DONE = 1
+    ##Error received
+    FAILED = 2
+    ##No reply (or barrier) before timeout (after retries)
+    TIMEOUT = 3
+    ##Connection closed
+    CLOSED = 4
+    def __init__(self, conn, msg, xid, callback=None,
+                 timeout=None, retries=0):
+        """Initialize
+
+        @param conn connection request is sent on
+        @param msg request (binary)
+        @param xid xid of request
+        @param callback function called with transaction when completed
+        @param timeout time to wait for reply (or later barrier if no
+                       reply is expected)
+        @param retries number of times to resend request on timeout
+        """
+        ##Connection
+        self.conn = conn
+        ##Socket of connection
+        self.sock = conn.sock
+        ##Request
+        self.message = msg
+        ##Xid of request
+        self.xid = xid
+        ##Type of reply expected (None if none)
+        self.reply_type = REPLY_TYPES.get(ord(msg[1]))
+        ##Callback
+        self.callback = callback
+        ##Time to wait for reply
+        self.timeout = timeout
+        ##Number of retries left
+        self.retries = retries
+        ##State
+        self.state = transaction.PENDING
+        ##Replies (more than one for multipart replies)
+        self.replies = []
+        ##Error event (if failed)
+        self.error = None
+        ##Handle of timer (if any)
+        self.timer = None
+        ##Event set when completed
+        self.__completed = threading.Event()
+
+    def done(self):
+        """Check if transaction is completed
+
+        @return if not pending
+        """
+        return (self.state != transaction.PENDING)
+
+    def succeeded(self):
+        """Check if transaction is completed without error
+
+        @return if done
+        """
+        return (self.state == transaction.DONE)
+
+    def get_reply(self):
+        """Get (first) reply
+
+        @return reply event (None if none)
+        """
+        if (len(self.replies) == 0):
+            return None
+        return self.replies[0]
+
+    def wait(self, timeout=None):
+        """Wait for transaction to complete
+
+        Must not be called from an event handler, since the
+        reply is processed by the dispatcher.
+
+        @param timeout time to wait (None to wait till completed)
+        @return if completed
+        """
+        self.__completed.wait(timeout)
+        return self.done()
+
+    def complete(self, state):
+        """Complete transaction
+
+        @param state state of completion
+        """
+        self.state = state
+        if (self.timer != None):
+            self.timer.cancel()
+            self.timer = None
+        self.__completed.set()
+        if (self.callback != None):
+            self.callback(self)
+
+class tracker(yapc.component):
+    """Tracker of requests sent to switches
+
+    Each request sent is tracked by connection and xid till it is
+    completed by
+    * its reply (all replies of a multipart stats reply),
+    * an error of its xid,
+    * a barrier reply of a later barrier (for requests without reply,
+      e.g., flow mod, since earlier requests are processed by then),
+    * a timeout (after retries for requests with reply, while requests
+      without reply are not resent), or
+    * the connection closing.
+
+    @author ykk
+    @date Oct 2011
+    """
+    ##Transactions are kept per switch
+    shard_safe = True
+    def __init__(self, server, timeout=5, retries=0):
+        """Initialize
+
+        @param server yapc core
+        @param timeout default time to wait for reply
+        @param retries default number of times to resend on timeout
+        """
+        ##Reference to core
+        self.server = server
+        ##Default timeout
+        self.timeout = timeout
+        ##Default number of retries
+        self.retries = retries
+        ##Dictionary of pending transactions (by xid, in order sent)
+        ##indexed by socket
+        self.pending = {}
+        ##Lock for pending transactions
+        self.__lock = threading.Lock()
+
+        server.register_event_handler(ofcomm.message.name, self)
+        server.register_event_handler(comm.event.name, self)
+
+    def send(self, conn, msg, callback=None, timeout=None, retries=None):
+        """Send request and track it
+
+        Request with xid of 0 is given a new xid.
+
+        @param conn connection to send request on
+        @param msg request (binary)
+        @param callback function called with transaction when completed
+        @param timeout time to wait for reply (default of tracker if None)
+        @param retries number of resend on timeout (default of tracker if None)
+        @return transaction
+        """
+        t = self.__track(conn, msg, callback, timeout, retries)
+        t.conn.send(t.message)
+        self.__start_timer(t)
+        return t
+
+    def send_batch(self, conn, msgs, callbacks=None,
+                   timeout=None, retries=None):
+        """Send requests in a single buffer and track each
+
+        Requests are resent individually on timeout.
+
+        @param conn connection to send requests on
+        @param msgs list of requests (binary)
+        @param callbacks list of callback of each request (if any)
+        @param timeout time to wait for reply (default of tracker if None)
+        @param retries number of resend on timeout (default of tracker if None)
+        @return list of transactions
+        """
+        if (callbacks == None):
+            callbacks = [None]*len(msgs)
+        ts = [self.__track(conn, m, c, timeout, retries)
+              for (m, c) in zip(msgs, callbacks)]
+        conn.send("".join([t.message for t in ts]), False)
+        for t in ts:
+            self.__start_timer(t)
+        return ts
+
+    def __track(self, conn, msg, callback, timeout, retries):
+        """Track request
+
+        @param conn connection to send request on
+        @param msg request (binary)
+        @param callback function called with transaction when completed
+        @param timeout time to wait for reply (default of tracker if None)
+        @param retries number of resend on timeout (default of tracker if None)
+        @return transaction
+        """
+        xid = HEADER_XID.unpack_from(msg, 4)[0]
+        if (xid == 0):
+            xid = ofutil.get_xid()
+            msg = msg[:4]+HEADER_XID.pack(xid)+msg[8:]
+        if (timeout == None):
+            timeout = self.timeout
+        if (retries == None):
+            retries = self.retries
+
+        t = transaction(conn, msg, xid, callback, timeout, retries)
+        if (t.reply_type == None):
+            t.retries = 0
+        self.__lock.acquire()
+        if (conn.sock not in self.pending):
+            self.pending[conn.sock] = collections.OrderedDict()
+        self.pending[conn.sock][xid] = t
+        self.__lock.release()
+        return t
+
+    def barrier(self, conn, callback=None, timeout=None):
+        """Send barrier request, which completes earlier requests
+        (without reply) when replied
+
+        @param conn connection to send barrier on
+        @param callback function called with transaction when completed
+        @param timeout time to wait for reply (default of tracker if None)
+        @return transaction of barrier
+        """
+        br = pyof.ofp_header()
+        br.type = pyof.OFPT_BARRIER_REQUEST
+        return self.send(conn, br.pack(), callback, timeout)
+
+    def get_pending(self, sock):
+        """Get number of pending transactions of socket
+
+        @param sock socket
+        @return number of pending transactions
+        """
+        return len(self.pending.get(sock, {}))
+
+    def __start_timer(self, t):
+        """Set timer for reply of transaction
+
+        @param t transaction
+        """
+        if (t.timeout != None):
+            t.timer = self.server.post_event(yapc.priv_callback(self, t),
+                                             t.timeout)
+
+    def __get(self, sock, xid):
+        """Get pending transaction
+
+        @param sock socket
+        @param xid xid of transaction
+        @return transaction (None if not pending)
+        """
+        self.__lock.acquire()
+        t = None
+        p = self.pending.get(sock)
+        if (p != None):
+            t = p.get(xid)
+        self.__lock.release()
+        return t
+
+    def __pop(self, sock, xid):
+        """Remove transaction from pending
+
+        @param sock socket
+        @param xid xid of transaction
+        @return transaction (None if not pending)
+        """
+        self.__lock.acquire()
+        t = None
+        p = self.pending.get(sock)
+        if (p != None):
+            t = p.pop(xid, None)
+            if (len(p) == 0):
+                del self.pending[sock]
+        self.__lock.release()
+        return t
+
+    def __pop_before(self, sock, xid, noreply=False):
+        """Remove transactions sent before transaction from pending
+
+        @param sock socket
+        @param xid xid of transaction
+        @param noreply remove only transactions without reply
+        @return list of transactions in order sent
+        """
+        r = []
+        self.__lock.acquire()
+        p = self.pending.get(sock)
+        if (p != None):
+            for (x, t) in p.items():
+                if (x == xid):
+                    break
+                if ((not noreply) or (t.reply_type == None)):
+                    r.append(p.pop(x))
+        self.__lock.release()
+        return r
+
+    def processevent(self, event):
+        """Event handler
+
+        @param event event to handle
+        """
+        if (isinstance(event, ofcomm.message)):
+            t = self.__get(event.sock, event.header.xid)
+            if (t == None):
+                return True
+            if (event.header.type == pyof.OFPT_ERROR):
+                if (self.__pop(event.sock, t.xid) != t):
+                    return True
+                t.error = event
+                output.dbg("Request of xid "+str(t.xid)+" failed",
+                           self.__class__.__name__)
+                t.complete(transaction.FAILED)
+            elif (event.header.type == t.reply_type):
+                t.replies.append(event)
+                if ((event.header.type == pyof.OFPT_STATS_REPLY) and
+                    (len(event.message) >= pyof.OFP_STATS_REPLY_BYTES) and
+                    (STATS_FLAGS.unpack_from(event.message, 10)[0] &
+                     pyof.OFPSF_REPLY_MORE)):
+                    return True
+                if (event.header.type == pyof.OFPT_BARRIER_REPLY):
+                    for e in self.__pop_before(event.sock, t.xid, True):
+                        e.complete(transaction.DONE)
+                if (self.__pop(event.sock, t.xid) == t):
+                    t.complete(transaction.DONE)
+
+        elif (isinstance(event, yapc.priv_callback)):
+            t = event.magic
+            if (t.done() or (t.timer == None)):
+                return True
+            t.timer = None
+            if (t.retries > 0):
+                t.retries -= 1
+                output.dbg("Resending request of xid "+str(t.xid),
+                           self.__class__.__name__)
+                t.conn.send(t.message)
+                self.__start_timer(t)
+            elif (self.__pop(t.sock, t.xid) != None):
+                output.dbg("Request of xid "+str(t.xid)+" timed out",
+                           self.__class__.__name__)
+                if (t.reply_type == pyof.OFPT_BARRIER_REPLY):
+                    for e in self.__pop_before(t.sock, t.xid, True):
+                        e.complete(transaction.TIMEOUT)
+                t.complete(transaction.TIMEOUT)
+
+        elif (isinstance(event, comm.event) and
+              (event.event == comm.event.SOCK_CLOSE)):
+            self.__lock.acquire()
+            p = self.pending.pop(event.sock, {})
+            self.__lock.release()
+            for t in p.values():
+                t.complete(transaction.CLOSED)
+
+        return True
+
+def get_tracker(server):
+    """Get tracker shared by components of core
+
+    @param server yapc core
+    @return tracker (created on first call)
+    """
+    if (server not in trackers):
+        trackers[server] = tracker(server)
+    return trackers[server]
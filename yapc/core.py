@@ -9,70 +9,266 @@ import time
 import os
 import sys
 import signal
-import bisect
+import heapq
+import select
 import threading
+import collections
 import traceback
+import inspect
 import yapc.comm.core as comm
 import yapc.comm.openflow as ofcomm
 import yapc.log.output as output
 import yapc.interface as yapc
 
-class eventqueue:
-    """Queue to hold timed event
+class waker:
+    """Wakeup primitive for dispatcher threads
+
+    Built on a pipe rather than threading.Condition, since a timed
+    wait on a condition polls (and an untimed one blocks signals)
+    in Python 2.  The pipe is only written when a thread is
+    actually waiting, so a busy dispatcher costs no system call.
 
     @author ykk
-    @date Feb 2011
+    @date Oct 2011
+    """
+    def __init__(self):
+        """Initialize
+        """
+        ##Lock guarding waiting state
+        self.lock = threading.Lock()
+        ##Indicate if a thread is waiting
+        self.__waiting = False
+        ##Pipe to wake waiting thread
+        (self.__rfd, self.__wfd) = os.pipe()
+
+    def prepare(self):
+        """Indicate thread is about to wait
+
+        Must be called with lock held.
+        """
+        self.__waiting = True
+
+    def notify(self):
+        """Wake waiting thread if any
+
+        Must be called with lock held.
+        """
+        if (self.__waiting):
+            self.__waiting = False
+            os.write(self.__wfd, "x")
+
+    def wait(self, timeout):
+        """Wait for notification (without holding lock)
+
+        @param timeout maximum time to wait (None for forever)
+        """
+        try:
+            r = select.select([self.__rfd], [], [], timeout)[0]
+        except select.error:
+            #Interrupted by signal
+            r = []
+        if (len(r) != 0):
+            os.read(self.__rfd, 512)
+        self.lock.acquire()
+        self.__waiting = False
+        self.lock.release()
+
+    def interrupt(self):
+        """Wake waiting thread unconditionally (e.g., for shutdown)
+        """
+        os.write(self.__wfd, "x")
+
+class eventfifo:
+    """FIFO queue to hold non-timed event
+
+    Events are posted from many threads and consumed by the
+    dispatcher, which is woken as soon as an event is posted.
+
+    @author ykk
+    @date Oct 2011
     """
     def __init__(self):
         """Initialize
         """
         ##Internal queue for events
-        self.__events = []
-        ##Internal queue for time
-        self.__time = []
+        self.__events = collections.deque()
+        ##Wakeup for consumer
+        self.__waker = waker()
+        ##Number of events posted
+        self.posted = 0
+        ##Maximum depth of queue seen
+        self.high_water = 0
 
     def __len__(self):
         """Length of queue
         """
         return len(self.__events)
 
-    def add(self, event, clock):
+    def add(self, event):
         """Add event
-        
+
         @param event event to add
+        """
+        self.__waker.lock.acquire()
+        self.__events.append(event)
+        self.posted += 1
+        if (len(self.__events) > self.high_water):
+            self.high_water = len(self.__events)
+        self.__waker.notify()
+        self.__waker.lock.release()
+
+    def get_next(self, timeout=None):
+        """Get next event, waiting for one if queue is empty
+
+        @param timeout maximum time to wait
+        @return event (or None if none is posted in time)
+        """
+        self.__waker.lock.acquire()
+        if (len(self.__events) == 0):
+            self.__waker.prepare()
+            self.__waker.lock.release()
+            self.__waker.wait(timeout)
+            self.__waker.lock.acquire()
+        e = None
+        if (len(self.__events) != 0):
+            e = self.__events.popleft()
+        self.__waker.lock.release()
+        return e
+
+    def get_stats(self):
+        """Get statistics of queue
+
+        @return dictionary of depth, high water mark and number posted
+        """
+        return {"depth": len(self.__events),
+                "high_water": self.high_water,
+                "posted": self.posted}
+
+    def reset_high_water(self):
+        """Reset high water mark to current depth
+        """
+        self.high_water = len(self.__events)
+
+    def interrupt(self):
+        """Wake consumer (e.g., for shutdown)
+        """
+        self.__waker.interrupt()
+
+class timer:
+    """Handle to timed event, allowing it to be cancelled
+
+    @author ykk
+    @date Oct 2011
+    """
+    def __init__(self, queue, event, clock):
+        """Initialize
+
+        @param queue event queue timer is in
+        @param event event to dispatch
         @param clock time to dispatch (based on time.time())
         """
-        p = bisect.bisect(self.__time, clock)
-        bisect.insort(self.__time, clock)
-        self.__events.insert(p, event)
-        output.vvdbg(str(event)+" inserted for dispatch at time "+str(clock),
-                     self.__class__.__name__)
+        ##Reference to queue
+        self.__queue = queue
+        ##Reference to event
+        self.event = event
+        ##Time to dispatch
+        self.clock = clock
+        ##Indicate if cancelled
+        self.cancelled = False
+
+    def __nonzero__(self):
+        """Timer is always True (as returned by post_event)
+        """
+        return True
+
+    def cancel(self):
+        """Cancel timed event (if not already dispatched)
+        """
+        self.__queue.cancel(self)
+
+class eventqueue:
+    """Queue to hold timed event
 
-    def get_events(self):
-        """Retrieve clone of event queue
+    Binary heap of (time, sequence, timer), so that add and get are
+    O(log n).  Cancelled timers are left in the heap and skipped, with
+    the heap compacted once they make up most of it.
 
-        @return list of events
+    @author ykk
+    @date Feb 2011
+    """
+    def __init__(self):
+        """Initialize
         """
-        r = self.__events[:]
-        return r
+        ##Heap of (time, sequence, timer)
+        self.__heap = []
+        ##Sequence number to keep order of events with same time
+        self.__seq = 0
+        ##Number of cancelled timers in heap
+        self.cancelled = 0
+        ##Wakeup for consumer
+        self.__waker = waker()
+
+    def __len__(self):
+        """Length of queue (excluding cancelled events)
+        """
+        return len(self.__heap)-self.cancelled
+
+    def add(self, event, clock):
+        """Add event
+        
+        @param event event to add
+        @param clock time to dispatch (based on time.time())
+        @return timer handle for event
+        """
+        t = timer(self, event, clock)
+        self.__waker.lock.acquire()
+        self.__seq += 1
+        heapq.heappush(self.__heap, (clock, self.__seq, t))
+        if (self.__heap[0][2] is t):
+            #Earlier than what consumer is waiting for
+            self.__waker.notify()
+        self.__waker.lock.release()
+        output.vvdbg("%s inserted for dispatch at time %s",
+                     self.__class__.__name__, event, clock)
+        return t
+
+    def cancel(self, t):
+        """Cancel timer
+
+        @param t timer handle to cancel
+        """
+        self.__waker.lock.acquire()
+        if (not t.cancelled):
+            t.cancelled = True
+            self.cancelled += 1
+        self.__waker.lock.release()
 
-    def get_time(self):
-        """Retrieve clone of event time
+    def __purge(self):
+        """Remove cancelled timers at head of heap (or compact heap)
 
-        @return list of time
+        Must be called with lock held.
         """
-        r = self.__time[:]
-        return r
+        if ((self.cancelled > 64) and 
+            (self.cancelled*2 > len(self.__heap))):
+            self.__heap = [e for e in self.__heap if not e[2].cancelled]
+            heapq.heapify(self.__heap)
+            self.cancelled = 0
+        while ((len(self.__heap) != 0) and self.__heap[0][2].cancelled):
+            heapq.heappop(self.__heap)
+            self.cancelled -= 1
 
     def get_next_time(self):
         """Retrieve time of next event
 
         @return next event's time
         """
-        if (len(self.__time) == 0):
-            return None
-
-        return self.__time[0]
+        self.__waker.lock.acquire()
+        self.__purge()
+        t = None
+        if (len(self.__heap) != 0):
+            t = self.__heap[0][0]
+        self.__waker.lock.release()
+        return t
 
     def has_event_ready(self):
         """Indicate if there is any event ready to run
@@ -85,28 +281,100 @@ class eventqueue:
         else:
             return (t <= time.time())
 
-    def get_next(self):
-        """Get next time and event
+    def __pop_ready(self):
+        """Pop next event if ready
+
+        Must be called with lock held.
+        @return tuple of time and event (or None)
+        """
+        self.__purge()
+        if ((len(self.__heap) != 0) and
+            (self.__heap[0][0] <= time.time())):
+            (t, seq, tm) = heapq.heappop(self.__heap)
+            tm.cancelled = True
+            return (t, tm.event)
+        return None
+
+    def get_next(self, timeout=None):
+        """Get next time and event, waiting till it is due
+
+        Sleeps till the next event is due, or an earlier event is added.
         
-        @return tuple of time and event
+        @param timeout maximum time to wait (None for forever)
+        @return tuple of time and event (or None if nothing is due)
         """
-        t = self.__time.pop(0)
-        e = self.__events.pop(0)
-        return (t,e)
+        self.__waker.lock.acquire()
+        r = self.__pop_ready()
+        if (r == None):
+            wait = timeout
+            if (len(self.__heap) != 0):
+                due = self.__heap[0][0]-time.time()
+                if ((wait == None) or (due < wait)):
+                    wait = due
+            self.__waker.prepare()
+            self.__waker.lock.release()
+            self.__waker.wait(wait)
+            self.__waker.lock.acquire()
+            r = self.__pop_ready()
+        self.__waker.lock.release()
+        return r
+
+    def interrupt(self):
+        """Wake consumer (e.g., for shutdown)
+        """
+        self.__waker.interrupt()
+
+##Dictionary of names of base classes of event by class
+base_event_names = {}
+
+def get_base_event_names(cls):
+    """Get names of base classes of event class (most generic first)
+    that are dispatched events of subclasses (see dispatch_subclasses)
+
+    Names that are the same as the class's own are excluded.
+
+    @param cls class of event
+    @return list of event names
+    """
+    try:
+        return base_event_names[cls]
+    except KeyError:
+        pass
+    names = []
+    for c in reversed(inspect.getmro(cls)):
+        n = c.__dict__.get("name")
+        if ((n != None) and c.__dict__.get("dispatch_subclasses", False) and
+            (n != cls.name) and (n not in names)):
+            names.append(n)
+    base_event_names[cls] = names
+    return names
 
 class dispatcher(threading.Thread):
     """Dispatcher class to dispacth events
 
+    An event is dispatched to handlers registered for the names of its
+    base classes (most generic first), and then its own.  So handlers
+    of generic event (e.g., OpenFlow message) see specialized events
+    (e.g., packet in) without the event being posted twice.
+
+    Handlers can be registered with filters on fields of event (see
+    yapc.interface.event.get_field), e.g., dl_type=0x88cc for packet in.
+    Filters are indexed by fields and values, so only the handlers
+    whose filters match are called (in the order of handlers).  The
+    chain of handlers for each combination of filters matched is
+    cached till handlers are registered or reordered.
+
     @author ykk
     @date Feb 2011
     """
     def __init__(self, cleanup,
-                 processors=None, event_queue=None):
+                 processors=None, event_queue=None, filters=None):
         """Initialize
 
         @param cleanup reference to master cleanup
         @param processors reference to processors if any
         @param event_queue reference to event queue if any
+        @param filters reference to filters of processors if any
         """
         threading.Thread.__init__(self)
         ##Reference to cleanup component
@@ -121,10 +389,18 @@ class dispatcher(threading.Thread):
             self._processors = {}
         else:
             self._processors = processors
+        ##Filters of handlers by event name, as
+        ##[unfiltered handlers, {fields: {values: handlers}}, cached chains]
+        if (filters == None):
+            self._filters = {}
+        else:
+            self._filters = filters
         ##Max amount of time to sleep
         self.sleep = 0.1
         ##Indicate if runing
         self.running = True
+        ##Lock serializing handlers that are not shard safe (if any)
+        self.serial = None
 
     def __len__(self):
         """Return length of current event queue
@@ -180,31 +456,83 @@ class dispatcher(threading.Thread):
         #Reorder
         if (lindex < eindex):
             h.insert(lindex, h.pop(eindex))
+            if (eventname in self._filters):
+                self._filters[eventname][2].clear()
 
     def _dispatch_event(self, event):
         """Dispatch next event
 
+        Messages sent by handlers are flushed at the end.
+
+        @param event event to dispatch
+        """
+        comm.begin_batch()
+        try:
+            self.__dispatch_event(event)
+        finally:
+            comm.end_batch()
+
+    def __dispatch_event(self, event):
+        """Dispatch event to handlers
+
         @param event event to dispatch
         """
-        #Dispatch event
         if (isinstance(event, yapc.priv_callback)):
             self.__handle_event(event.handler, event)
-            output.vvdbg("Event "+event.name+" dispatched to "+
-                         event.handler.__class__.__name__,
-                         self.__class__.__name__)
+            output.vvdbg("Event %s dispatched to %s",
+                         self.__class__.__name__,
+                         event.name, event.handler.__class__.__name__)
         else:
-            try:
-                for handler in self._processors[event.name]:
-                    output.vvdbg("Dispatch "+event.name+\
-                                     " to "+handler.__class__.__name__,
-                                 self.__class__.__name__)
+            handled = False
+            for name in get_base_event_names(event.__class__)+[event.name]:
+                handlers = self._processors.get(name)
+                if (handlers == None):
+                    continue
+                handled = True
+                if (name in self._filters):
+                    handlers = self.__get_chain(self._filters[name],
+                                                handlers, event)
+                for handler in handlers:
+                    output.vvdbg("Dispatch %s to %s",
+                                 self.__class__.__name__,
+                                 event.name, handler.__class__.__name__)
                     if (not self.__handle_event(handler, event)):
-                        break
-            except KeyError:
+                        return
+            if (not handled):
                 #No handler, so pass
                 output.vdbg("Event "+str(event.name)+" does not have handler",
                             self.__class__.__name__)
 
+    def __get_chain(self, subscription, handlers, event):
+        """Get chain of handlers whose filters match event
+
+        @param subscription filters of handlers of event name
+        @param handlers ordered list of handlers of event name
+        @param event event to dispatch
+        @return list of handlers
+        """
+        (unfiltered, index, chains) = subscription
+        key = []
+        for (fields, table) in index.items():
+            values = tuple([event.get_field(f) for f in fields])
+            try:
+                if (values in table):
+                    key.append((fields, values))
+            except TypeError:
+                #Unhashable value cannot match
+                pass
+        key = tuple(key)
+
+        try:
+            return chains[key]
+        except KeyError:
+            matched = set(unfiltered)
+            for (fields, values) in key:
+                matched.update(index[fields][values])
+            chain = [h for h in handlers if (h in matched)]
+            chains[key] = chain
+            return chain
+
     def __handle_event(self, handler, event):
         """Handle event
         
@@ -212,6 +540,12 @@ class dispatcher(threading.Thread):
         @param event event
         @return if to pass on to next handler
         """
+        serial = self.serial
+        if ((serial != None) and
+            (not getattr(handler, "shard_safe", False))):
+            serial.acquire()
+        else:
+            serial = None
         try:
             r = handler.processevent(event)
             if (r == None):
@@ -228,14 +562,22 @@ class dispatcher(threading.Thread):
             self.cleanup.cleanup()
             raise
             sys.exit(1)
+        finally:
+            if (serial != None):
+                serial.release()
         return r
 
-    def registereventhandler(self, eventname, handler):
+    def registereventhandler(self, eventname, handler, filters=None):
         """Register handler for event
         
-        Event should be registered in order of calling
+        Event should be registered in order of calling.  A handler
+        registered more than once with filters is called if any of
+        its filters matches (or if it is also registered without).
+
         @param eventname name of event
         @param handler handler function
+        @param filters dictionary of field and (hashable) value the event
+                       must match for handler to be called (if any)
         """
         if (not isinstance(eventname, str)):
             output.warn("Event name "+str(eventname)+" is not  a string",
@@ -244,7 +586,28 @@ class dispatcher(threading.Thread):
         #Register handler
         if (eventname not in self._processors):
             self._processors[eventname] = []
-        self._processors[eventname].append(handler)
+        handlers = self._processors[eventname]
+        subscription = self._filters.get(eventname)
+        if ((filters == None) or (len(filters) == 0)):
+            if (subscription != None):
+                subscription[0].add(handler)
+                subscription[2].clear()
+                if (handler in handlers):
+                    return
+            handlers.append(handler)
+            return
+
+        #Index filters
+        if (subscription == None):
+            subscription = [set(handlers), {}, {}]
+            self._filters[eventname] = subscription
+        fields = tuple(sorted(filters.keys()))
+        values = tuple([filters[f] for f in fields])
+        table = subscription[1].setdefault(fields, {})
+        table.setdefault(values, set()).add(handler)
+        subscription[2].clear()
+        if (handler not in handlers):
+            handlers.append(handler)
 
 class event_dispatcher(dispatcher):
     """Class to dispatch non-timed event
@@ -252,15 +615,14 @@ class event_dispatcher(dispatcher):
     @author ykk
     @date Feb 2011
     """
-    def __init__(self, cleanup, processors=None):
+    def __init__(self, cleanup, processors=None, filters=None):
         """Initialize
 
         @param cleanup master cleanup component
         @param processors reference to processors/handlers if any
+        @param filters reference to filters of handlers if any
         """
-        dispatcher.__init__(self, cleanup, processors)
-        ##Just a record of starting time of each loop
-        self.__starttime = time.time()
+        dispatcher.__init__(self, cleanup, processors, eventfifo(), filters)
 
     def post_event(self, event):
         """Post event
@@ -268,21 +630,32 @@ class event_dispatcher(dispatcher):
         @param event event to post
         @return success status (always True)
         """
-        self._events.append(event)
+        self._events.add(event)
         return True
 
+    def get_stats(self):
+        """Get statistics of event queue
+
+        @return dictionary of depth, high water mark and number posted
+        """
+        return self._events.get_stats()
+
+    def stop(self):
+        """Stop main loop
+        """
+        self.running = False
+        self._events.interrupt()
+
     def run(self):
         """Main loop
+
+        Blocks till event is posted, waking up at least every
+        self.sleep to check if still running.
         """
         while self.running:
-            self.__starttime = time.time()
-
-            while (len(self) > 0):
-                self._dispatch_event(self._events.pop(0))
-
-            sleeptime = self.sleep-(time.time()-self.__starttime)
-            if (sleeptime > 0):
-                time.sleep(sleeptime)
+            event = self._events.get_next(self.sleep)
+            if (event != None):
+                self._dispatch_event(event)
 
 class timed_event_dispatcher(dispatcher):
     """Class to dispatch timed event
@@ -290,15 +663,17 @@ class timed_event_dispatcher(dispatcher):
     @author ykk
     @date Feb 2011
     """
-    def __init__(self, cleanup, processors=None, tolerance=0.1):
+    def __init__(self, cleanup, processors=None, tolerance=0.1,
+                 filters=None):
         """Initalize
 
         @param cleanup master cleanup component
         @param processors reference to processors/handlers if any
         @param tolerance tolerance to timing
+        @param filters reference to filters of handlers if any
         """
         dispatcher.__init__(self, cleanup, processors,
-                            eventqueue())
+                            eventqueue(), filters)
         ##Reference to tolerance
         self.tolerance = tolerance
 
@@ -307,45 +682,38 @@ class timed_event_dispatcher(dispatcher):
 
         @param event event to post
         @param clock time to post event
-        @return success status
+        @return timer handle (which can be cancelled)
         """
-        if (clock > (time.time()+self.sleep)):
-            self._events.add(event, clock)
-            output.vvdbg("Added event "+event.name+" for time "+str(clock),
-                         self.__class__.__name__)
-            return True
-        else:
-            output.warn("Cannot add event "+event.name+\
-                        " shorter than "+str(self.sleep)+\
-                        " before execution time",
-                        self.__class__.__name__)
-            return False
+        output.vvdbg("Added event "+event.name+" for time "+str(clock),
+                     self.__class__.__name__)
+        return self._events.add(event, clock)
+
+    def stop(self):
+        """Stop main loop
+        """
+        self.running = False
+        self._events.interrupt()
 
     def run(self):
         """Main loop
+
+        Sleeps till the next event is due or an earlier event is posted.
         """
         while self.running:
-            if (len(self._events) == 0):
-                #Sleep for some time if nothing to do
-                time.sleep(self.sleep)
+            r = self._events.get_next()
+            if (r == None):
                 continue
+
+            (t, event) = r
+            if ((time.time()-t) > self.tolerance):
+                output.warn("Event "+event.name+" scheduled for "+str(t)+\
+                            " is being run at time "+str(time.time()),
+                            self.__class__.__name__)
             else:
-                while (self._events.has_event_ready()):
-                    (t, event) = self._events.get_next()
-                    if ((t-time.time()) > self.tolerance):
-                        output.warn("Event "+event.name+" scheduled for "+str(t)+\
-                                    " is being run at time "+str(time.time()),
-                                    self.__class__.__name__)
-                    else:
-                        output.vvdbg("Event "+event.name+" scheduled for "+str(t)+\
-                                     " is being run at time "+str(time.time()),
-                                     self.__class__.__name__)
-                    self._dispatch_event(event)
-
-            ntime = self.sleep
-            if (len(self._events) > 0):
-                ntime = self._events.get_next_time() - time.time()
-            time.sleep(min(ntime, self.sleep))
+                output.vvdbg("Event "+event.name+" scheduled for "+str(t)+\
+                             " is being run at time "+str(time.time()),
+                             self.__class__.__name__)
+            self._dispatch_event(event)
 
 class core:
     """yapc core
@@ -353,18 +721,26 @@ class core:
     @author ykk
     @date Oct 2010
     """
-    def __init__(self):
+    def __init__(self, reactor=None):
         """Initialize
+
+        @param reactor name of reactor to poll sockets with
+                       (select, poll, epoll or None for best available)
         """
         ##Event scheduler
         self.__scheduler = event_dispatcher(self,)
         ##Timed Event scheduler
         self.__timedscheduler = timed_event_dispatcher(self,
-                                                       self.__scheduler._processors)
+                                                       self.__scheduler._processors,
+                                                       filters=self.__scheduler._filters)
+        ##Workers for sharded events (if any)
+        self.__workers = []
         ##Receive thread
-        self.recv = comm.receivethread()
+        self.recv = comm.receivethread(reactor)
         ##List of shutdown components
         self.cleanups = []
+        ##Max amount of time to wait for each thread to stop on cleanup
+        self.join_timeout = 1.0
         ##Register for signal
         signal.signal(signal.SIGINT, self.signalhandler)
         signal.signal(signal.SIGTERM, self.signalhandler)
@@ -399,22 +775,27 @@ class core:
         if (lindex < eindex):
             self.cleanups.insert(lindex, self.cleanups.pop(eindex))
 
-    def register_event_handler(self, eventname, handler):
+    def register_event_handler(self, eventname, handler, **filters):
         """Register handler for event
         
-        Event should be registered in order of calling
+        Event should be registered in order of calling.
+        Handler can be restricted to events whose fields match filters,
+        e.g., register_event_handler(pktin.name, self, dl_type=0x0806).
+
         @param eventname name of event
         @param handler handler function
+        @param filters field=value the event must match (if any)
         """
         self.__scheduler.registereventhandler(eventname,
-                                              handler)
+                                              handler, filters)
 
     def post_event(self, event, timedelta = 0):
         """Post event
 
         @param event event to post
         @param timedelta to wait before posting event
-        @return if successful
+        @return if successful (for timed event, a timer handle that
+                can be cancelled)
         """
         #Check event is an event
         if (not isinstance(event, yapc.event)):
@@ -422,11 +803,34 @@ class core:
                         self.__class__.__name__)
 
         if (timedelta == 0):
+            if (len(self.__workers) != 0):
+                key = self.get_shard_key(event)
+                if (key != None):
+                    return self.__workers[hash(key) % len(self.__workers)].\
+                        post_event(event)
             return self.__scheduler.post_event(event)
         else:
             return self.__timedscheduler.post_event(event,
                                                     timedelta+time.time())
 
+    def get_shard_key(self, event):
+        """Get key to shard event on when running with workers
+
+        Events of the same key are dispatched in order by the same worker.
+        Default uses the socket (i.e., switch) the event pertains to.
+
+        @param event event to shard
+        @return key (None if event should go to the main queue)
+        """
+        return getattr(event, "sock", None)
+
+    def get_event_queue_stats(self):
+        """Get statistics of (non-timed) event queue
+
+        @return dictionary of depth, high water mark and number posted
+        """
+        return self.__scheduler.get_stats()
+
     def register_cleanup(self, shutdown):
         """Register shutdown
         
@@ -439,14 +843,36 @@ class core:
         """
         self.__scheduler.print_event_handlers()
 
-    def run(self, runbg=False, runtimedscheduler=True):
+    def run(self, runbg=False, runtimedscheduler=True, workers=0):
         """Run core
 
+        With workers, events with a shard key (see get_shard_key) are
+        dispatched by one of the workers, so that events of one switch
+        stay in order while different switches proceed in parallel.
+        Handlers that do not declare shard_safe are still run one at a
+        time across all dispatchers.
+
         @param runbg runs everything as thread in background
         @param runtimedscheduler run timed scheduler or not
+        @param workers number of workers to shard events over (0 for none)
         """
         self.__scheduler.print_event_handlers()
 
+        if (workers > 0):
+            serial = threading.Lock()
+            self.__scheduler.serial = serial
+            self.__timedscheduler.serial = serial
+            for i in range(0, workers):
+                w = event_dispatcher(self, self.__scheduler._processors,
+                                     self.__scheduler._filters)
+                w.serial = serial
+                w.daemon = True
+                self.__workers.append(w)
+            for w in self.__workers:
+                w.start()
+            output.dbg("Sharding events over "+str(workers)+" workers",
+                       self.__class__.__name__)
+
         self.recv.start()
         if (runtimedscheduler):
             self.__timedscheduler.start()
@@ -473,8 +899,10 @@ class core:
         """
         ##Set running to false for all
         self.recv.running = False
-        self.__timedscheduler.running = False
-        self.__scheduler.running = False
+        self.__timedscheduler.stop()
+        self.__scheduler.stop()
+        for w in self.__workers:
+            w.stop()
 
         output.dbg("Cleaning up...",
                    self.__class__.__name__)
@@ -482,11 +910,17 @@ class core:
             output.dbg("Cleaning up "+shutdown.__class__.__name__+"...",
                        self.__class__.__name__)
             shutdown.cleanup()
-        
-        try:
-            self.__timedscheduler.join(1.0)
-        except RuntimeError:
-            pass
+
+        #Join threads (except the one cleaning up), so that none is
+        #still running at interpreter shutdown
+        for t in [self.__timedscheduler, self.__scheduler]+\
+                self.__workers+[self.recv]:
+            if (t.is_alive() and (t is not threading.current_thread())):
+                t.join(self.join_timeout)
+                if (t.is_alive()):
+                    output.warn(t.__class__.__name__+\
+                                    " did not stop in time",
+                                self.__class__.__name__)
 
     def signalhandler(self, signal, frame):
         """Handle signal
@@ -5,9 +5,12 @@
 #
 import yapc.interface as yapc
 import yapc.log.output as output
+import yapc.comm.core as comm
 import yapc.comm.openflow as ofcomm
 import yapc.pyopenflow as pyof
+import yapc.ofcodec as ofcodec
 import yapc.util.openflow as ofutil
+import dpkt
 
 class action_unpacker:
     """Class that implements functions to unpack actions
@@ -63,10 +66,18 @@ class action_unpacker:
 
 class parser(yapc.component):
     """OpenFlow parser that generates OpenFlow events
+
+    The parser installs its decoders (see DECODERS) in the OpenFlow
+    framing layer, so that each message is decoded once by its type
+    and posted as its event directly.  Handlers of OpenFlow messages
+    see these events too (as subclasses of message).  Messages posted
+    undecoded are decoded and posted as their events here.
     
     @author ykk
     @date Feb 2011
     """
+    ##Parsing is stateless
+    shard_safe = True
     def __init__(self, server):
         """Initialize
         
@@ -74,7 +85,9 @@ class parser(yapc.component):
         """
         ##Reference to scheduler
         self.scheduler = server
-
+        
+        for (msgtype, decoder) in DECODERS.items():
+            ofcomm.register_decoder(msgtype, decoder)
         server.register_event_handler(ofcomm.message.name, self)
 
     def processevent(self, event):
@@ -82,45 +95,27 @@ class parser(yapc.component):
 
         @param event event to handle
         """
-        if (isinstance(event, ofcomm.message)):
-            if (event.header.type == pyof.OFPT_FLOW_REMOVED):
-                self.scheduler.post_event(flow_removed(event.sock,
-                                                       event.message))
-
-            elif (event.header.type == pyof.OFPT_PACKET_IN):
-                self.scheduler.post_event(pktin(event.sock,
-                                                event.message))
-
-            elif (event.header.type == pyof.OFPT_ERROR):
-                self.scheduler.post_event(error(event.sock,
-                                                event.message))
-
-            elif (event.header.type == pyof.OFPT_GET_CONFIG_REPLY):
-                self.scheduler.post_event(config_reply(event.sock,
-                                                       event.message))
-
-            elif (event.header.type == pyof.OFPT_FEATURES_REPLY):
-                self.scheduler.post_event(features_reply(event.sock,
-                                                         event.message))
-
-            elif (event.header.type == pyof.OFPT_PORT_STATUS):
-                self.scheduler.post_event(port_status(event.sock,
-                                                      event.message))
-
-            elif (event.header.type == pyof.OFPT_STATS_REPLY):
-                self.handle_stats_reply(event)
+        if (event.__class__ is ofcomm.message):
+            decoder = DECODERS.get(event.header.type)
+            if (decoder != None):
+                e = decoder(event.sock, event.message)
+                if (e.__class__ is not ofcomm.message):
+                    self.scheduler.post_event(e)
 
         return True
 
-    def handle_stats_reply(self, event):
-        """Handle stats reply
-        """
-        stats_reply = pyof.ofp_stats_reply()
-        reply = stats_reply.unpack(event.message)
-        if (stats_reply.type == pyof.OFPST_FLOW):
-            self.scheduler.post_event(flow_stats(event.sock,
-                                                 event.message,
-                                                 stats_reply, reply))
+def decode_stats_reply(sock, msg):
+    """Decode stats reply into event by type of stats
+
+    @param sock reference to socket
+    @param msg message
+    @return event (message event for stats without event)
+    """
+    stats_reply = ofcodec.view(pyof.ofp_stats_reply, msg)
+    decoder = STATS_DECODERS.get(stats_reply.type)
+    if (decoder != None):
+        return decoder(sock, msg, stats_reply)
+    return ofcomm.message(sock, msg)
 
 class error(ofcomm.message):
     """Error in OpenFlow
@@ -141,8 +136,7 @@ class error(ofcomm.message):
         self.error = None
 
         if (self.header.type == pyof.OFPT_ERROR):
-            self.error = pyof.ofp_error_msg()
-            self.error.unpack(msg)
+            self.error = ofcodec.view(pyof.ofp_error_msg, msg)
 
 class port_status(ofcomm.message):
     """Port status in OpenFlow
@@ -163,8 +157,7 @@ class port_status(ofcomm.message):
         self.port = None
 
         if (self.header.type == pyof.OFPT_PORT_STATUS):
-            self.port = pyof.ofp_port_status()
-            self.port.unpack(msg)
+            self.port = ofcodec.view(pyof.ofp_port_status, msg)
 
 class config_reply(ofcomm.message):
     """Switch config in OpenFlow
@@ -185,11 +178,11 @@ class config_reply(ofcomm.message):
         self.config = None
 
         if (self.header.type == pyof.OFPT_GET_CONFIG_REPLY):
-            self.config = pyof.ofp_switch_config()
-            r = self.config.unpack(msg)
-            if (len(r) > 0):
+            self.config = ofcodec.view(pyof.ofp_switch_config, msg)
+            r = len(msg) - pyof.OFP_SWITCH_CONFIG_BYTES
+            if (r > 0):
                 output.warn("Config reply is of irregular length with "+\
-                                str(len(r))+" bytes remaining.",
+                                str(r)+" bytes remaining.",
                             self.__class__.__name__)
             output.dbg("Received switch config:\n"+\
                            self.config.show("\t"),
@@ -214,15 +207,15 @@ class features_reply(ofcomm.message):
         self.features = None
         
         if (self.header.type == pyof.OFPT_FEATURES_REPLY):
-            self.features = pyof.ofp_switch_features()
-            r = self.features.unpack(msg)
-            while (len(r) >= pyof.OFP_PHY_PORT_BYTES):
-                p = pyof.ofp_phy_port()
-                r = p.unpack(r)
-                self.features.ports.append(p)
-            if (len(r) > 0):
+            self.features = ofcodec.view(pyof.ofp_switch_features, msg)
+            r = pyof.OFP_SWITCH_FEATURES_BYTES
+            while (len(msg) - r >= pyof.OFP_PHY_PORT_BYTES):
+                self.features.ports.append(ofcodec.view(pyof.ofp_phy_port,
+                                                        msg, r))
+                r += pyof.OFP_PHY_PORT_BYTES
+            if (len(msg) > r):
                 output.warn("Features reply is of irregular length with "+\
-                                str(len(r))+" bytes remaining.",
+                                str(len(msg)-r)+" bytes remaining.",
                             self.__class__.__name__)
             output.dbg("Received switch features:\n"+\
                            self.features.show("\t"),
@@ -247,8 +240,7 @@ class flow_removed(ofcomm.message):
         self.flowrm = None
 
         if (self.header.type == pyof.OFPT_FLOW_REMOVED):
-            self.flowrm = pyof.ofp_flow_removed()
-            self.flowrm.unpack(msg)
+            self.flowrm = ofcodec.view(pyof.ofp_flow_removed, msg)
 
 class pktin(ofcomm.message):
     """Packet in event in OpenFlow
@@ -260,6 +252,11 @@ class pktin(ofcomm.message):
     def __init__(self, sock, msg):
         """Initialize
 
+        Match is read from fixed offsets of the packet, and the packet 
+        is only parsed by dpkt when self.dpkt is accessed.  The compact
+        match (see ofutil.match) is formed when self.compact_match is
+        accessed.
+
         @param sock reference to socket
         @param msg message
         """
@@ -267,28 +264,59 @@ class pktin(ofcomm.message):
 
         ##Packet in header
         self.pktin = None
-        ##Packet included parsed by dpkt
-        self.dpkt = None
         ##Binary packet
         self.pkt = None
         ##Exact match for match
         self.match = None
 
         if (self.header.type == pyof.OFPT_PACKET_IN):
-            self.pktin = pyof.ofp_packet_in()
-            self.pkt = self.pktin.unpack(msg)
-            output.vdbg("Packet in\n"+self.pktin.show("\t"),
-                        self.__class__.__name__)
-            (self.match, self.dpkt) = ofutil.get_ofp_match(self.pktin.in_port, 
-                                                           self.pkt)
-            output.vdbg("Packet has match\n"+self.match.show("\t"),
+            self.pktin = ofcodec.view(pyof.ofp_packet_in, msg)
+            self.pkt = msg[pyof.OFP_PACKET_IN_BYTES:]
+            output.vdbg(lambda: "Packet in\n"+self.pktin.show("\t"),
                         self.__class__.__name__)
-            output.vdbg(str(`self.dpkt`),
+            self.match = ofutil.get_fast_ofp_match(self.pktin.in_port,
+                                                   self.pkt)
+            output.vdbg(lambda: "Packet has match\n"+self.match.show("\t"),
                         self.__class__.__name__)
+        else:
+            self.dpkt = None
+
+    def __getattr__(self, name):
+        """Parse packet with dpkt on first access of self.dpkt
+        (and form compact match on first access of self.compact_match)
+
+        @param name name of attribute
+        """
+        if ((name == "compact_match") and (self.__dict__.get("match") != None)):
+            ##Compact match of packet
+            self.compact_match = ofutil.get_match(self.match)
+            return self.compact_match
+        if ((name == "dpkt") and (self.__dict__.get("pkt") != None)):
+            pkt = self.pkt
+            if (isinstance(pkt, memoryview)):
+                pkt = pkt.tobytes()
+            ##Packet included parsed by dpkt
+            self.dpkt = dpkt.ethernet.Ethernet(pkt)
+            return self.dpkt
+        raise AttributeError(name)
+
+    def get_field(self, name):
+        """Get value of field of match to filter handlers on
+
+        @param name name of field in ofp_match, e.g., dl_type or tp_src
+        @return value of field (None if no such field)
+        """
+        return getattr(self.match, name, None)
     
 class flow_stats(ofcomm.message, action_unpacker):
     """Flow stats in OpenFlow
 
+    Flow records are decoded at their offsets in the message without
+    copying the rest of the reply.  iter_flows streams the records,
+    while flows is the list of records (formed on first access).
+    A reply with OFPSF_REPLY_MORE set is followed by other replies of
+    the same xid (see flow_stats_assembler).
+
     @author ykk
     @date Sept 2011
     """
@@ -298,29 +326,275 @@ class flow_stats(ofcomm.message, action_unpacker):
 
         @param sock reference to socket
         @param msg message
+        @param stats_reply stats reply header (if already decoded)
+        @param reply body of reply (if not to be read from message)
         """
         ofcomm.message.__init__(self, sock, msg)
 
         ##Stats reply header
         self.stats_reply = stats_reply
-        
-        remaining = reply
-        if (self.stats_reply == None) or (remaining == None):
-            self.stats_reply = pyof.ofp_stats_reply()
-            remaining = self.stats_reply.unpack(msg)
-        
-        ##Flow stats of individual flows
-        self.flows = []
-        while (len(remaining) >= pyof.OFP_FLOW_STATS_BYTES):
-            flow = pyof.ofp_flow_stats()
-            flow.unpack(remaining)
-            self.unpack_actions(remaining[pyof.OFP_FLOW_STATS_BYTES:flow.length], flow.actions)
-            remaining = remaining[flow.length:]
-            self.flows.append(flow)
-
-        if (len(remaining) > 0):
+        if (self.stats_reply == None):
+            self.stats_reply = ofcodec.view(pyof.ofp_stats_reply, msg)
+        ##Buffer and offset of flow records
+        self.records = (msg, pyof.OFP_STATS_REPLY_BYTES)
+        if (reply != None):
+            self.records = (reply, 0)
+        ##Indicate if more replies follow
+        self.more = ((self.stats_reply.flags & pyof.OFPSF_REPLY_MORE) != 0)
+
+    def __getattr__(self, name):
+        """Decode flow stats on first access of self.flows
+
+        @param name name of attribute
+        """
+        if (name == "flows"):
+            ##Flow stats of individual flows
+            self.flows = list(self.iter_flows())
+            output.vdbg("Received %d flow stats.", self.__class__.__name__,
+                        len(self.flows))
+            return self.flows
+        raise AttributeError(name)
+
+    def iter_flows(self):
+        """Iterate over flow stats in reply
+
+        @return generator of ofp_flow_stats (as view, with actions)
+        """
+        (buf, offset) = self.records
+        end = len(buf)
+        while ((end-offset) >= pyof.OFP_FLOW_STATS_BYTES):
+            flow = ofcodec.view(pyof.ofp_flow_stats, buf, offset)
+            if ((flow.length < pyof.OFP_FLOW_STATS_BYTES) or
+                (flow.length > (end-offset))):
+                break
+            self.unpack_actions(buf[offset+pyof.OFP_FLOW_STATS_BYTES:
+                                        offset+flow.length],
+                                flow.actions)
+            offset += flow.length
+            yield flow
+
+        if (offset < end):
             output.warn("Flow stats reply is of irregular length with "+\
-                            str(len(remaining))+" bytes remaining.",
+                            str(end-offset)+" bytes remaining.",
                         self.__class__.__name__)
-        output.vdbg("Received "+str(len(self.flows))+" flow stats.",
-                   self.__class__.__name__)
+
+class flow_stats_complete(yapc.event):
+    """Flow stats of all replies of a (multipart) flow stats request
+
+    @author ykk
+    @date Oct 2011
+    """
+    name = "OpenFlow Flow Stats Complete"
+    def __init__(self, sock, xid, parts):
+        """Initialize
+
+        @param sock reference to socket
+        @param xid xid of flow stats request
+        @param parts list of flow_stats events (in order received)
+        """
+        ##Reference to socket
+        self.sock = sock
+        ##Xid of request
+        self.xid = xid
+        ##List of flow stats replies
+        self.parts = parts
+
+    def __getattr__(self, name):
+        """Form list of flow stats on first access of self.flows
+
+        @param name name of attribute
+        """
+        if (name == "flows"):
+            ##Flow stats of individual flows
+            self.flows = []
+            for p in self.parts:
+                self.flows.extend(p.flows)
+            return self.flows
+        raise AttributeError(name)
+
+    def iter_flows(self):
+        """Iterate over flow stats of all replies
+
+        @return generator of ofp_flow_stats (as view, with actions)
+        """
+        for p in self.parts:
+            for f in p.iter_flows():
+                yield f
+
+class flow_stats_assembler(yapc.component):
+    """Reassembles flow stats replies of the same xid
+
+    Replies are collected by switch and xid till the last (i.e., one
+    without OFPSF_REPLY_MORE) arrives, upon which flow_stats_complete
+    is posted.  A reply that is not followed by more is posted as
+    complete by itself.  Consumers can thus stream the records of each
+    flow_stats or handle the whole table in flow_stats_complete.
+
+    @author ykk
+    @date Oct 2011
+    """
+    ##Replies are collected per switch
+    shard_safe = True
+    def __init__(self, server):
+        """Initialize
+
+        @param server yapc core
+        """
+        ##Reference to scheduler
+        self.scheduler = server
+        ##Dictionary of replies yet to complete by (socket, xid)
+        self.pending = {}
+
+        server.register_event_handler(flow_stats.name, self)
+        server.register_event_handler(comm.event.name, self)
+
+    def processevent(self, event):
+        """Event handler
+
+        @param event event to handle
+        """
+        if (isinstance(event, flow_stats)):
+            key = (event.sock, event.header.xid)
+            if (event.more):
+                self.pending.setdefault(key, []).append(event)
+            else:
+                parts = self.pending.pop(key, [])
+                parts.append(event)
+                self.scheduler.post_event(flow_stats_complete(event.sock,
+                                                              event.header.xid,
+                                                              parts))
+        elif (isinstance(event, comm.event) and
+              (event.event == comm.event.SOCK_CLOSE)):
+            for key in self.pending.keys():
+                if (key[0] == event.sock):
+                    output.warn("Dropping incomplete flow stats of xid "+\
+                                    str(key[1]),
+                                self.__class__.__name__)
+                    del self.pending[key]
+
+        return True
+
+class batch_stats(ofcomm.message):
+    """Stats reply in OpenFlow with records of fixed size
+
+    Records are decoded as a batch (see yapc.ofcodec.batch), i.e.,
+    with a single unpack for the reply, and are read by column, e.g.,
+    self.stats.column("rx_bytes"), or by record, e.g., self.stats[0].
+
+    @author ykk
+    @date Oct 2011
+    """
+    ##Class of records
+    record = None
+    def __init__(self, sock, msg, stats_reply=None):
+        """Initialize
+
+        @param sock reference to socket
+        @param msg message
+        @param stats_reply stats reply header (if already decoded)
+        """
+        ofcomm.message.__init__(self, sock, msg)
+
+        ##Stats reply header
+        self.stats_reply = stats_reply
+        if (self.stats_reply == None):
+            self.stats_reply = ofcodec.view(pyof.ofp_stats_reply, msg)
+        ##Indicate if more replies follow
+        self.more = ((self.stats_reply.flags & pyof.OFPSF_REPLY_MORE) != 0)
+        ##Batch of records
+        self.stats = ofcodec.batch(self.record, msg,
+                                   pyof.OFP_STATS_REPLY_BYTES)
+
+        r = (len(msg)-pyof.OFP_STATS_REPLY_BYTES) % self.stats.size
+        if (r > 0):
+            output.warn("Stats reply is of irregular length with "+\
+                            str(r)+" bytes remaining.",
+                        self.__class__.__name__)
+
+class desc_stats(batch_stats):
+    """Description stats in OpenFlow
+
+    @author ykk
+    @date Oct 2011
+    """
+    name = "OpenFlow Description Stats Reply"
+    record = pyof.ofp_desc_stats
+    def __init__(self, sock, msg, stats_reply=None):
+        """Initialize
+
+        @param sock reference to socket
+        @param msg message
+        @param stats_reply stats reply header (if already decoded)
+        """
+        batch_stats.__init__(self, sock, msg, stats_reply)
+
+        ##Description of switch (None if reply is too short)
+        self.desc = None
+        if (len(self.stats) > 0):
+            self.desc = self.stats[0]
+
+class aggregate_stats(batch_stats):
+    """Aggregate flow stats in OpenFlow
+
+    @author ykk
+    @date Oct 2011
+    """
+    name = "OpenFlow Aggregate Stats Reply"
+    record = pyof.ofp_aggregate_stats_reply
+    def __init__(self, sock, msg, stats_reply=None):
+        """Initialize
+
+        @param sock reference to socket
+        @param msg message
+        @param stats_reply stats reply header (if already decoded)
+        """
+        batch_stats.__init__(self, sock, msg, stats_reply)
+
+        ##Aggregate stats (None if reply is too short)
+        self.aggregate = None
+        if (len(self.stats) > 0):
+            self.aggregate = self.stats[0]
+
+class table_stats(batch_stats):
+    """Table stats in OpenFlow
+
+    @author ykk
+    @date Oct 2011
+    """
+    name = "OpenFlow Table Stats Reply"
+    record = pyof.ofp_table_stats
+
+class port_stats(batch_stats):
+    """Port stats in OpenFlow
+
+    @author ykk
+    @date Oct 2011
+    """
+    name = "OpenFlow Port Stats Reply"
+    record = pyof.ofp_port_stats
+
+class queue_stats(batch_stats):
+    """Queue stats in OpenFlow
+
+    @author ykk
+    @date Oct 2011
+    """
+    name = "OpenFlow Queue Stats Reply"
+    record = pyof.ofp_queue_stats
+
+##Decoders of stats reply into events by type of stats
+STATS_DECODERS = {pyof.OFPST_DESC: desc_stats,
+                  pyof.OFPST_FLOW: flow_stats,
+                  pyof.OFPST_AGGREGATE: aggregate_stats,
+                  pyof.OFPST_TABLE: table_stats,
+                  pyof.OFPST_PORT: port_stats,
+                  pyof.OFPST_QUEUE: queue_stats}
+
+##Decoders of OpenFlow message into events by type (see parser)
+DECODERS = {pyof.OFPT_ERROR: error,
+            pyof.OFPT_PORT_STATUS: port_status,
+            pyof.OFPT_GET_CONFIG_REPLY: config_reply,
+            pyof.OFPT_FEATURES_REPLY: features_reply,
+            pyof.OFPT_FLOW_REMOVED: flow_removed,
+            pyof.OFPT_PACKET_IN: pktin,
+            pyof.OFPT_STATS_REPLY: decode_stats_reply}
@@ -8,6 +8,7 @@
 import yapc.interface as yapc
 import yapc.log.output as output
 import yapc.events.openflow as ofevents
+import yapc.comm.transaction as transaction
 import yapc.pyopenflow as pyof
 import yapc.forwarding.flows as flows
 
@@ -17,6 +18,8 @@ class floodpkt(yapc.component):
     @author ykk
     @date Feb 2011
     """
+    ##Stateless, so can run for different switches in parallel
+    shard_safe = True
     def __init__(self, server, ofconn):
         """Initialize
 
@@ -25,6 +28,9 @@ class floodpkt(yapc.component):
         """
         ##Reference to OpenFlow connections
         self.conn = ofconn
+        ##Template of packet out
+        self.template = flows.flow_entry(flows.flow_entry.FLOOD).\
+            get_packet_out_template()
 
         server.register_event_handler(ofevents.pktin.name, self)
 
@@ -34,19 +40,18 @@ class floodpkt(yapc.component):
         @param event event to handle
         """
         if (isinstance(event, ofevents.pktin)):
-            flow = flows.exact_entry(event.match)
-            flow.dpkt = event.dpkt
-            flow.set_buffer(event.pktin.buffer_id)
-            flow.add_output(pyof.OFPP_FLOOD)
-            
-           
             if (event.pktin.buffer_id == flows.UNBUFFERED_ID):
-                self.conn.send(event.sock, flow.get_packet_out().pack()+event.pkt)
-                output.vdbg("Flood unbuffered packet with match "+\
+                self.conn.send(event.sock,
+                               self.template.pack(data=event.pkt,
+                                                  buffer_id=event.pktin.buffer_id,
+                                                  in_port=event.match.in_port))
+                output.vdbg(lambda: "Flood unbuffered packet with match "+\
                                 event.match.show().replace('\n',';'))
             else:
-                self.conn.send(event.sock,flow.get_packet_out().pack())
-                output.vdbg("Flood buffered packet with match "+\
+                self.conn.send(event.sock,
+                               self.template.pack(buffer_id=event.pktin.buffer_id,
+                                                  in_port=event.match.in_port))
+                output.vdbg(lambda: "Flood buffered packet with match "+\
                                 event.match.show().replace('\n',';'),
                             self.__class__.__name__)
         return True
@@ -54,6 +59,10 @@ class floodpkt(yapc.component):
 class default_entries(yapc.component):
     """Class that install default entries during startup of switch
 
+    Entries are installed as a batch (see flows.flow_batch), and
+    flows_installed is posted when the switch has processed them.
+    The entries are packed once (see flows.template) for all switches.
+
     @author ykk
     @date Feb 2011
     """
@@ -63,10 +72,16 @@ class default_entries(yapc.component):
         @param server yapc core
         @param ofconn refrence to connections
         """
+        ##Reference to core
+        self.server = server
         ##Reference to OpenFlow connections
         self.conn = ofconn
         ##List of entries to install
         self.entries = []
+        ##List of (template, None) of entries (None if not packed yet)
+        self.templates = None
+        ##Transaction tracker
+        self.transactions = transaction.get_tracker(server)
 
         server.register_event_handler(ofevents.features_reply.name, self)
 
@@ -74,13 +89,14 @@ class default_entries(yapc.component):
         """Add flow entry to install
         """
         self.entries.append((flowentry, cmd))
+        self.templates = None
 
     def add_perm(self, flowentry, cmd=pyof.OFPFC_ADD):
         """Add permanent flow entry to install
         """
         flowentry.idle_timeout = pyof.OFP_FLOW_PERMANENT
         flowentry.hard_timeout = pyof.OFP_FLOW_PERMANENT
-        self.entries.append((flowentry, cmd))
+        self.add(flowentry, cmd)
 
     def add_perm_output(self, flowentry, port=pyof.OFPP_CONTROLLER,
                         max_len=pyof.OFP_DEFAULT_MISS_SEND_LEN,
@@ -96,20 +112,44 @@ class default_entries(yapc.component):
         @param event event to handle
         """
         if (isinstance(event, ofevents.features_reply)):
-            for (fm, cmd) in self.entries:
-                output.dbg("Sending default entry "+\
-                               fm.get_flow_mod(cmd).show().replace('\n','; '),
+            conn = self.conn.db.get(event.sock)
+            if (conn == None):
+                output.warn("Default entries not installed because "+\
+                                "socket is already closed",
+                            self.__class__.__name__)
+                return True
+            if (self.templates == None):
+                self.templates = [(fm.get_flow_mod_template(cmd), None)
+                                  for (fm, cmd) in self.entries]
+            for (t, cmd) in self.templates:
+                output.dbg(lambda: "Sending default entry "+\
+                               t.message.show().replace('\n','; '),
                            self.__class__.__name__)
-                self.conn.send(event.sock,fm.get_flow_mod(cmd).pack())
+            flows.install_flows(self.transactions, conn, self.templates,
+                                self.installed, self.server)
 
         return True
 
+    def installed(self, batch):
+        """Callback when default entries are installed
+
+        @param batch batch of default entries
+        """
+        for (t, error) in batch.errors:
+            output.warn("Default entry "+\
+                            t.message.show().replace('\n','; ')+\
+                            " failed with error "+str(error.error.type)+\
+                            "/"+str(error.error.code),
+                        self.__class__.__name__)
+
 class dropflow(yapc.component):
     """Class that drop flows
 
     @author ykk
     @date Feb 2011
     """
+    ##Stateless, so can run for different switches in parallel
+    shard_safe = True
     def __init__(self, server, ofconn):
         """Initialize
 
@@ -118,6 +158,9 @@ class dropflow(yapc.component):
         """
         ##Reference to OpenFlow connections
         self.conn = ofconn
+        ##Template of flow mod
+        self.template = flows.exact_entry(pyof.ofp_match()).\
+            get_flow_mod_template(pyof.OFPFC_ADD)
 
         server.register_event_handler(ofevents.pktin.name, self)
 
@@ -127,10 +170,10 @@ class dropflow(yapc.component):
         @param event event to handle
         """
         if (isinstance(event, ofevents.pktin)):
-            flow = flows.exact_entry(event.match)
-            flow.set_buffer(event.pktin.buffer_id)
-            self.conn.send(event.sock,flow.get_flow_mod(pyof.OFPFC_ADD).pack())
-            output.vdbg("Dropping flow with match "+\
+            self.conn.send(event.sock,
+                           self.template.pack(event.match,
+                                              buffer_id=event.pktin.buffer_id))
+            output.vdbg(lambda: "Dropping flow with match "+\
                             event.match.show().replace('\n',';'))
 
         return True
@@ -6,10 +6,17 @@
 # @date Feb 2011
 #
 import dpkt
+import yapc.interface as yapc
 import yapc.util.openflow as ofutil
 import yapc.packet.ofaction as pktact
 import yapc.pyopenflow as pyof
+import yapc.ofcodec as ofcodec
 import yapc.log.output as output
+import collections
+import threading
+import copy
+import struct
+import time
 
 UDP_BOOTPS = 67
 UDP_BOOTPC = 68
@@ -23,6 +30,10 @@ UDP_MDNS = 5353
 UNBUFFERED_ID = 4294967295
 ##Default timeout value
 DEFAULT_TIMEOUT = 5
+##Dictionary of struct by format (for fields of templates)
+FIELD_STRUCTS = {}
+##Time flow mod is presumed to be in effect after sent
+PENDING_TIMEOUT = 1
 
 class actions:
     """Class to provide management of ofp_actions list
@@ -425,6 +436,20 @@ class flow_entry(actions, packet):
         fm.header.xid = ofutil.get_xid()
         return fm
 
+    def get_flow_mod_template(self, command=pyof.OFPFC_ADD, cookie=0):
+        """Function to return flow_entry as template of flow mod
+
+        @return template of ofp_flow_mod
+        """
+        return template(self.get_flow_mod(command, cookie))
+
+    def get_packet_out_template(self):
+        """Function to return flow_entry as template of packet out
+
+        @return template of ofp_packet_out
+        """
+        return template(self.get_packet_out())
+
     def get_flow_stats_request(self, out_port=pyof.OFPP_NONE, table_id=0xff):
         """Function to return flow_stats_request for a matching flow
         
@@ -652,3 +677,372 @@ class tcp_entry(ip_proto_entry):
         if (portno != None):
             self.match.wildcards -= pyof.OFPFW_TP_DST
             self.match.tp_dst = portno
+
+class template:
+    """Message packed once, with fields patched for each use
+
+    The message (e.g., flow mod or packet out with its actions) is 
+    packed into a skeleton once.  Each pack copies the skeleton and 
+    patches the match, fields of the message (by name, e.g., buffer_id),
+    xid and ports of output actions in place.  Messages without codec
+    (see yapc.ofcodec) are copied and packed for each use instead.
+
+    @author ykk
+    @date Oct 2011
+    """
+    def __init__(self, msg, data=""):
+        """Initialize
+
+        @param msg pyopenflow message
+        @param data data appended to message (e.g., packet of packet out)
+        """
+        ##Message
+        self.message = msg
+        ##Data appended to message
+        self.data = data
+        ##Skeleton of message
+        self.skeleton = bytearray(msg.pack()+data)
+        ofutil.UINT16.pack_into(self.skeleton, 2, len(self.skeleton))
+        ##Dictionary of (struct, offset) by field
+        self.fields = {"xid": (ofutil.UINT32, 4)}
+        ##Offset of match (None if none)
+        self.match_offset = None
+        ##Offsets of port of output actions (in order, None if no codec)
+        self.outputs = None
+        layout = ofcodec.layouts.get(msg.__class__.__name__)
+        if (layout == None):
+            output.warn("No codec for "+msg.__class__.__name__+\
+                            " (packing template for each use)",
+                        self.__class__.__name__)
+            return
+        for (name, kind, fmt, offset) in layout[1]:
+            if (kind == "field"):
+                if (fmt not in FIELD_STRUCTS):
+                    FIELD_STRUCTS[fmt] = struct.Struct("!"+fmt)
+                self.fields[name] = (FIELD_STRUCTS[fmt], offset)
+            elif ((kind == "nested") and (name == "match")):
+                self.match_offset = offset
+        self.outputs = []
+        offset = ofcodec.structs[msg.__class__.__name__].size
+        for a in getattr(msg, "actions", []):
+            if (a.type == pyof.OFPAT_OUTPUT):
+                self.outputs.append(offset+4)
+            offset += a.len
+
+    def pack(self, match=None, ports=None, data=None, **fields):
+        """Pack message with fields patched
+
+        A new xid is used unless given.
+
+        @param match ofp_match or compact match (see ofutil.match)
+        @param ports list of ports for output actions (in order)
+        @param data data to append to message (if any)
+        @param fields values of fields by name, e.g., buffer_id
+        @return message (binary)
+        """
+        if (self.outputs == None):
+            return self.__repack(match, ports, data, fields)
+        b = bytearray(self.skeleton)
+        if (match != None):
+            if (isinstance(match, ofutil.match)):
+                b[self.match_offset:self.match_offset+len(match.key)] = \
+                    match.key
+            else:
+                match.pack_into(b, self.match_offset)
+        if (ports != None):
+            for (offset, port) in zip(self.outputs, ports):
+                ofutil.UINT16.pack_into(b, offset, port)
+        if ("xid" not in fields):
+            fields["xid"] = ofutil.get_xid()
+        for (name, value) in fields.items():
+            (s, offset) = self.fields[name]
+            s.pack_into(b, offset, value)
+        if (data):
+            b.extend(data)
+            ofutil.UINT16.pack_into(b, 2, len(b))
+        return str(b)
+
+    def __repack(self, match, ports, data, fields):
+        """Pack copy of message with fields set
+        (for message without codec)
+
+        @param match ofp_match or compact match (see ofutil.match)
+        @param ports list of ports for output actions (in order)
+        @param data data to append to message (if any)
+        @param fields values of fields by name, e.g., buffer_id
+        @return message (binary)
+        """
+        msg = copy.deepcopy(self.message)
+        if (match != None):
+            if (isinstance(match, ofutil.match)):
+                match = match.to_ofp_match()
+            msg.match = match
+        if (ports != None):
+            outputs = [a for a in getattr(msg, "actions", [])
+                       if (a.type == pyof.OFPAT_OUTPUT)]
+            for (a, port) in zip(outputs, ports):
+                a.port = port
+        if ("xid" in fields):
+            msg.header.xid = fields.pop("xid")
+        else:
+            msg.header.xid = ofutil.get_xid()
+        for (name, value) in fields.items():
+            setattr(msg, name, value)
+        b = bytearray(msg.pack()+self.data+(data or ""))
+        ofutil.UINT16.pack_into(b, 2, len(b))
+        return str(b)
+
+class pending_installs:
+    """Cache of flows being installed, i.e., flow mod is sent but
+    may not be in effect yet
+
+    Packet ins of such flows should be forwarded with packet out
+    (using the actions of the pending flow) instead of another flow
+    mod.  Entries expire after timeout (in order added).
+
+    @author ykk
+    @date Oct 2011
+    """
+    def __init__(self, timeout=PENDING_TIMEOUT):
+        """Initialize
+
+        @param timeout time entry is kept
+        """
+        ##Time entry is kept
+        self.timeout = timeout
+        ##Dictionary of (expiry, value) by (socket, match), in order added
+        self.pending = collections.OrderedDict()
+        ##Lock
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        """Get number of pending flows
+        """
+        return len(self.pending)
+
+    def __expire(self, now):
+        """Remove entries expired (with lock held)
+
+        @param now current time
+        """
+        while (len(self.pending) > 0):
+            key = next(iter(self.pending))
+            if (self.pending[key][0] > now):
+                break
+            del self.pending[key]
+
+    def get(self, sock, match):
+        """Get value of pending flow
+
+        @param sock socket of switch
+        @param match match of flow (see ofutil.match)
+        @return value of pending flow (None if none)
+        """
+        now = time.time()
+        self.__lock.acquire()
+        self.__expire(now)
+        r = self.pending.get((sock, match))
+        self.__lock.release()
+        if (r == None):
+            return None
+        return r[1]
+
+    def add(self, sock, match, value=True):
+        """Add pending flow, unless the same flow is pending
+
+        @param sock socket of switch
+        @param match match of flow (see ofutil.match)
+        @param value value of flow (e.g., port or flow entry)
+        @return True if flow is added (and so flow mod is to be sent),
+                else False
+        """
+        now = time.time()
+        self.__lock.acquire()
+        self.__expire(now)
+        key = (sock, match)
+        r = self.pending.get(key)
+        if ((r != None) and (r[1] == value)):
+            self.__lock.release()
+            return False
+        self.pending.pop(key, None)
+        self.pending[key] = (now+self.timeout, value)
+        self.__lock.release()
+        return True
+
+    def remove(self, sock, match):
+        """Remove pending flow
+
+        @param sock socket of switch
+        @param match match of flow (see ofutil.match)
+        """
+        self.__lock.acquire()
+        self.pending.pop((sock, match), None)
+        self.__lock.release()
+
+class flows_installed(yapc.event):
+    """Event posted when batch of flows is installed
+
+    @author ykk
+    @date Oct 2011
+    """
+    name = "Flows Installed"
+    def __init__(self, sock, batch):
+        """Initialize
+
+        @param sock reference to socket flows are installed on
+        @param batch flow_batch installed
+        """
+        ##Reference to socket
+        self.sock = sock
+        ##Batch of flows
+        self.batch = batch
+
+class flow_batch:
+    """Batch of flow entries installed together
+
+    Flow mods of the entries are packed into a single buffer followed
+    by a barrier request, and sent with one write.  When the barrier is
+    replied, all flow mods have been processed by the switch, and
+    errors are attributed to their entries by xid.
+
+    @author ykk
+    @date Oct 2011
+    """
+    def __init__(self, entries=None):
+        """Initialize
+
+        @param entries list of (flow entry, command) to install
+                       (or (template, None) for flow mod template)
+        """
+        ##List of (flow entry, command)
+        self.entries = []
+        if (entries != None):
+            self.entries.extend(entries)
+        ##Transactions of flow mods (in order of entries)
+        self.transactions = []
+        ##Transaction of barrier
+        self.barrier = None
+        ##List of (flow entry, error event) for flow mods that failed
+        self.errors = []
+        ##List of flow entries not sent as identical flows are installed
+        self.skipped = []
+        ##Callback when installed
+        self.callback = None
+        ##Reference to core to post flows_installed event (if any)
+        self.server = None
+
+    def __len__(self):
+        """Get number of entries
+
+        @return number of entries
+        """
+        return len(self.entries)
+
+    def add(self, flowentry, command=pyof.OFPFC_ADD):
+        """Add flow entry
+
+        @param flowentry flow entry
+        @param command command for flow mod
+        """
+        self.entries.append((flowentry, command))
+
+    def pack(self):
+        """Get flow mods of entries and barrier request
+
+        @return list of messages (binary)
+        """
+        msgs = []
+        for (flowentry, command) in self.entries:
+            if (isinstance(flowentry, template)):
+                msgs.append(flowentry.pack())
+                continue
+            fm = flowentry.get_flow_mod(command).pack()
+            msgs.append(fm[:2]+ofutil.UINT16.pack(len(fm))+fm[4:])
+        br = pyof.ofp_header()
+        br.type = pyof.OFPT_BARRIER_REQUEST
+        br.length = pyof.OFP_HEADER_BYTES
+        br.xid = ofutil.get_xid()
+        msgs.append(br.pack())
+        return msgs
+
+    def install(self, tracker, conn, callback=None, server=None,
+                tables=None):
+        """Install flow entries
+
+        Entries identical to flows installed (as shown by shadow flow
+        tables) are skipped.
+
+        @param tracker transaction tracker (see yapc.comm.transaction)
+        @param conn OpenFlow connection
+        @param callback function called with batch when installed
+        @param server yapc core to post flows_installed event to (if any)
+        @param tables shadow flow tables (see yapc.netstate.flowtable),
+                      if any
+        """
+        self.callback = callback
+        self.server = server
+        msgs = self.pack()
+        if (tables != None):
+            sent = []
+            for i in range(0, len(self.entries)):
+                if (tables.is_duplicate(conn.sock, msgs[i])):
+                    self.skipped.append(self.entries[i][0])
+                else:
+                    sent.append(i)
+            self.entries = [self.entries[i] for i in sent]
+            msgs = [msgs[i] for i in sent]+msgs[-1:]
+        self.transactions = tracker.send_batch(conn, msgs,
+                                               [None]*(len(msgs)-1)+\
+                                                   [self.__barrier_done])
+        self.barrier = self.transactions.pop()
+
+    def done(self):
+        """Check if batch is installed (or failed to be)
+
+        @return if barrier is completed
+        """
+        return ((self.barrier != None) and self.barrier.done())
+
+    def succeeded(self):
+        """Check if all entries are installed
+
+        @return if barrier is replied and no flow mod failed
+        """
+        return ((self.barrier != None) and self.barrier.succeeded() and
+                (len(self.errors) == 0))
+
+    def __barrier_done(self, t):
+        """Collect errors of flow mods when barrier is completed
+
+        @param t transaction of barrier
+        """
+        self.errors = []
+        for (e, ft) in zip(self.entries, self.transactions):
+            if (ft.error != None):
+                self.errors.append((e[0], ft.error))
+        if (len(self.errors) > 0):
+            output.dbg(str(len(self.errors))+" of "+str(len(self))+\
+                           " flow entries failed",
+                       self.__class__.__name__)
+        if (self.callback != None):
+            self.callback(self)
+        if (self.server != None):
+            self.server.post_event(flows_installed(t.sock, self))
+
+def install_flows(tracker, conn, entries, callback=None, server=None,
+                  tables=None):
+    """Install flow entries in batch
+
+    @param tracker transaction tracker (see yapc.comm.transaction)
+    @param conn OpenFlow connection
+    @param entries list of (flow entry, command) to install
+                   (or (template, None) for flow mod template)
+    @param callback function called with batch when installed
+    @param server yapc core to post flows_installed event to (if any)
+    @param tables shadow flow tables (see yapc.netstate.flowtable)
+                  to skip entries installed, if any
+    @return flow_batch
+    """
+    b = flow_batch(entries)
+    b.install(tracker, conn, callback, server, tables)
+    return b
@@ -0,0 +1,484 @@
+##Routing
+#
+# Forwarding along shortest paths between switches, using links
+# discovered (see yapc.netstate.topology)
+#
+# @author ykk
+# @date Oct 2011
+#
+import yapc.interface as yapc
+import yapc.events.openflow as ofevents
+import yapc.events.network as netevents
+import yapc.comm.core as comm
+import yapc.comm.transaction as transaction
+import yapc.netstate.swhost as swhost
+import yapc.log.output as output
+import yapc.pyopenflow as pyof
+import yapc.util.openflow as ofutil
+import yapc.forwarding.flows as flows
+import collections
+import threading
+
+class path_tree:
+    """Shortest paths of switches to destination switch
+
+    @author ykk
+    @date Oct 2011
+    """
+    def __init__(self, dst):
+        """Initialize
+
+        @param dst destination switch
+        """
+        ##Destination switch
+        self.dst = dst
+        ##Dictionary of number of hops to destination by switch
+        self.dist = {dst: 0}
+        ##Dictionary of next switch to destination by switch
+        self.next = {}
+
+class graph:
+    """Graph of switches with shortest path trees
+
+    A shortest path tree (by hop count) is computed for each
+    destination on first use and cached.  A link up only updates the
+    trees it shortens (from the switch of the link outwards), and a
+    link down only recomputes the trees that use the link.
+
+    @author ykk
+    @date Oct 2011
+    """
+    def __init__(self):
+        """Initialize
+        """
+        ##Dictionary of links (source port, destination port)
+        ##indexed by source switch and destination switch
+        self.links = {}
+        ##Dictionary of set of switches with link to switch
+        self.rlinks = {}
+        ##Set of (switch, port) with links
+        self.ports = set()
+        ##Dictionary of path tree by destination switch
+        self.trees = {}
+        ##Dictionary of set of destinations whose tree uses link
+        ##indexed by (source switch, destination switch)
+        self.users = {}
+
+    def is_link_port(self, sw, port):
+        """Check if port of switch has link
+
+        @param sw switch
+        @param port port
+        @return if port has link
+        """
+        return ((sw, port) in self.ports)
+
+    def add_link(self, src, src_port, dst, dst_port):
+        """Add (directed) link
+
+        @param src source switch
+        @param src_port port of source switch
+        @param dst destination switch
+        @param dst_port port of destination switch
+        @return number of trees updated
+        """
+        if (dst in self.links.get(src, {})):
+            self.remove_link(src, dst)
+        self.links.setdefault(src, {})[dst] = (src_port, dst_port)
+        self.rlinks.setdefault(dst, set()).add(src)
+        self.ports.add((src, src_port))
+        self.ports.add((dst, dst_port))
+
+        n = 0
+        for tree in self.trees.values():
+            if ((dst in tree.dist) and
+                ((src not in tree.dist) or
+                 (tree.dist[dst]+1 < tree.dist[src]))):
+                self.__update(tree, src, dst)
+                n += 1
+        return n
+
+    def remove_link(self, src, dst):
+        """Remove (directed) link
+
+        @param src source switch
+        @param dst destination switch
+        @return number of trees updated
+        """
+        if (dst not in self.links.get(src, {})):
+            return 0
+        (src_port, dst_port) = self.links[src].pop(dst)
+        if (len(self.links[src]) == 0):
+            del self.links[src]
+        self.rlinks[dst].discard(src)
+        if (len(self.rlinks[dst]) == 0):
+            del self.rlinks[dst]
+        self.ports.discard((src, src_port))
+        self.ports.discard((dst, dst_port))
+
+        affected = self.users.pop((src, dst), set())
+        for d in affected:
+            self.__remove_tree(d)
+        return len(affected)
+
+    def remove_switch(self, sw):
+        """Remove switch and its links
+
+        @param sw switch
+        @return number of trees updated
+        """
+        n = 0
+        for dst in self.links.get(sw, {}).keys():
+            n += self.remove_link(sw, dst)
+        for src in list(self.rlinks.get(sw, [])):
+            n += self.remove_link(src, sw)
+        if (sw in self.trees):
+            self.__remove_tree(sw)
+        return n
+
+    def get_tree(self, dst):
+        """Get shortest path tree to destination
+
+        @param dst destination switch
+        @return path tree
+        """
+        tree = self.trees.get(dst)
+        if (tree == None):
+            tree = path_tree(dst)
+            self.trees[dst] = tree
+            queue = collections.deque([dst])
+            while (len(queue) > 0):
+                sw = queue.popleft()
+                for src in self.rlinks.get(sw, []):
+                    if (src not in tree.dist):
+                        tree.dist[src] = tree.dist[sw]+1
+                        self.__set_next(tree, src, sw)
+                        queue.append(src)
+        return tree
+
+    def get_path(self, src, dst, in_port=None, out_port=None):
+        """Get shortest path between switches
+
+        @param src source switch
+        @param dst destination switch
+        @param in_port input port at source switch
+        @param out_port output port at destination switch
+        @return list of (switch, input port, output port) along path
+                (None if no path)
+        """
+        tree = self.get_tree(dst)
+        if (src not in tree.dist):
+            return None
+        path = []
+        sw = src
+        while (sw != dst):
+            nxt = tree.next[sw]
+            (port, nxt_port) = self.links[sw][nxt]
+            path.append((sw, in_port, port))
+            (sw, in_port) = (nxt, nxt_port)
+        path.append((dst, in_port, out_port))
+        return path
+
+    def __set_next(self, tree, sw, nxt):
+        """Set next switch of switch in tree
+
+        @param tree path tree
+        @param sw switch
+        @param nxt next switch to destination
+        """
+        old = tree.next.get(sw)
+        if (old != None):
+            u = self.users[(sw, old)]
+            u.discard(tree.dst)
+            if (len(u) == 0):
+                del self.users[(sw, old)]
+        tree.next[sw] = nxt
+        self.users.setdefault((sw, nxt), set()).add(tree.dst)
+
+    def __update(self, tree, src, dst):
+        """Update tree shortened by link
+        (from source switch of link outwards)
+
+        @param tree path tree
+        @param src source switch of link
+        @param dst destination switch of link
+        """
+        tree.dist[src] = tree.dist[dst]+1
+        self.__set_next(tree, src, dst)
+        queue = collections.deque([src])
+        while (len(queue) > 0):
+            sw = queue.popleft()
+            for s in self.rlinks.get(sw, []):
+                if ((s not in tree.dist) or (tree.dist[sw]+1 < tree.dist[s])):
+                    tree.dist[s] = tree.dist[sw]+1
+                    self.__set_next(tree, s, sw)
+                    queue.append(s)
+
+    def __remove_tree(self, dst):
+        """Remove tree (to be recomputed on next use)
+
+        @param dst destination switch of tree
+        """
+        tree = self.trees.pop(dst)
+        for (sw, nxt) in tree.next.items():
+            u = self.users.get((sw, nxt))
+            if (u != None):
+                u.discard(dst)
+                if (len(u) == 0):
+                    del self.users[(sw, nxt)]
+
+class path_install:
+    """Installation of path for packet
+
+    Flow entries of switches after the ingress switch are installed
+    (each as a batch), before the flow entry of the ingress switch
+    releases the packet.  Later packets of the flow are queued till
+    then, and released with packet out.  If an entry of the path is
+    not installed, the ingress entry is not installed either, and the
+    packets are sent with packet out only.
+
+    @author ykk
+    @date Oct 2011
+    """
+    def __init__(self, routing, event, path):
+        """Initialize
+
+        @param routing routing component
+        @param event packet in event
+        @param path list of (switch, input port, output port)
+        """
+        ##Reference to routing component
+        self.routing = routing
+        ##Packet in event
+        self.event = event
+        ##Path
+        self.path = path
+        ##Number of switches to install entries at (before ingress)
+        self.remaining = len(path)-1
+        ##List of packet in events of flow queued
+        self.queued = []
+        ##Entries of path are installed (so far)
+        self.succeeded = True
+        ##Lock
+        self.__lock = threading.Lock()
+
+    def add(self, event):
+        """Add packet in of flow, which is queued till path is
+        installed (else sent with packet out)
+
+        @param event packet in event
+        """
+        self.__lock.acquire()
+        queued = (self.remaining > 0)
+        if (queued):
+            self.queued.append(event)
+        self.__lock.release()
+        if (not queued):
+            self.routing.install_ingress(event, self.path[0][2], False)
+
+    def installed(self, batch):
+        """Callback when flow entries of switch are installed
+
+        @param batch batch of flow entries
+        """
+        if (not batch.succeeded()):
+            output.warn("Flow entry of path not installed",
+                        self.routing.__class__.__name__)
+        self.__lock.acquire()
+        self.remaining -= 1
+        self.succeeded = (self.succeeded and batch.succeeded())
+        queued = None
+        if (self.remaining == 0):
+            queued = self.queued
+            self.queued = []
+        self.__lock.release()
+        if (queued == None):
+            return
+        if (not self.succeeded):
+            #Drop pending path, so that next packet installs it again
+            match = self.event.compact_match
+            if (self.routing.pending.get(self.event.sock, match) is self):
+                self.routing.pending.remove(self.event.sock, match)
+        self.routing.install_ingress(self.event, self.path[0][2],
+                                     self.succeeded)
+        for e in queued:
+            self.routing.install_ingress(e, self.path[0][2], False)
+
+class shortest_path_routing(yapc.component):
+    """Route packets along shortest paths between switches
+
+    Links are learned from link up/down (see topology), and hosts from
+    packet ins received on ports without links (till not seen for
+    host timeout).  Switches are removed when their connection closes.
+    A packet in to a known host is routed by installing exact match
+    flow entries along the shortest path to the host's switch, skipping
+    flow entries installed (if shadow flow tables are given).  A path
+    is pending for as long as the tracker waits for its barriers, so
+    that a slow switch does not get the same path installed again.
+
+    @author ykk
+    @date Oct 2011
+    """
+    def __init__(self, server, ofconn, idle_timeout=flows.DEFAULT_TIMEOUT,
+                 tables=None, host_timeout=60):
+        """Initialize
+
+        @param server yapc core
+        @param ofconn reference to connections
+        @param idle_timeout idle timeout of flow entries
+        @param tables shadow flow tables (see yapc.netstate.flowtable),
+                      if any
+        @param host_timeout time host is kept after last seen
+        """
+        ##Reference to connections
+        self.conn = ofconn
+        ##Shadow flow tables (if any)
+        self.tables = tables
+        ##Graph of switches
+        self.graph = graph()
+        ##Table of (switch, port) of host by MAC address
+        self.hosts = swhost.mac_table(host_timeout)
+        ##Dictionary of switch by socket
+        self.switches = {}
+        ##Idle timeout of flow entries
+        self.idle_timeout = idle_timeout
+        ##Transaction tracker
+        self.transactions = transaction.get_tracker(server)
+        ##Paths being installed
+        self.pending = flows.pending_installs(
+            self.transactions.timeout*(self.transactions.retries+1)+\
+                flows.PENDING_TIMEOUT)
+        ##Template of flow mod (with output action)
+        flow = flows.exact_entry(pyof.ofp_match(), idle_timeout=idle_timeout)
+        flow.add_output(pyof.OFPP_NONE)
+        self.template = flow.get_flow_mod_template(pyof.OFPFC_ADD)
+        ##Template of packet out (with output action)
+        self.po_template = flow.get_packet_out_template()
+
+        server.register_event_handler(netevents.link_up.name, self)
+        server.register_event_handler(netevents.link_down.name, self)
+        server.register_event_handler(ofevents.pktin.name, self)
+        server.register_event_handler(ofevents.features_reply.name, self)
+        server.register_event_handler(comm.event.name, self)
+
+    def remove_hosts(self, sw, port=None):
+        """Remove hosts at switch (and port)
+
+        @param sw switch
+        @param port port (None for all ports)
+        """
+        self.hosts.remove_port(lambda loc: ((loc[0] == sw) and
+                                            ((port == None) or
+                                             (loc[1] == port))))
+
+    def processevent(self, event):
+        """Event handler
+
+        @param event event to handle
+        @return false if packet is routed, else true
+        """
+        if (isinstance(event, netevents.link_up)):
+            n = self.graph.add_link(event.src_dpid, event.src_port,
+                                    event.dst_dpid, event.dst_port)
+            self.remove_hosts(event.src_dpid, event.src_port)
+            self.remove_hosts(event.dst_dpid, event.dst_port)
+            output.dbg("Link up updated %d path trees",
+                       self.__class__.__name__, n)
+
+        elif (isinstance(event, netevents.link_down)):
+            n = self.graph.remove_link(event.src_dpid, event.dst_dpid)
+            output.dbg("Link down updated %d path trees",
+                       self.__class__.__name__, n)
+
+        elif (isinstance(event, ofevents.features_reply)):
+            self.switches[event.sock] = event.features.datapath_id
+
+        elif (isinstance(event, comm.event) and
+              (event.event == comm.event.SOCK_CLOSE)):
+            sw = self.switches.pop(event.sock, None)
+            if (sw != None):
+                n = self.graph.remove_switch(sw)
+                self.remove_hosts(sw)
+                output.dbg("Switch %x leaving updated %d path trees",
+                           self.__class__.__name__, sw, n)
+
+        elif (isinstance(event, ofevents.pktin)):
+            conn = self.conn.db.get(event.sock)
+            if ((conn == None) or (conn.dpid == None)):
+                return True
+            in_port = event.match.in_port
+            src = ofutil.mac_array2val(event.match.dl_src)
+            if ((not ((src >> 40) & 1)) and
+                (not self.graph.is_link_port(conn.dpid, in_port))):
+                self.hosts.learn(src, (conn.dpid, in_port))
+
+            dst = ofutil.mac_array2val(event.match.dl_dst)
+            if ((dst >> 40) & 1):
+                return True
+            loc = self.hosts.get(dst)
+            if (loc == None):
+                return True
+            path = self.graph.get_path(conn.dpid, loc[0], in_port, loc[1])
+            if (path == None):
+                return True
+            return not self.install_path(event, path)
+
+        return True
+
+    def install_path(self, event, path):
+        """Install flow entries along path for packet
+
+        @param event packet in event
+        @param path list of (switch, input port, output port)
+        @return if path is installed
+        """
+        match = event.compact_match
+        p = self.pending.get(event.sock, match)
+        if ((p != None) and (p.path[0][2] == path[0][2])):
+            p.add(event)
+            return True
+
+        conns = [self.conn.get_conn(sw) for (sw, i, o) in path[1:]]
+        if (None in conns):
+            return False
+
+        output.vdbg(lambda: "Install path "+\
+                        " ".join(["%x:%s:%s" % h for h in path]),
+                    self.__class__.__name__)
+        p = path_install(self, event, path)
+        self.pending.add(event.sock, match, p)
+        for ((sw, in_port, out_port), conn) in zip(path[1:], conns):
+            key = match.key[:4]+ofutil.UINT16.pack(in_port)+match.key[6:]
+            flow = flows.exact_entry(ofutil.key2match(key).to_ofp_match(),
+                                     idle_timeout=self.idle_timeout)
+            flow.add_output(out_port)
+            flows.install_flows(self.transactions, conn,
+                                [(flow, pyof.OFPFC_ADD)], p.installed,
+                                tables=self.tables)
+        if (len(path) == 1):
+            self.install_ingress(event, path[0][2])
+        return True
+
+    def install_ingress(self, event, port, flowmod=True):
+        """Install flow entry at ingress switch, which releases packet
+
+        @param event packet in event
+        @param port output port at ingress switch
+        @param flowmod send flow mod unless installed
+                       (else send packet out only)
+        """
+        data = None
+        if (event.pktin.buffer_id == flows.UNBUFFERED_ID):
+            data = event.pkt
+        if (flowmod):
+            fm = self.template.pack(event.compact_match, [port],
+                                    buffer_id=event.pktin.buffer_id)
+            if ((self.tables == None) or
+                (not self.tables.is_duplicate(event.sock, fm))):
+                self.conn.send(event.sock, fm)
+                if (data == None):
+                    return
+        self.conn.send(event.sock,
+                       self.po_template.pack(None, [port], data,
+                                             buffer_id=event.pktin.buffer_id,
+                                             in_port=event.match.in_port))
@@ -6,35 +6,74 @@
 # @date Feb 2011
 #
 import yapc.interface as yapc
-import yapc.util.parse as pu
 import yapc.events.openflow as ofevents
 import yapc.netstate.swhost as swhost
 import yapc.log.output as output
 import yapc.pyopenflow as pyof
-import yapc.util.memcacheutil as mc
+import yapc.util.openflow as ofutil
 import yapc.forwarding.flows as flows
 
 class learningswitch(yapc.component):
     """Class to perform per flow learning switch
 
-    Install flow rules with exact matches
+    Install flow rules with exact matches, or in wildcard modes with
+    matches on destination MAC address (and input port), in which case
+    the reverse rule is installed too when the source MAC address is
+    known.  Packets of flows being installed (see flows.pending_installs)
+    or installed (see yapc.netstate.flowtable, if shadow flow tables are
+    given) are sent with packet out instead.
     
     @author ykk
     @date Feb 2011
     """
-    def __init__(self, server, ofconn, sfr=False):
+    ##Only uses state of the switch the packet is from
+    shard_safe = True
+    ##Match exact match of packet
+    EXACT = 0
+    ##Match destination MAC address
+    DL_DST = 1
+    ##Match input port and destination MAC address
+    IN_PORT_DL_DST = 2
+    ##Wildcards of flow rules for each mode
+    WILDCARDS = {EXACT: 0,
+                 DL_DST: pyof.OFPFW_ALL & ~pyof.OFPFW_DL_DST,
+                 IN_PORT_DL_DST: pyof.OFPFW_ALL & ~pyof.OFPFW_DL_DST &\
+                     ~pyof.OFPFW_IN_PORT}
+    def __init__(self, server, ofconn, sfr=False, mode=EXACT,
+                 idle_timeout=flows.DEFAULT_TIMEOUT,
+                 hard_timeout=pyof.OFP_FLOW_PERMANENT, tables=None):
         """Initialize
 
         @param server yapc core
         @param conn reference to connections
         @param sfr send flow removed or not
+        @param mode match of flow rules (EXACT, DL_DST or IN_PORT_DL_DST)
+        @param idle_timeout idle timeout of flow rules
+        @param hard_timeout hard timeout of flow rules
+        @param tables shadow flow tables (see yapc.netstate.flowtable),
+                      if any
         """
         ##Reference to connections
         self.conn = ofconn
+        ##Shadow flow tables (if any)
+        self.tables = tables
         ##Send flow removed of not
         self.send_flow_removed = sfr
+        ##Mode of match
+        self.mode = mode
+        ##Template of flow mod (with output action)
+        flow = flows.exact_entry(pyof.ofp_match(), 
+                                 idle_timeout=idle_timeout,
+                                 hard_timeout=hard_timeout)
+        if (self.send_flow_removed):
+            flow.set_flow_removed_flag()
+        flow.add_output(pyof.OFPP_NONE)
+        self.template = flow.get_flow_mod_template(pyof.OFPFC_MODIFY)
+        ##Template of packet out (with output action)
+        self.po_template = flow.get_packet_out_template()
+        ##Flows being installed
+        self.pending = flows.pending_installs()
 
-        mc.get_client()
         server.register_event_handler(ofevents.pktin.name, self)
         server.register_event_handler(ofevents.flow_removed.name, self)
 
@@ -46,32 +85,86 @@ class learningswitch(yapc.component):
         """
         if (isinstance(event, ofevents.pktin)):
             #Forward packet/flow
-            if (pu.is_multicast_mac(event.match.dl_dst)):
+            mac = ofutil.mac_array2val(event.match.dl_dst)
+            if ((mac >> 40) & 1):
                 return True
             
-            key = swhost.mac2sw_binding.get_key(event.sock,
-                                                event.match.dl_dst)
-            port = mc.get(key)
+            port = swhost.get_binding(event.sock, mac)
             if (port != None):
                 self.installflow(event, port)
                 return False
             else:
-                output.dbg("No binding found for mac %x"  % pu.array2val(event.match.dl_dst),
-                           self.__class__.__name__)
+                output.dbg("No binding found for mac %x",
+                           self.__class__.__name__, mac)
             
         return True     
 
+    def get_match(self, in_port, dl_dst):
+        """Get match of flow rule in wildcard mode
+
+        @param in_port input port
+        @param dl_dst destination MAC address as integer
+        @return match (see ofutil.match)
+        """
+        if (self.mode != learningswitch.IN_PORT_DL_DST):
+            in_port = 0
+        return ofutil.match(learningswitch.WILDCARDS[self.mode],
+                            in_port, dl_dst=dl_dst)
+
     def installflow(self, event, port):
         """Install flow
 
         @param event packet-in event
         @param port port to send flow to
         """
-        flow = flows.exact_entry(event.match)
-        flow.dpkt = event.dpkt
-        if (self.send_flow_removed):
-            flow.set_flow_removed_flag()
-        flow.set_buffer(event.pktin.buffer_id)
-        flow.add_output(port)
-        flow.install(self.conn, event.sock)
+        if (self.mode == learningswitch.EXACT):
+            match = event.compact_match
+        else:
+            match = self.get_match(event.match.in_port,
+                                   ofutil.mac_array2val(event.match.dl_dst))
+        if (self.pending.add(event.sock, match, port) and
+            self.sendflowmod(event.sock,
+                             self.template.pack(match, [port],
+                                                buffer_id=event.pktin.buffer_id))):
+            if (self.mode != learningswitch.EXACT):
+                self.installreverse(event, port)
+            return
+
+        data = None
+        if (event.pktin.buffer_id == flows.UNBUFFERED_ID):
+            data = event.pkt
+        self.conn.send(event.sock,
+                       self.po_template.pack(None, [port], data,
+                                             buffer_id=event.pktin.buffer_id,
+                                             in_port=event.match.in_port))
+
+    def sendflowmod(self, sock, fm):
+        """Send flow mod, unless identical flow is installed
+        (as shown by shadow flow tables)
+
+        @param sock socket of switch
+        @param fm flow mod (binary)
+        @return if flow mod is sent
+        """
+        if ((self.tables != None) and self.tables.is_duplicate(sock, fm)):
+            return False
+        self.conn.send(sock, fm)
+        return True
+
+    def installreverse(self, event, port):
+        """Install reverse flow rule (in wildcard mode) if source MAC 
+        address is known
+
+        @param event packet-in event
+        @param port port packet is sent to
+        """
+        src = ofutil.mac_array2val(event.match.dl_src)
+        srcport = swhost.get_binding(event.sock, src)
+        if (srcport == None):
+            return
+        match = self.get_match(port, src)
+        if (self.pending.add(event.sock, match, srcport)):
+            self.sendflowmod(event.sock,
+                             self.template.pack(match, [srcport],
+                                                buffer_id=flows.UNBUFFERED_ID))
             
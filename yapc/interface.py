@@ -16,6 +16,19 @@ class event:
     """
     ##Name
     name = None
+    ##Indicate if events of subclasses (with names of their own) are
+    ##also dispatched to handlers of this event's name (see core)
+    dispatch_subclasses = False
+
+    def get_field(self, name):
+        """Get value of field to filter handlers on (see core)
+
+        Default uses attribute of event.
+
+        @param name name of field
+        @return value of field (None if event does not have field)
+        """
+        return getattr(self, name, None)
 
 class priv_callback(event):
     """Private callback event for class
@@ -43,9 +56,16 @@ class component:
     on systems like memcached. YAPC's framework allows 
     you to shoot yourself in the foot nonetheless.
 
+    Components that only touch state of the switch the event pertains
+    to (or state that is otherwise thread safe) can set shard_safe,
+    allowing them to run in parallel for different switches when the
+    core is run with workers.
+
     @author ykk
     @date Oct 2010
     """
+    ##Indicate if processevent can run concurrently for different shards
+    shard_safe = False
     def processevent(self, event):
         """Dummy function to process event
 
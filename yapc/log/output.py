@@ -3,6 +3,11 @@
 # Output are divided into 4 levels and
 # can be configured for different verbosity
 #
+# Whether a level is enabled for who is cached, and messages can be
+# formatted lazily (given as a callable or with %-style arguments), so
+# messages of disabled levels cost little more than a dictionary lookup.
+# Use is_enabled to guard message that are expensive to form otherwise.
+#
 # (copied from pylibopenflow on Oct 2010)
 #
 # @author ykk
@@ -23,6 +28,9 @@ LEVELS = {"CRITICAL":50,
 ##Dictionary of loggers
 loggers = {}
 
+##Dictionary of whether level is enabled by (who, level name)
+enabled = {}
+
 ##Generic log name
 GENERIC_LOG_NAME = "generic"
 
@@ -100,53 +108,83 @@ def set_mode(msg_mode, who=None):
     #Individual mode
     if (who != None and who not in loggers):
         __create_logger(who, LEVELS[msg_mode])
-    
-def output(msg_mode, msg, who=None):
-    """Print message
-    """
-    global output_mode
-    global LEVELS
-    global loggers
-    if (output_mode == None):
-        raise RuntimeException("Output mode is not set")
+    enabled.clear()
 
-    #Indicate who string
+def is_enabled(msg_mode, who=None):
+    """Check if message of mode would be output for who
+
+    @param msg_mode mode of message, e.g., DBG
+    @param who module name for logging
+    @return if message would be output
+    """
     if (who == None):
         who = GENERIC_LOG_NAME
-    
+    try:
+        return enabled[(who, msg_mode)]
+    except KeyError:
+        pass
+
+    if (output_mode == None):
+        raise RuntimeError("Output mode is not set")
     #Ensure logger exists
     if (who not in loggers):
         __create_logger(who, LEVELS[output_mode])
+    r = loggers[who].isEnabledFor(LEVELS[msg_mode])
+    enabled[(who, msg_mode)] = r
+    return r
+    
+def output(msg_mode, msg, who=None, *args):
+    """Print message
+
+    @param msg_mode mode of message, e.g., DBG
+    @param msg message, or callable returning message (called only
+               if message is output)
+    @param who module name for logging
+    @param args arguments to format message with using % (if any)
+    """
+    #Indicate who string
+    if (who == None):
+        who = GENERIC_LOG_NAME
+    try:
+        if (not enabled[(who, msg_mode)]):
+            return
+    except KeyError:
+        if (not is_enabled(msg_mode, who)):
+            return
         
     #Log message
+    if (callable(msg)):
+        msg = msg()
+    elif (len(args) > 0):
+        msg = msg % args
     loggers[who].log(LEVELS[msg_mode], msg)
          
-def err(msg, who=None):
+def err(msg, who=None, *args):
     """Print error messages
     """
-    output("ERR", msg, who)
+    output("ERR", msg, who, *args)
 
-def warn(msg, who=None):
+def warn(msg, who=None, *args):
     """Print warning messages
     """
-    output("WARN", msg, who)
+    output("WARN", msg, who, *args)
 
-def info(msg, who=None):
+def info(msg, who=None, *args):
     """Print informational messages
     """
-    output("INFO", msg, who)
+    output("INFO", msg, who, *args)
 
-def dbg(msg, who=None):
+def dbg(msg, who=None, *args):
     """Print debug messages
     """
-    output("DBG", msg, who)
+    output("DBG", msg, who, *args)
 
-def vdbg(msg, who=None):
+def vdbg(msg, who=None, *args):
     """Print verbose debug messages
     """
-    output("VDBG", msg, who)
+    output("VDBG", msg, who, *args)
 
-def vvdbg(msg, who=None):
+def vvdbg(msg, who=None, *args):
     """Print verbose debug messages
     """
-    output("VVDBG", msg, who)
+    output("VVDBG", msg, who, *args)
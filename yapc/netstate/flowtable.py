@@ -0,0 +1,817 @@
+##Shadow flow tables
+#
+# Record of flows installed on each switch, fed by flow mods sent
+# to the switch and flow removed received from it.
+#
+# @author ykk
+# @date Oct 2011
+#
+import yapc.interface as yapc
+import yapc.events.openflow as ofevents
+import yapc.comm.core as comm
+import yapc.comm.openflow as ofcomm
+import yapc.log.output as output
+import yapc.pyopenflow as pyof
+import yapc.util.openflow as ofutil
+import yapc.ofcodec as ofcodec
+import collections
+import threading
+import struct
+import time
+
+##Fields of match (in order of values)
+FIELDS = ["in_port", "dl_src", "dl_dst", "dl_vlan", "dl_vlan_pcp",
+          "dl_type", "nw_tos", "nw_proto", "nw_src", "nw_dst",
+          "tp_src", "tp_dst"]
+##Mask of each field (when not wildcarded)
+FIELD_MASKS = [0xffff, 0xffffffffffff, 0xffffffffffff, 0xffff, 0xff,
+               0xffff, 0xff, 0xff, 0xffffffff, 0xffffffff, 0xffff, 0xffff]
+##Wildcard of each field (nw_src and nw_dst are prefixes)
+FIELD_WILDCARDS = [pyof.OFPFW_IN_PORT, pyof.OFPFW_DL_SRC, pyof.OFPFW_DL_DST,
+                   pyof.OFPFW_DL_VLAN, pyof.OFPFW_DL_VLAN_PCP,
+                   pyof.OFPFW_DL_TYPE, pyof.OFPFW_NW_TOS, pyof.OFPFW_NW_PROTO,
+                   None, None, pyof.OFPFW_TP_SRC, pyof.OFPFW_TP_DST]
+##Offset of match in flow mod and flow removed
+MATCH_OFFSET = 8
+##Struct of action header
+ACTION_HEADER = struct.Struct("!HH")
+##Struct of port of output action
+ACTION_PORT = struct.Struct("!H")
+
+##Dictionary of masks by wildcards
+masks = {}
+
+def normalize(wildcards):
+    """Normalize wildcards (so that equivalent wildcards are the same)
+
+    @param wildcards wildcards of match
+    @return wildcards normalized
+    """
+    wildcards &= pyof.OFPFW_ALL
+    for (shift, mask) in [(pyof.OFPFW_NW_SRC_SHIFT, pyof.OFPFW_NW_SRC_MASK),
+                          (pyof.OFPFW_NW_DST_SHIFT, pyof.OFPFW_NW_DST_MASK)]:
+        if (((wildcards & mask) >> shift) > 32):
+            wildcards = (wildcards & ~mask) | (32 << shift)
+    return wildcards
+
+def get_masks(wildcards):
+    """Get masks of fields for wildcards
+
+    @param wildcards wildcards of match
+    @return tuple of mask of each field (0 if wildcarded)
+    """
+    if (wildcards not in masks):
+        m = []
+        for i in range(0, len(FIELDS)):
+            if (FIELD_WILDCARDS[i] != None):
+                if (wildcards & FIELD_WILDCARDS[i]):
+                    m.append(0)
+                else:
+                    m.append(FIELD_MASKS[i])
+            else:
+                if (FIELDS[i] == "nw_src"):
+                    bits = (wildcards & pyof.OFPFW_NW_SRC_MASK) >> \
+                        pyof.OFPFW_NW_SRC_SHIFT
+                else:
+                    bits = (wildcards & pyof.OFPFW_NW_DST_MASK) >> \
+                        pyof.OFPFW_NW_DST_SHIFT
+                m.append((0xffffffff << min(bits, 32)) & 0xffffffff)
+        masks[wildcards] = tuple(m)
+    return masks[wildcards]
+
+def get_values(match):
+    """Get values of fields of match
+
+    @param match match (see ofutil.match)
+    @return tuple of value of each field
+    """
+    return match[1:len(FIELDS)+1]
+
+def get_key(values, mask):
+    """Get values masked
+
+    @param values tuple of value of each field
+    @param mask tuple of mask of each field
+    @return tuple of masked value of each field
+    """
+    return tuple([v & m for (v, m) in zip(values, mask)])
+
+class flow:
+    """Flow installed on switch
+
+    @author ykk
+    @date Oct 2011
+    """
+    def __init__(self, match, priority, actions="", cookie=0,
+                 idle_timeout=0, hard_timeout=0, flags=0):
+        """Initialize
+
+        @param match match (see ofutil.match)
+        @param priority priority
+        @param actions actions (binary)
+        """
+        ##Match
+        self.match = match
+        ##Wildcards (normalized)
+        self.wildcards = normalize(match.wildcards)
+        ##Mask of each field
+        self.mask = get_masks(self.wildcards)
+        ##Masked value of each field
+        self.key = get_key(get_values(match), self.mask)
+        ##Priority
+        self.priority = priority
+        ##Actions (binary)
+        self.actions = actions
+        ##Cookie
+        self.cookie = cookie
+        ##Idle timeout
+        self.idle_timeout = idle_timeout
+        ##Hard timeout
+        self.hard_timeout = hard_timeout
+        ##Flags
+        self.flags = flags
+        ##Time flow is (last) installed
+        self.installed = time.time()
+        ##Time flow is presumed expired (None if never)
+        self.expiry = None
+        self.refresh(self.installed)
+
+    def refresh(self, now):
+        """Refresh time flow is presumed expired
+
+        Flows without flow removed are presumed expired after their
+        idle timeout (since packets matched are not known), and
+        all flows after their hard timeout.
+
+        @param now current time
+        """
+        timeouts = [t for t in [self.hard_timeout] if t]
+        if (self.idle_timeout and
+            not (self.flags & pyof.OFPFF_SEND_FLOW_REM)):
+            timeouts.append(self.idle_timeout)
+        if (len(timeouts) > 0):
+            self.expiry = now+min(timeouts)
+        else:
+            self.expiry = None
+
+    def is_expired(self, now):
+        """Check if flow is presumed expired
+
+        @param now current time
+        @return if expired
+        """
+        return ((self.expiry != None) and (self.expiry <= now))
+
+    def has_output(self, port):
+        """Check if flow has output action to port
+
+        @param port port
+        @return if flow outputs to port
+        """
+        offset = 0
+        while (offset+ACTION_HEADER.size <= len(self.actions)):
+            (t, l) = ACTION_HEADER.unpack_from(self.actions, offset)
+            if ((t == pyof.OFPAT_OUTPUT) and
+                (ACTION_PORT.unpack_from(self.actions, offset+4)[0] == port)):
+                return True
+            if (l == 0):
+                break
+            offset += l
+        return False
+
+    def overlaps(self, key, mask):
+        """Check if flow overlaps match
+        (i.e., some packet can match both)
+
+        @param key masked value of each field of match
+        @param mask mask of each field of match
+        @return if overlapping
+        """
+        for i in range(0, len(mask)):
+            m = mask[i] & self.mask[i]
+            if ((key[i] & m) != (self.key[i] & m)):
+                return False
+        return True
+
+    def is_covered(self, key, mask):
+        """Check if flow is covered by match
+        (i.e., every packet matching flow matches match)
+
+        @param key masked value of each field of match
+        @param mask mask of each field of match
+        @return if covered
+        """
+        for i in range(0, len(mask)):
+            if (((mask[i] & self.mask[i]) != mask[i]) or
+                ((self.key[i] & mask[i]) != key[i])):
+                return False
+        return True
+
+class wildcard_tuple:
+    """Flows of the same wildcards, indexed by masked value of fields
+
+    @author ykk
+    @date Oct 2011
+    """
+    def __init__(self, wildcards):
+        """Initialize
+
+        @param wildcards wildcards of flows
+        """
+        ##Wildcards
+        self.wildcards = wildcards
+        ##Mask of each field
+        self.mask = get_masks(wildcards)
+        ##Dictionary of flows (by priority) by masked value of fields
+        self.flows = {}
+        ##Number of flows
+        self.count = 0
+        ##Highest priority of flows (not lowered on removal)
+        self.max_priority = -1
+        ##Dictionary of index (list of flows by masked value of fields)
+        ##by mask, for search by fewer fields than tuple (e.g., overlap)
+        self.indices = {}
+
+    def get(self, key, priority):
+        """Get flow
+
+        @param key masked value of each field
+        @param priority priority
+        @return flow (None if none)
+        """
+        return self.flows.get(key, {}).get(priority)
+
+    def add(self, f):
+        """Add flow (replacing flow of same match and priority)
+
+        @param f flow
+        @return flow replaced (None if none)
+        """
+        p = self.flows.setdefault(f.key, {})
+        old = p.get(f.priority)
+        p[f.priority] = f
+        if (old == None):
+            self.count += 1
+        self.max_priority = max(self.max_priority, f.priority)
+        for (mask, index) in self.indices.items():
+            l = index.setdefault(get_key(f.key, mask), [])
+            if (old != None):
+                l.remove(old)
+            l.append(f)
+        return old
+
+    def remove(self, f):
+        """Remove flow
+
+        @param f flow
+        @return if flow is removed
+        """
+        p = self.flows.get(f.key)
+        if ((p == None) or (p.get(f.priority) is not f)):
+            return False
+        del p[f.priority]
+        if (len(p) == 0):
+            del self.flows[f.key]
+        self.count -= 1
+        for (mask, index) in self.indices.items():
+            key = get_key(f.key, mask)
+            l = index[key]
+            l.remove(f)
+            if (len(l) == 0):
+                del index[key]
+        return True
+
+    def search(self, key, mask):
+        """Get flows by value of fields masked
+        (with index of mask built on first use)
+
+        @param key masked value of each field
+        @param mask mask of each field (no more specific than tuple)
+        @return list of flows
+        """
+        index = self.indices.get(mask)
+        if (index == None):
+            index = {}
+            for f in self.iterflows():
+                index.setdefault(get_key(f.key, mask), []).append(f)
+            self.indices[mask] = index
+        return index.get(key, [])
+
+    def lookup(self, values):
+        """Get highest priority flow matching packet
+
+        @param values value of each field of packet
+        @return flow (None if none)
+        """
+        p = self.flows.get(get_key(values, self.mask))
+        if (p == None):
+            return None
+        return p[max(p)]
+
+    def iterflows(self):
+        """Iterate over flows
+        """
+        for p in self.flows.values():
+            for f in p.values():
+                yield f
+
+class flow_table:
+    """Shadow flow table of switch
+
+    Flows are kept in an exact match index and in a tuple space
+    of wildcard flows (one hash table per wildcards), searched in
+    order of their highest priority.  Exact matches take precedence
+    over wildcard flows (as in OpenFlow 1.0).  Lookup of packet and
+    check of identical flow take a hash probe per wildcards (or one
+    for an exact match), and so do overlap and cover checks.  For
+    tuples more specific than the match checked, the probe is into an
+    index of the tuple by the fields of the match, which is built on
+    first use (a scan of the tuple) and kept up to date after.
+
+    @author ykk
+    @date Oct 2011
+    """
+    def __init__(self):
+        """Initialize
+        """
+        ##Exact match flows
+        self.exact = wildcard_tuple(0)
+        ##Dictionary of wildcard tuples by wildcards
+        self.tuples = {}
+        ##List of wildcard tuples in order of highest priority
+        self.order = []
+        ##Lock
+        self.lock = threading.RLock()
+
+    def __len__(self):
+        """Get number of flows
+        """
+        return self.exact.count+sum([t.count for t in self.tuples.values()])
+
+    def __get_tuple(self, wildcards, create=False):
+        """Get tuple of wildcards
+
+        @param wildcards wildcards (normalized)
+        @param create create tuple if none
+        @return tuple (None if none)
+        """
+        if (wildcards == 0):
+            return self.exact
+        t = self.tuples.get(wildcards)
+        if ((t == None) and create):
+            t = wildcard_tuple(wildcards)
+            self.tuples[wildcards] = t
+            self.order.append(t)
+        return t
+
+    def __all_tuples(self):
+        """Get all tuples (exact first)
+        """
+        return [self.exact]+self.order
+
+    def __sort(self):
+        """Sort tuples by highest priority
+        """
+        self.order.sort(key=lambda t: t.max_priority, reverse=True)
+
+    def __remove(self, f):
+        """Remove flow
+
+        @param f flow
+        @return if flow is removed
+        """
+        t = self.__get_tuple(f.wildcards)
+        if ((t == None) or (not t.remove(f))):
+            return False
+        if ((t.count == 0) and (t != self.exact)):
+            del self.tuples[t.wildcards]
+            self.order.remove(t)
+        return True
+
+    def __add(self, f):
+        """Add flow (with lock held)
+
+        @param f flow
+        @return flow replaced (None if none)
+        """
+        t = self.__get_tuple(f.wildcards, True)
+        if (t == self.exact):
+            #Exact match replaces flow of any priority
+            old = t.lookup(f.key)
+            if (old != None):
+                t.remove(old)
+            t.add(f)
+        else:
+            priority = t.max_priority
+            old = t.add(f)
+            if (t.max_priority != priority):
+                self.__sort()
+        return old
+
+    def __get_affected(self, match, priority, strict):
+        """Get flows affected by modify or delete (with lock held)
+
+        @param match match (see ofutil.match)
+        @param priority priority (for strict modify or delete)
+        @param strict flow of match and priority only
+        @return list of flows
+        """
+        if (strict):
+            return [x for x in [self.get(match, priority)] if (x != None)]
+        return self.get_covered(match)
+
+    def get(self, match, priority):
+        """Get flow of match and priority
+
+        @param match match (see ofutil.match)
+        @param priority priority (ignored for exact match)
+        @return flow (None if none)
+        """
+        wildcards = normalize(match.wildcards)
+        mask = get_masks(wildcards)
+        self.lock.acquire()
+        t = self.__get_tuple(wildcards)
+        f = None
+        if (t != None):
+            key = get_key(get_values(match), mask)
+            if (t == self.exact):
+                f = t.lookup(key)
+            else:
+                f = t.get(key, priority)
+            if ((f != None) and f.is_expired(time.time())):
+                self.__remove(f)
+                f = None
+        self.lock.release()
+        return f
+
+    def is_installed(self, match, priority, actions):
+        """Check if identical flow is installed
+        (to avoid sending duplicate flow mod)
+
+        @param match match (see ofutil.match)
+        @param priority priority
+        @param actions actions (binary)
+        @return if identical flow is installed
+        """
+        f = self.get(match, priority)
+        return ((f != None) and (f.actions == actions))
+
+    def is_duplicate(self, msg, offset=0):
+        """Check if flow mod is for flow identical to one installed
+        (and so need not be sent)
+
+        Only add, strict modify and modify of exact match are checked,
+        as other flow mods can change other flows.
+
+        @param msg buffer with flow mod
+        @param offset offset of flow mod in buffer
+        @return if identical flow is installed
+        """
+        fm = ofcodec.view(pyof.ofp_flow_mod, msg, offset)
+        match = ofutil.key2match(msg, offset+MATCH_OFFSET)
+        if ((fm.command not in [pyof.OFPFC_ADD, pyof.OFPFC_MODIFY_STRICT]) and
+            ((fm.command != pyof.OFPFC_MODIFY) or
+             (normalize(match.wildcards) != 0))):
+            return False
+        length = ofcomm.HEADER_LENGTH.unpack_from(msg, offset+2)[0]
+        return self.is_installed(match, fm.priority,
+                                 msg[offset+pyof.OFP_FLOW_MOD_BYTES:
+                                         offset+length])
+
+    def lookup(self, match):
+        """Get flow that packet matches
+
+        @param match match of packet (see ofutil.match)
+        @return flow of highest priority (None if none)
+        """
+        values = get_values(match)
+        now = time.time()
+        self.lock.acquire()
+        f = self.exact.lookup(values)
+        if ((f != None) and f.is_expired(now)):
+            self.__remove(f)
+            f = None
+        if (f == None):
+            for t in self.order[:]:
+                if ((f != None) and (t.max_priority <= f.priority)):
+                    break
+                c = t.lookup(values)
+                if ((c != None) and c.is_expired(now)):
+                    self.__remove(c)
+                    c = t.lookup(values)
+                if ((c != None) and ((f == None) or (c.priority > f.priority))):
+                    f = c
+        self.lock.release()
+        return f
+
+    def get_overlaps(self, match, priority):
+        """Get flows of same priority that overlap match
+        (as checked by switch for OFPFF_CHECK_OVERLAP)
+
+        @param match match (see ofutil.match)
+        @param priority priority
+        @return list of flows
+        """
+        mask = get_masks(normalize(match.wildcards))
+        key = get_key(get_values(match), mask)
+        now = time.time()
+        r = []
+        self.lock.acquire()
+        for t in self.__all_tuples():
+            if ([m for (m, tm) in zip(mask, t.mask) if ((m & tm) != tm)]):
+                #Tuple more specific than match, so search its index
+                #by fields of both
+                common = tuple([m & tm for (m, tm) in zip(mask, t.mask)])
+                r.extend([f for f in t.search(get_key(key, common), common)
+                          if (f.priority == priority)])
+            elif (t == self.exact):
+                f = t.lookup(key)
+                if ((f != None) and (f.priority == priority)):
+                    r.append(f)
+            else:
+                f = t.get(get_key(key, t.mask), priority)
+                if (f != None):
+                    r.append(f)
+        self.lock.release()
+        return [f for f in r if not f.is_expired(now)]
+
+    def get_covered(self, match, priority=None):
+        """Get flows covered by match
+        (as affected by non-strict modify or delete)
+
+        @param match match (see ofutil.match)
+        @param priority priority (None for any priority)
+        @return list of flows
+        """
+        mask = get_masks(normalize(match.wildcards))
+        key = get_key(get_values(match), mask)
+        r = []
+        self.lock.acquire()
+        for t in self.__all_tuples():
+            if ([m for (m, tm) in zip(mask, t.mask) if ((m & tm) != m)]):
+                #Tuple less specific than match somewhere
+                continue
+            if (t.mask == mask):
+                r.extend(t.flows.get(key, {}).values())
+            else:
+                r.extend(t.search(key, mask))
+        self.lock.release()
+        if (priority != None):
+            r = [f for f in r if (f.priority == priority)]
+        return r
+
+    def add(self, f):
+        """Add flow (as with OFPFC_ADD)
+
+        @param f flow
+        @return False if identical flow is already installed, else True
+        """
+        self.lock.acquire()
+        old = self.__add(f)
+        self.lock.release()
+        return not ((old != None) and (old.actions == f.actions) and
+                    not old.is_expired(f.installed))
+
+    def modify(self, match, priority, actions, strict=False, f=None):
+        """Modify actions of flows (as with OFPFC_MODIFY)
+
+        @param match match (see ofutil.match)
+        @param priority priority (for strict modify)
+        @param actions actions (binary)
+        @param strict modify flow of match and priority only
+        @param f flow to add if no flow is modified
+        @return record to undo modify (see undo)
+        """
+        self.lock.acquire()
+        r = self.__get_affected(match, priority, strict)
+        undo = (None, None, [(x, x.actions, actions) for x in r])
+        for x in r:
+            x.actions = actions
+        if ((len(r) == 0) and (f != None)):
+            undo = (f, self.__add(f), [])
+        self.lock.release()
+        return undo
+
+    def delete(self, match, priority=None, out_port=pyof.OFPP_NONE,
+               strict=False):
+        """Delete flows (as with OFPFC_DELETE)
+
+        @param match match (see ofutil.match)
+        @param priority priority (for strict delete)
+        @param out_port delete only flows that output to port
+        @param strict delete flow of match and priority only
+        @return list of flows deleted
+        """
+        self.lock.acquire()
+        r = self.__get_affected(match, priority, strict)
+        if (out_port != pyof.OFPP_NONE):
+            r = [x for x in r if x.has_output(out_port)]
+        for x in r:
+            self.__remove(x)
+        self.lock.release()
+        return r
+
+    def expire(self, now=None):
+        """Remove flows presumed expired
+
+        @param now current time (None for now)
+        @return number of flows removed
+        """
+        if (now == None):
+            now = time.time()
+        self.lock.acquire()
+        r = [f for t in self.__all_tuples() for f in t.iterflows()
+             if f.is_expired(now)]
+        for f in r:
+            self.__remove(f)
+        self.lock.release()
+        return len(r)
+
+    def undo(self, record):
+        """Undo add or modify of flow mod rejected by switch
+        (unless flows are changed since)
+
+        @param record record of update (from flow_mod)
+        """
+        (added, replaced, modified) = record
+        self.lock.acquire()
+        if ((added != None) and self.__remove(added) and (replaced != None)):
+            self.__add(replaced)
+        for (x, old, new) in modified:
+            if (x.actions is new):
+                x.actions = old
+        self.lock.release()
+
+    def flow_mod(self, msg, offset=0):
+        """Update table with flow mod sent
+
+        @param msg buffer with flow mod
+        @param offset offset of flow mod in buffer
+        @return record to undo update if switch rejects flow mod
+                (None if none)
+        """
+        fm = ofcodec.view(pyof.ofp_flow_mod, msg, offset)
+        length = ofcomm.HEADER_LENGTH.unpack_from(msg, offset+2)[0]
+        match = ofutil.key2match(msg, offset+MATCH_OFFSET)
+        actions = msg[offset+pyof.OFP_FLOW_MOD_BYTES:offset+length]
+        f = flow(match, fm.priority, actions, fm.cookie,
+                 fm.idle_timeout, fm.hard_timeout, fm.flags)
+        if (fm.command == pyof.OFPFC_ADD):
+            if ((fm.flags & pyof.OFPFF_CHECK_OVERLAP) and
+                (len(self.get_overlaps(match, fm.priority)) > 0)):
+                return None
+            self.lock.acquire()
+            undo = (f, self.__add(f), [])
+            self.lock.release()
+            return undo
+        elif (fm.command in [pyof.OFPFC_MODIFY, pyof.OFPFC_MODIFY_STRICT]):
+            return self.modify(match, fm.priority, actions,
+                               (fm.command == pyof.OFPFC_MODIFY_STRICT), f)
+        elif (fm.command in [pyof.OFPFC_DELETE, pyof.OFPFC_DELETE_STRICT]):
+            self.delete(match, fm.priority, fm.out_port,
+                        (fm.command == pyof.OFPFC_DELETE_STRICT))
+        return None
+
+class shadow_tables(yapc.component):
+    """Shadow flow tables of switches
+
+    Flow mods sent to switches (e.g., by yapc.forwarding.flows) and
+    flow removed received update the table of the switch.  Flows
+    without flow removed are presumed expired after their timeouts.
+    Flow mods sent are kept by xid for a while, so that the update of
+    a flow mod is undone if the switch replies with an error.
+
+    @author ykk
+    @date Oct 2011
+    """
+    ##Tables are updated under their lock
+    shard_safe = True
+    def __init__(self, server, interval=30, error_timeout=5):
+        """Initialize
+
+        @param server yapc core
+        @param interval interval to remove flows presumed expired
+        @param error_timeout time to wait for error of flow mod
+        """
+        ##Reference to core
+        self.server = server
+        ##Interval to remove flows presumed expired
+        self.interval = interval
+        ##Time to wait for error of flow mod
+        self.error_timeout = error_timeout
+        ##Dictionary of flow table by socket
+        self.tables = {}
+        ##Dictionary of (expiry, record to undo) of flow mods sent
+        ##by xid (in order sent), indexed by socket
+        self.sent = {}
+        ##Lock for tables
+        self.__lock = threading.Lock()
+
+        ofcomm.register_observer(pyof.OFPT_FLOW_MOD, self.observe)
+        server.register_event_handler(ofevents.flow_removed.name, self)
+        server.register_event_handler(ofevents.error.name, self)
+        server.register_event_handler(comm.event.name, self)
+        server.post_event(yapc.priv_callback(self), self.interval)
+
+    def get_table(self, sock):
+        """Get flow table of switch
+
+        @param sock socket of switch
+        @return flow table (created if none)
+        """
+        t = self.tables.get(sock)
+        if (t == None):
+            self.__lock.acquire()
+            t = self.tables.setdefault(sock, flow_table())
+            self.__lock.release()
+        return t
+
+    def is_duplicate(self, sock, msg, offset=0):
+        """Check if flow mod to switch is for flow identical to one
+        installed (and so need not be sent)
+
+        @param sock socket of switch
+        @param msg buffer with flow mod
+        @param offset offset of flow mod in buffer
+        @return if identical flow is installed
+        """
+        t = self.tables.get(sock)
+        return ((t != None) and t.is_duplicate(msg, offset))
+
+    def observe(self, sock, msg, offset):
+        """Update table with flow mod sent
+
+        @param sock socket flow mod is sent on
+        @param msg buffer with flow mod
+        @param offset offset of flow mod in buffer
+        """
+        undo = self.get_table(sock).flow_mod(msg, offset)
+        if (undo == None):
+            return
+        xid = ofutil.UINT32.unpack_from(msg, offset+4)[0]
+        now = time.time()
+        self.__lock.acquire()
+        sent = self.sent.get(sock)
+        if (sent == None):
+            sent = collections.OrderedDict()
+            self.sent[sock] = sent
+        self.__expire_sent(sent, now)
+        sent[xid] = (now+self.error_timeout, undo)
+        self.__lock.release()
+
+    def __expire_sent(self, sent, now):
+        """Remove flow mods sent past time to wait for error
+        (with lock held)
+
+        @param sent dictionary of flow mods sent of switch
+        @param now current time
+        """
+        while (len(sent) > 0):
+            xid = next(iter(sent))
+            if (sent[xid][0] > now):
+                break
+            del sent[xid]
+
+    def processevent(self, event):
+        """Event handler
+
+        @param event event to handle
+        """
+        if (isinstance(event, ofevents.flow_removed)):
+            t = self.tables.get(event.sock)
+            if (t != None):
+                t.delete(ofutil.key2match(event.message, MATCH_OFFSET),
+                         event.flowrm.priority, strict=True)
+
+        elif (isinstance(event, ofevents.error)):
+            #Undo flow mod rejected
+            self.__lock.acquire()
+            r = self.sent.get(event.sock, {}).pop(event.header.xid, None)
+            self.__lock.release()
+            t = self.tables.get(event.sock)
+            if ((r != None) and (t != None)):
+                t.undo(r[1])
+                output.dbg("Flow mod of xid %d rejected by switch",
+                           self.__class__.__name__, event.header.xid)
+
+        elif (isinstance(event, comm.event) and
+              (event.event == comm.event.SOCK_CLOSE)):
+            self.__lock.acquire()
+            self.tables.pop(event.sock, None)
+            self.sent.pop(event.sock, None)
+            self.__lock.release()
+
+        elif (isinstance(event, yapc.priv_callback)):
+            now = time.time()
+            self.__lock.acquire()
+            for sent in self.sent.values():
+                self.__expire_sent(sent, now)
+            self.__lock.release()
+            for (sock, t) in self.tables.items():
+                n = t.expire()
+                if (n > 0):
+                    output.vdbg("%d flows presumed expired",
+                                self.__class__.__name__, n)
+            self.server.post_event(yapc.priv_callback(self), self.interval)
+
+        return True
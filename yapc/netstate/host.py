@@ -26,7 +26,7 @@ class host_dns(yapc.component):
 
         @param server yapc core
         """
-        server.register_event_handler(ofevents.pktin.name, self)
+        server.register_event_handler(ofevents.pktin.name, self, tp_src=53)
 
     def get_name_key(host, domain_name):
         """Get key for domain name
@@ -5,14 +5,188 @@
 #
 import yapc.interface as yapc
 import yapc.util.memcacheutil as mc
-import yapc.util.parse as pu
+import yapc.util.openflow as ofutil
 import yapc.events.openflow as ofevents
+import yapc.comm.core as comm
 import yapc.log.output as output
+import threading
+import math
 import time
 
+##Dictionary of MAC table by socket of switch
+tables = {}
+
+def get_binding(sock, mac):
+    """Get port of switch MAC address is binded to
+
+    @param sock socket of switch
+    @param mac MAC address as integer
+    @return port (None if not learned)
+    """
+    t = tables.get(sock)
+    if (t == None):
+        return None
+    return t.get(mac)
+
+class mac_table:
+    """MAC learning table of switch
+
+    Bindings are keyed by MAC address as 48-bit integer and aged with
+    a timer wheel of one slot per granularity.  A binding is only moved
+    to a later slot when its slot is reached, so refreshing a known
+    binding is a dictionary update.
+
+    @author ykk
+    @date Oct 2011
+    """
+    def __init__(self, timeout=60, granularity=1, expired=None):
+        """Initialize
+
+        @param timeout time binding is kept after last seen
+        @param granularity time per slot of timer wheel
+        @param expired function called with (mac, port) of binding expired
+        """
+        ##Time binding is kept after last seen
+        self.timeout = timeout
+        ##Time per slot
+        self.granularity = granularity
+        ##Function called when binding expired
+        self.expired = expired
+        ##Dictionary of binding [port, last seen, tick of slot] by MAC
+        self.bindings = {}
+        ##Timer wheel (list of slots of (MAC, binding))
+        self.wheel = [[] for i in range(int(math.ceil(float(timeout)/
+                                                      granularity))+2)]
+        ##Last tick of timer wheel processed
+        self.tick = int(time.time()/granularity)
+        ##Lock
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        """Get number of bindings
+        """
+        return len(self.bindings)
+
+    def __schedule(self, mac, binding):
+        """Put binding in slot of its expiry
+
+        @param mac MAC address
+        @param binding binding
+        """
+        binding[2] = int((binding[1]+self.timeout)/self.granularity)+1
+        self.wheel[binding[2] % len(self.wheel)].append((mac, binding))
+
+    def __advance(self, now):
+        """Advance timer wheel to time, removing bindings expired
+
+        @param now current time
+        @return list of (MAC, port) expired
+        """
+        r = []
+        tick = int(now/self.granularity)
+        for t in range(max(self.tick+1, tick-len(self.wheel)+1), tick+1):
+            i = t % len(self.wheel)
+            slot = self.wheel[i]
+            self.wheel[i] = []
+            for (mac, b) in slot:
+                if (self.bindings.get(mac) is not b):
+                    continue
+                if (b[2] > t):
+                    self.wheel[i].append((mac, b))
+                elif (b[1]+self.timeout <= now):
+                    del self.bindings[mac]
+                    r.append((mac, b[0]))
+                else:
+                    self.__schedule(mac, b)
+        self.tick = max(self.tick, tick)
+        return r
+
+    def __expire(self, now):
+        """Advance timer wheel and call back for bindings expired
+
+        @param now current time
+        """
+        self.__lock.acquire()
+        r = self.__advance(now)
+        self.__lock.release()
+        if (self.expired != None):
+            for (mac, port) in r:
+                self.expired(mac, port)
+
+    def learn(self, mac, port, now=None):
+        """Learn MAC address is binded to port
+
+        @param mac MAC address as integer
+        @param port port
+        @param now current time (None for now)
+        @return True if binding is new or changed, else False
+        """
+        if (now == None):
+            now = time.time()
+        self.__expire(now)
+        self.__lock.acquire()
+        b = self.bindings.get(mac)
+        changed = True
+        if (b == None):
+            b = [port, now, None]
+            self.bindings[mac] = b
+            self.__schedule(mac, b)
+        else:
+            changed = (b[0] != port)
+            b[0] = port
+            b[1] = now
+        self.__lock.release()
+        return changed
+
+    def get(self, mac, now=None):
+        """Get port MAC address is binded to
+
+        @param mac MAC address as integer
+        @param now current time (None for now)
+        @return port (None if not learned)
+        """
+        if (now == None):
+            now = time.time()
+        self.__expire(now)
+        b = self.bindings.get(mac)
+        if ((b == None) or (b[1]+self.timeout <= now)):
+            return None
+        return b[0]
+
+    def remove(self, mac):
+        """Remove binding of MAC address
+
+        @param mac MAC address as integer
+        """
+        self.__lock.acquire()
+        self.bindings.pop(mac, None)
+        self.__lock.release()
+
+    def remove_port(self, test):
+        """Remove bindings of ports
+
+        @param test function called with port, true if its bindings
+                    are to be removed
+        @return list of MAC addresses removed
+        """
+        self.__lock.acquire()
+        r = [mac for (mac, b) in self.bindings.items() if test(b[0])]
+        for mac in r:
+            del self.bindings[mac]
+        self.__lock.release()
+        return r
+
+
 class mac2sw_binding(yapc.component):
     """Class learns which port of the switch is the mac address binded to
 
+    Bindings are kept in a MAC table per switch (see get_binding).
+    Memcache can be kept as a replica, which is written behind (in
+    the next event handled) when a binding changes, and rewritten when
+    a binding seen was written TIMEOUT ago.  Records of the replica
+    expire after REPLICA_TTL, so that they do not outlive the
+    controller.
+
     @author ykk
     @date Feb 2011
     """
@@ -20,38 +194,115 @@ class mac2sw_binding(yapc.component):
     MAC2SW_BINDING_PREFIX ="mac2sw_binding_"
     ##Timeout
     TIMEOUT = 60
-    def __init__(self, server):
+    ##Time to live of binding in memcache
+    REPLICA_TTL = 2*TIMEOUT
+    ##Only uses state of the switch the packet is from
+    shard_safe = True
+    def __init__(self, server, replicate=False):
         """Initialize
 
         @param server yapc core
+        @param replicate keep replica of bindings in memcache
         """
-        mc.get_client()
+        ##Reference to core
+        self.server = server
+        ##Keep replica in memcache or not
+        self.replicate = replicate
+        ##Dictionary of binding (None if removed) to write to memcache
+        self.dirty = {}
+        ##Dictionary of time binding is written by (socket, MAC)
+        self.written = {}
+        ##Lock for bindings to write
+        self.__lock = threading.Lock()
+
+        if (self.replicate):
+            mc.get_client()
         server.register_event_handler(ofevents.pktin.name, self)
+        server.register_event_handler(comm.event.name, self)
 
     def get_key(sock, mac):
         """Get key to retrieve binding between switch and mac
         """
         return mac2sw_binding.MAC2SW_BINDING_PREFIX +\
             mc.socket_str(sock) +\
-            "%x" % pu.array2val(mac)
+            "%x" % ofutil.mac_array2val(mac)
     get_key = yapc.static_callable(get_key)
 
+    def get_table(self, sock):
+        """Get MAC table of switch
+
+        @param sock socket of switch
+        @return MAC table (created if none)
+        """
+        t = tables.get(sock)
+        if (t == None):
+            expired = None
+            if (self.replicate):
+                expired = lambda mac, port: self.write(sock, mac, None)
+            t = tables.setdefault(sock, mac_table(mac2sw_binding.TIMEOUT,
+                                                  expired=expired))
+        return t
+
+    def write(self, sock, mac, port):
+        """Write binding to memcache (behind)
+
+        @param sock socket of switch
+        @param mac MAC address as integer
+        @param port port (None to remove binding)
+        """
+        self.__lock.acquire()
+        if (len(self.dirty) == 0):
+            self.server.post_event(yapc.priv_callback(self))
+        self.dirty[self.get_key(sock, ofutil.mac_val2array(mac))] = port
+        if (port == None):
+            self.written.pop((sock, mac), None)
+        else:
+            self.written[(sock, mac)] = time.time()
+        self.__lock.release()
+
     def processevent(self, event):
         """Event handler
 
         @param event event to handle
         """
-        key = self.get_key(event.sock, event.match.dl_src)
+        if (isinstance(event, ofevents.pktin)):
+            mac = ofutil.mac_array2val(event.match.dl_src)
+
+            #Broadcast mac
+            if ((mac >> 40) & 1):
+                return True
+
+            now = time.time()
+            changed = self.get_table(event.sock).learn(mac,
+                                                       event.pktin.in_port,
+                                                       now)
+            if (self.replicate and
+                (changed or
+                 (self.written.get((event.sock, mac), 0)+\
+                      mac2sw_binding.TIMEOUT <= now))):
+                self.write(event.sock, mac, event.pktin.in_port)
+            if (changed):
+                output.vdbg("Learn that %x is connected to port %d "+\
+                                "of switch with %s",
+                            self.__class__.__name__,
+                            mac, event.pktin.in_port, event.sock)
 
-        #Broadcast mac
-        if (pu.is_multicast_mac(event.match.dl_src)):
-            return True
+        elif (isinstance(event, yapc.priv_callback)):
+            self.__lock.acquire()
+            dirty = self.dirty
+            self.dirty = {}
+            self.__lock.release()
+            for (key, port) in dirty.items():
+                if (port == None):
+                    mc.delete(key)
+                else:
+                    mc.set(key, port, mac2sw_binding.REPLICA_TTL)
 
-        mc.set(key, event.pktin.in_port, mac2sw_binding.TIMEOUT)
-        output.vdbg("Learn that %x " % pu.array2val(event.match.dl_src) +\
-                       "is connected to port " + \
-                       str(event.pktin.in_port)+" of switch with "+\
-                       str(event.sock),
-                   self.__class__.__name__)
+        elif (isinstance(event, comm.event) and
+              (event.event == comm.event.SOCK_CLOSE)):
+            t = tables.pop(event.sock, None)
+            if ((t != None) and self.replicate):
+                for mac in t.bindings.keys():
+                    self.write(event.sock, mac, None)
 
         return True
@@ -7,14 +7,15 @@ import struct
 import time
 import dpkt.ethernet
 import yapc.interface as yapc
+import yapc.comm.core as comm
 import yapc.events.openflow as ofevents
 import yapc.events.network as netevents
 import yapc.packet.lldp as lldppkt
 import yapc.netstate.switches as swstate
 import yapc.util.memcacheutil as mc
 import yapc.pyopenflow as pyof
-import yapc.util.openflow as ofutil
 import yapc.util.parse as parseutil
+import yapc.forwarding.flows as flows
 import yapc.log.output as output
 
 class link_maintain:
@@ -98,15 +99,20 @@ class lldp_link_discovery(yapc.component):
         self.__po.in_port = pyof.OFPP_NONE
         self.__po.actions_len = oao.len
         self.__po.actions.append(oao)
+        ##Dictionary of packet out template (with LLDP) 
+        ##indexed by (port, MAC address), indexed by socket
+        self.__lldp = {}
 
         mc.get_client()
 
         server.register_event_handler(ofevents.pktin.name,
-                                      self)
+                                      self, dl_type=lldppkt.LLDP_ETH)
         server.register_event_handler(ofevents.port_status.name,
                                       self)
         server.register_event_handler(ofevents.features_reply.name,
                                       self)
+        server.register_event_handler(comm.event.name,
+                                      self)
         server.post_event(yapc.priv_callback(self, True),
                           self.interval)
 
@@ -131,9 +137,15 @@ class lldp_link_discovery(yapc.component):
                 return False
         
         elif isinstance(event, ofevents.port_status):
+            #Drop packet out of port (as port is deleted or changed)
+            lldp = self.__lldp.get(event.sock, {})
+            for key in lldp.keys():
+                if (key[0] == event.port.desc.port_no):
+                    del lldp[key]
             #New port, so let's try to find a new link fast
-            self.send_lldp(self.conn.db[event.sock].dpid,
-                           event.port.desc)
+            if (event.port.reason != pyof.OFPPR_DELETE):
+                self.send_lldp(self.conn.db[event.sock].dpid,
+                               event.port.desc)
 
         elif isinstance(event, ofevents.features_reply):
             #New switch, so let's try to find new links fast
@@ -169,6 +181,11 @@ class lldp_link_discovery(yapc.component):
                     self.server.post_event(yapc.priv_callback(self, False),
                                            self.__minterval)
                 self.link_maintain.check_expire()
+
+        elif isinstance(event, comm.event):
+            #Socket close, so drop packet out of switch
+            if (event.event == comm.event.SOCK_CLOSE):
+                self.__lldp.pop(event.sock, None)
                 
         return True
 
@@ -178,12 +195,17 @@ class lldp_link_discovery(yapc.component):
         @param sw datapath id of switch
         @param port phy port
         """
-        self.__po.xid = ofutil.get_xid()
-        self.__po.actions[0].port = port.port_no
         switch = self.conn.get_conn(sw)
         if (switch != None):
-            switch.send(self.__po.pack()+\
-                        self.form_eth_lldp(sw, port))
+            if (switch.sock not in self.__lldp):
+                self.__lldp[switch.sock] = {}
+            lldp = self.__lldp[switch.sock]
+            key = (port.port_no, tuple(port.hw_addr))
+            if (key not in lldp):
+                self.__po.actions[0].port = port.port_no
+                lldp[key] = flows.template(self.__po,
+                                           self.form_eth_lldp(sw, port))
+            switch.send(lldp[key].pack())
             output.vdbg("Sending LLDP to %x:" % sw +str(port.port_no),
                         self.__class__.__name__)
 
@@ -0,0 +1,602 @@
+##Precompiled codecs for pyopenflow
+#
+# Provides pack/unpack for the classes in yapc.pyopenflow using a
+# single precompiled struct.Struct per class, and installs them in
+# place of the generated methods.  The codecs are generated (see 
+# write) into yapc.pyopenflow_codec, which is checked in and must be 
+# regenerated whenever yapc.pyopenflow is.  The layout of each class 
+# is read from the pack method generated by pylibopenflow.  Classes
+# without codec keep the methods generated by pylibopenflow.
+#
+# Each class installed also gets
+# * pack_into(buffer, offset=0) to pack the message into a buffer, and
+# * unpack_from(buffer, offset=0) to unpack fixed part of message
+#   from a buffer at an offset without slicing
+# both returning the offset after the message.
+#
+# view(cls, buffer, offset) gives an instance of a pyopenflow class
+# whose fields are decoded from the buffer at their fixed offsets on
+# first access, so fields that are never read are never decoded.
+#
+# batch(cls, buffer, offset) decodes an array of records of fixed size
+# (e.g., port stats) with a single unpack, giving columns of values
+# without an object per record.
+#
+# @author ykk
+# @date Oct 2011
+#
+import yapc.pyopenflow as pyopenflow
+import inspect
+import struct
+import types
+import collections
+import threading
+import re
+
+##Dictionary of precompiled struct by class name
+structs = {}
+##Dictionary of (format, list of attributes) by class name,
+##where each attribute is (name, kind, format or class, offset)
+layouts = {}
+##Dictionary of class of view by class name
+views = {}
+##Dictionary of (values per record, columns) by class name
+columns = {}
+##Maximum number of structs for batch cached
+MAX_BATCH_STRUCTS = 64
+##Ordered dictionary of struct for batch by (class name, number of records),
+##least recently used first
+batch_structs = collections.OrderedDict()
+##Lock for structs for batch (as events may be decoded by many workers)
+batch_lock = threading.Lock()
+##Dictionary of original methods by class name
+originals = {}
+##Dictionary of reason codec is not installed by class name
+skipped = {}
+##Names of methods installed
+METHODS = ["pack", "unpack", "pack_into", "unpack_from"]
+##Name of module with codecs generated
+MODULE = "yapc.pyopenflow_codec"
+
+##Line packing fixed fields
+PACK_FMT = re.compile(r'^packed \+= struct\.pack\("!(\w+)", (.+)\)$')
+##Line packing nested structure
+PACK_NESTED = re.compile(r'^packed \+= self\.(\w+)\.pack\(\)$')
+##Line packing string
+PACK_STR = re.compile(r"^packed \+= self\.(\w+)\.ljust\((\d+),'\\0'\)$")
+##Line starting variable length tail
+PACK_TAIL = re.compile(r'^for i in self\.(\w+):$')
+##Line packing tail of bytes
+PACK_TAIL_BYTE = 'packed += struct.pack("!B",i)'
+##Line packing tail of structures
+PACK_TAIL_STRUCT = 'packed += i.pack(assertstruct)'
+##Line of condition in sanity check
+ASSERT_COND = re.compile(r'^if ?\((.+)\):$')
+##Token in format
+FMT_TOKEN = re.compile(r'(\d*)(\w)')
+
+class layout:
+    """Layout of pyopenflow class read from its generated methods
+
+    Fields and checks are expressions, with nested structures referred
+    to by aliases.  The source of yapc.pyopenflow is needed.
+
+    @author ykk
+    @date Oct 2011
+    """
+    def __init__(self, cls):
+        """Initialize
+
+        @param cls pyopenflow class
+        """
+        ##Class
+        self.cls = cls
+        ##Format (without byte order)
+        self.fmt = ""
+        ##List of fields
+        self.fields = []
+        ##List of string fields
+        self.strings = []
+        ##List of nested structures (alias, expression)
+        self.nested = []
+        ##List of conditions for sanity check to fail
+        self.checks = []
+        ##Tail of variable length (attribute, is bytes or not)
+        self.tail = None
+        ##List of attributes (name, kind, format or class, offset)
+        self.attrs = []
+        self.__parse(cls, "self")
+
+    def __parse(self, cls, prefix):
+        """Parse pack and sanity check of class
+
+        @param cls class to parse
+        @param prefix expression of structure
+        """
+        self.__parse_assert(cls, prefix)
+        lines = [l.strip() for l in inspect.getsource(cls.pack).split("\n")]
+        lines = lines[lines.index('packed = ""')+1:lines.index("return packed")]
+        while (len(lines) > 0):
+            l = lines.pop(0)
+            m = PACK_FMT.match(l)
+            if (m != None):
+                fields = m.group(2).split(", ")
+                if (len(fields) != len(m.group(1))):
+                    raise ValueError("Cannot parse format of "+cls.__name__)
+                for (f, c) in zip(fields, m.group(1)):
+                    self.__add_attr(prefix, f[5:].split("[")[0],
+                                    ["field", "array"]["[" in f], c)
+                    self.fields.append(prefix+f[4:])
+                    self.fmt += c
+                continue
+            m = PACK_NESTED.match(l)
+            if (m != None):
+                alias = "_n%d" % len(self.nested)
+                nested = getattr(cls(), m.group(1)).__class__
+                self.__add_attr(prefix, m.group(1), "nested", nested)
+                self.nested.append((alias, prefix+"."+m.group(1)))
+                self.__parse(nested, alias)
+                continue
+            m = PACK_STR.match(l)
+            if (m != None):
+                self.__add_attr(prefix, m.group(1), "string", m.group(2)+"s")
+                self.fmt += m.group(2)+"s"
+                self.fields.append(prefix+"."+m.group(1))
+                self.strings.append(prefix+"."+m.group(1))
+                continue
+            m = PACK_TAIL.match(l)
+            if ((m != None) and (prefix == "self") and (len(lines) == 1) and
+                (lines[0] in [PACK_TAIL_BYTE, PACK_TAIL_STRUCT])):
+                self.tail = (m.group(1), (lines.pop(0) == PACK_TAIL_BYTE))
+                self.attrs.append((m.group(1), "tail", None, None))
+                continue
+            raise ValueError("Cannot parse line "+`l`+" of "+cls.__name__)
+
+    def __add_attr(self, prefix, name, kind, fmt):
+        """Add attribute of class (and not nested structure)
+
+        Elements of an array are added to the same attribute.
+
+        @param prefix expression of structure
+        @param name name of attribute
+        @param kind kind of attribute (field, array, string, nested)
+        @param fmt format of attribute (or class if nested)
+        """
+        if (prefix != "self"):
+            return
+        if ((kind == "array") and (len(self.attrs) > 0) and
+            (self.attrs[-1][0] == name)):
+            (name, kind, f, offset) = self.attrs.pop()
+            self.attrs.append((name, kind, f+fmt, offset))
+        else:
+            self.attrs.append((name, kind, fmt, struct.calcsize("!"+self.fmt)))
+
+    def __parse_assert(self, cls, prefix):
+        """Parse sanity check of class
+
+        Membership is checked against dictionary instead of list of
+        its keys.
+
+        @param cls class to parse
+        @param prefix expression of structure
+        """
+        src = inspect.getsource(getattr(cls, "_"+cls.__name__+"__assert"))
+        lines = [l.strip() for l in src.split("\n")]
+        lines = lines[lines.index('"""', 2)+1:lines.index("return (True, None)")]
+        while (len(lines) > 0):
+            m = ASSERT_COND.match(lines.pop(0))
+            if ((m == None) or (len(lines) == 0) or
+                (not lines.pop(0).startswith("return (False,"))):
+                raise ValueError("Cannot parse sanity check of "+cls.__name__)
+            self.checks.append(m.group(1).replace("self.", prefix+".").\
+                                   replace(".keys())", ")"))
+
+def generate(cls):
+    """Generate source of codec for class
+
+    Methods are named by class, e.g., ofp_header_pack, and use the
+    struct named by class, e.g., ofp_header_struct.
+
+    @param cls pyopenflow class
+    @return (layout, list of lines of source)
+    """
+    l = layout(cls)
+    name = cls.__name__
+    s = struct.Struct("!"+l.fmt)
+    fields = ", ".join(l.fields)
+    aliases = ["    %s = %s" % n for n in l.nested]
+
+    src = []
+    src.append("##Struct of %s" % name)
+    src.append("%s_struct = struct.Struct(%s)" % (name, `"!"+l.fmt`))
+    src.append("")
+    src.append("def %s_pack(self, assertstruct=True):" % name)
+    src.extend(aliases)
+    if (len(l.checks) > 0):
+        src.append("    if (assertstruct):")
+        src.append("        if (%s):" % " or ".join(l.checks))
+        src.append("            return None")
+    src.append("    packed = %s_struct.pack(%s)" % (name, fields))
+    if (l.tail != None):
+        (tail, isbytes) = l.tail
+        if (isbytes):
+            src.append("    if (len(self.%s) > 0):" % tail)
+            src.append("        packed += struct.pack('!%%dB' %% "\
+                           "len(self.%s), *self.%s)" % (tail, tail))
+        else:
+            src.append("    for i in self.%s:" % tail)
+            src.append("        packed += i.pack(assertstruct)")
+    src.append("    return packed")
+    src.append("")
+
+    src.append("def %s_pack_into(self, buffer, offset=0):" % name)
+    src.extend(aliases)
+    src.append("    %s_struct.pack_into(buffer, offset, %s)" % (name, fields))
+    src.append("    offset += %d" % s.size)
+    if (l.tail != None):
+        (tail, isbytes) = l.tail
+        if (isbytes):
+            src.append("    struct.pack_into('!%%dB' %% len(self.%s), "\
+                           "buffer, offset, *self.%s)" % (tail, tail))
+            src.append("    offset += len(self.%s)" % tail)
+        else:
+            src.append("    for i in self.%s:" % tail)
+            src.append("        p = i.pack(False)")
+            src.append("        buffer[offset:offset+len(p)] = p")
+            src.append("        offset += len(p)")
+    src.append("    return offset")
+    src.append("")
+
+    for (m, args, check, ret) in \
+            [("unpack", "binaryString", True, "binaryString[%d:]" % s.size),
+             ("unpack_from", "buffer, offset=0", False, "offset+%d" % s.size)]:
+        buf = args.split(",")[0]
+        src.append("def %s_%s(self, %s):" % (name, m, args))
+        if (check):
+            src.append("    if (len(%s) < %d):" % (buf, s.size))
+            src.append("        return %s" % buf)
+        src.extend(aliases)
+        src.append("    (%s,) = %s_struct.unpack_from(%s%s)" % \
+                       (fields, name, buf, ["", ", offset"][not check]))
+        for f in l.strings:
+            src.append("    %s = %s[:%s.find('\\0')]" % (f, f, f))
+        src.append("    return %s" % ret)
+        src.append("")
+    return (l, src)
+
+def write(filename):
+    """Generate codecs of pyopenflow classes into module
+    (to be saved as yapc/pyopenflow_codec.py)
+
+    Classes whose layout cannot be read are left out.
+
+    @param filename name of file to write module to
+    @return dictionary of reason class is left out by class name
+    """
+    uninstall()
+    left = {}
+    src = ["##Codecs of yapc.pyopenflow",
+           "#",
+           "# Automatically generated by yapc.ofcodec.write (do not edit).",
+           "# Regenerate whenever yapc.pyopenflow is regenerated.",
+           "#",
+           "import struct",
+           "from yapc.pyopenflow import *",
+           ""]
+    codecs = []
+    for (name, cls) in sorted(vars(pyopenflow).items()):
+        if ((not isinstance(cls, types.ClassType)) or
+            (not hasattr(cls, "pack"))):
+            continue
+        try:
+            (l, s) = generate(cls)
+        except (ValueError, IOError, TypeError, NameError, struct.error), e:
+            left[name] = str(e)
+            continue
+        src.extend(s)
+        codecs.append((name, l))
+
+    src.append("##Dictionary of (format, attributes, methods) by class name")
+    src.append("CODECS = {")
+    for (name, l) in codecs:
+        attrs = []
+        for (n, kind, fmt, offset) in l.attrs:
+            if (kind == "nested"):
+                fmt = fmt.__name__
+            else:
+                fmt = `fmt`
+            attrs.append("(%s, %s, %s, %s)" % (`n`, `kind`, fmt, offset))
+        methods = ", ".join(["%s: %s_%s" % (`m`, name, m) for m in METHODS])
+        src.append("    %s: (%s," % (`name`, `l.fmt`))
+        src.append("        [%s]," % (",\n         ".join(attrs)))
+        src.append("        {%s})," % methods)
+    src.append("    }")
+
+    f = open(filename, "w")
+    f.write("\n".join(src)+"\n")
+    f.close()
+    install()
+    return left
+
+def get_decoder(attrs):
+    """Get __getattr__ that decodes attributes of view on first access
+
+    @param attrs list of attributes (name, kind, format or class, offset)
+    @return function
+    """
+    decoders = {}
+    for (name, kind, fmt, offset) in attrs:
+        if (kind == "nested"):
+            decoders[name] = (kind, fmt, offset)
+        elif (kind != "tail"):
+            decoders[name] = (kind, struct.Struct("!"+fmt), offset)
+        else:
+            decoders[name] = (kind, None, None)
+
+    def __getattr__(self, name):
+        """Decode attribute of view from buffer
+
+        @param name name of attribute
+        """
+        try:
+            (buf, off) = self.__dict__["_view"]
+            (kind, s, offset) = decoders[name]
+        except KeyError:
+            raise AttributeError(name)
+        if (kind == "field"):
+            value = s.unpack_from(buf, off+offset)[0]
+        elif (kind == "array"):
+            value = list(s.unpack_from(buf, off+offset))
+        elif (kind == "string"):
+            value = s.unpack_from(buf, off+offset)[0]
+            value = value[:value.find("\0")]
+        elif (kind == "nested"):
+            value = view(s, buf, off+offset)
+        else:
+            value = []
+        self.__dict__[name] = value
+        return value
+    return __getattr__
+
+def get_bytes(buffer, offset=0):
+    """Get binary string of buffer from offset
+
+    @param buffer buffer (string, bytearray or memoryview)
+    @param offset offset in buffer
+    @return binary string
+    """
+    if (isinstance(buffer, memoryview)):
+        return buffer[offset:].tobytes()
+    return str(buffer[offset:])
+
+def view(cls, buffer, offset=0):
+    """Get view of message in buffer
+
+    The view is an instance of (a subclass of the same name of) the
+    class, with each attribute decoded from the buffer when first
+    accessed (and set thereafter).  Tails of variable length are not 
+    decoded, as with unpack.  If buffer is too short, the instance
+    returned has default values.  Classes without codec are unpacked
+    by their generated unpack instead.
+
+    @param cls pyopenflow class
+    @param buffer buffer with message (which must not be modified)
+    @param offset offset of message in buffer
+    @return instance of class
+    """
+    s = structs.get(cls.__name__)
+    if (s == None):
+        obj = cls()
+        obj.unpack(get_bytes(buffer, offset))
+        return obj
+    if (len(buffer) - offset < s.size):
+        return cls()
+    return types.InstanceType(views[cls.__name__], {"_view": (buffer, offset)})
+
+def get_columns(cls):
+    """Get index of attributes in values unpacked for a record
+
+    Nested structures and tails are not included.
+
+    @param cls pyopenflow class (with codec installed)
+    @return (number of values per record,
+             dictionary of (kind, index, number of values) by attribute)
+    """
+    try:
+        return columns[cls.__name__]
+    except KeyError:
+        pass
+
+    (fmt, attrs) = layouts[cls.__name__]
+    #Index of value at each offset
+    index = {}
+    values = 0
+    f = "!"
+    for (n, c) in FMT_TOKEN.findall(fmt):
+        if (c in "sp"):
+            index[struct.calcsize(f)] = values
+            values += 1
+        elif (c != "x"):
+            for i in range(0, int(n or "1")):
+                index[struct.calcsize(f+c*i)] = values+i
+            values += int(n or "1")
+        f += n+c
+
+    cols = {}
+    for (name, kind, f, offset) in attrs:
+        if (kind in ["field", "string"]):
+            cols[name] = (kind, index[offset], 1)
+        elif (kind == "array"):
+            cols[name] = (kind, index[offset], len(f))
+    columns[cls.__name__] = (values, cols)
+    return columns[cls.__name__]
+
+def get_batch_struct(cls, count):
+    """Get struct to unpack records of class in a single pass
+
+    Structs are cached for the most recently used numbers of records
+    (up to MAX_BATCH_STRUCTS), so replies of distinct lengths do not
+    each keep a struct.
+
+    @param cls pyopenflow class of record (with codec installed)
+    @param count number of records
+    @return struct
+    """
+    key = (cls.__name__, count)
+    batch_lock.acquire()
+    s = batch_structs.pop(key, None)
+    if (s == None):
+        s = struct.Struct("!"+layouts[cls.__name__][0]*count)
+        if (len(batch_structs) >= MAX_BATCH_STRUCTS):
+            batch_structs.popitem(False)
+    batch_structs[key] = s
+    batch_lock.release()
+    return s
+
+class batch:
+    """Batch of records of fixed size decoded in a single pass
+
+    Values of all records are unpacked with one struct into a flat 
+    tuple (record after record), so columns are slices of the tuple 
+    and records are formed (as views) only when indexed.  Records of
+    classes without codec are unpacked one by one instead.
+
+    @author ykk
+    @date Oct 2011
+    """
+    def __init__(self, cls, buffer, offset=0, count=None):
+        """Initialize
+
+        @param cls pyopenflow class of record
+        @param buffer buffer with records (which must not be modified)
+        @param offset offset of first record in buffer
+        @param count number of records (default is as many as in buffer)
+        """
+        ##Class of records
+        self.cls = cls
+        ##Buffer with records
+        self.buffer = buffer
+        ##Offset of records
+        self.offset = offset
+        s = structs.get(cls.__name__)
+        ##Size of each record
+        if (s != None):
+            self.size = s.size
+        else:
+            self.size = len(cls())
+        ##Number of records
+        self.count = max(0, (len(buffer)-offset)/self.size)
+        if ((count != None) and (count < self.count)):
+            self.count = count
+        ##Number of values per record
+        self.width = None
+        ##Dictionary of (kind, index, number of values) by attribute
+        self.columns = None
+        ##Values of records (record after record)
+        self.values = ()
+        ##Records unpacked one by one (if class has no codec)
+        self.records = None
+        if (s == None):
+            self.records = [view(cls, buffer, offset+i*self.size)
+                            for i in range(0, self.count)]
+            return
+        (self.width, self.columns) = get_columns(cls)
+        if (self.count > 0):
+            self.values = get_batch_struct(cls, self.count).\
+                unpack_from(buffer, offset)
+
+    def __len__(self):
+        """Get number of records
+
+        @return number of records
+        """
+        return self.count
+
+    def __getitem__(self, i):
+        """Get record
+
+        @param i index of record
+        @return record as view
+        """
+        if (i < 0):
+            i += self.count
+        if ((i < 0) or (i >= self.count)):
+            raise IndexError(i)
+        if (self.records != None):
+            return self.records[i]
+        return view(self.cls, self.buffer, self.offset+i*self.size)
+
+    def __iter__(self):
+        """Iterate over records
+
+        @return generator of records as views
+        """
+        for i in range(0, self.count):
+            yield self[i]
+
+    def column(self, name):
+        """Get values of attribute for all records
+
+        @param name name of attribute
+        @return list of values (in order of records)
+        """
+        if (self.records != None):
+            return [getattr(r, name) for r in self.records]
+        (kind, index, n) = self.columns[name]
+        if (kind == "string"):
+            return [v.split("\0", 1)[0]
+                    for v in self.values[index::self.width]]
+        elif (kind == "array"):
+            return [list(self.values[i:i+n])
+                    for i in range(index, len(self.values), self.width)]
+        return list(self.values[index::self.width])
+
+def install():
+    """Install codecs generated in pyopenflow classes
+
+    Classes without codec are left as generated by pylibopenflow.
+    """
+    if (len(originals) > 0):
+        return
+    try:
+        codecs = __import__(MODULE, fromlist=["CODECS"]).CODECS
+    except ImportError, e:
+        codecs = {}
+        skipped[None] = str(e)
+
+    for (name, cls) in vars(pyopenflow).items():
+        if ((not isinstance(cls, types.ClassType)) or
+            (not hasattr(cls, "pack"))):
+            continue
+        if (name not in codecs):
+            skipped[name] = "No codec generated"
+            continue
+        (fmt, attrs, methods) = codecs[name]
+        originals[name] = dict([(m, cls.__dict__.get(m)) for m in METHODS])
+        for (m, f) in methods.items():
+            setattr(cls, m, f)
+        structs[name] = struct.Struct("!"+fmt)
+        layouts[name] = (fmt, attrs)
+        views[name] = types.ClassType(name, (cls,),
+                                      {"__getattr__": get_decoder(attrs),
+                                       "__module__": cls.__module__})
+
+def uninstall():
+    """Restore methods generated by pyopenflow
+    """
+    for (name, methods) in originals.items():
+        cls = getattr(pyopenflow, name)
+        for (m, f) in methods.items():
+            if (f == None):
+                delattr(cls, m)
+            else:
+                setattr(cls, m, f)
+    originals.clear()
+    structs.clear()
+    layouts.clear()
+    views.clear()
+    columns.clear()
+    batch_structs.clear()
+    skipped.clear()
+
+install()
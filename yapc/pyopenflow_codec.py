@@ -0,0 +1,1484 @@
+##Codecs of yapc.pyopenflow
+#
+# Automatically generated by yapc.ofcodec.write (do not edit).
+# Regenerate whenever yapc.pyopenflow is regenerated.
+#
+import struct
+from yapc.pyopenflow import *
+
+##Struct of ofp_action_dl_addr
+ofp_action_dl_addr_struct = struct.Struct('!HHBBBBBBBBBBBB')
+
+def ofp_action_dl_addr_pack(self, assertstruct=True):
+    if (assertstruct):
+        if (not isinstance(self.dl_addr, list) or len(self.dl_addr) != 6 or not isinstance(self.pad, list) or len(self.pad) != 6):
+            return None
+    packed = ofp_action_dl_addr_struct.pack(self.type, self.len, self.dl_addr[0], self.dl_addr[1], self.dl_addr[2], self.dl_addr[3], self.dl_addr[4], self.dl_addr[5], self.pad[0], self.pad[1], self.pad[2], self.pad[3], self.pad[4], self.pad[5])
+    return packed
+
+def ofp_action_dl_addr_pack_into(self, buffer, offset=0):
+    ofp_action_dl_addr_struct.pack_into(buffer, offset, self.type, self.len, self.dl_addr[0], self.dl_addr[1], self.dl_addr[2], self.dl_addr[3], self.dl_addr[4], self.dl_addr[5], self.pad[0], self.pad[1], self.pad[2], self.pad[3], self.pad[4], self.pad[5])
+    offset += 16
+    return offset
+
+def ofp_action_dl_addr_unpack(self, binaryString):
+    if (len(binaryString) < 16):
+        return binaryString
+    (self.type, self.len, self.dl_addr[0], self.dl_addr[1], self.dl_addr[2], self.dl_addr[3], self.dl_addr[4], self.dl_addr[5], self.pad[0], self.pad[1], self.pad[2], self.pad[3], self.pad[4], self.pad[5],) = ofp_action_dl_addr_struct.unpack_from(binaryString)
+    return binaryString[16:]
+
+def ofp_action_dl_addr_unpack_from(self, buffer, offset=0):
+    (self.type, self.len, self.dl_addr[0], self.dl_addr[1], self.dl_addr[2], self.dl_addr[3], self.dl_addr[4], self.dl_addr[5], self.pad[0], self.pad[1], self.pad[2], self.pad[3], self.pad[4], self.pad[5],) = ofp_action_dl_addr_struct.unpack_from(buffer, offset)
+    return offset+16
+
+##Struct of ofp_action_enqueue
+ofp_action_enqueue_struct = struct.Struct('!HHHBBBBBBL')
+
+def ofp_action_enqueue_pack(self, assertstruct=True):
+    if (assertstruct):
+        if (not isinstance(self.pad, list) or len(self.pad) != 6):
+            return None
+    packed = ofp_action_enqueue_struct.pack(self.type, self.len, self.port, self.pad[0], self.pad[1], self.pad[2], self.pad[3], self.pad[4], self.pad[5], self.queue_id)
+    return packed
+
+def ofp_action_enqueue_pack_into(self, buffer, offset=0):
+    ofp_action_enqueue_struct.pack_into(buffer, offset, self.type, self.len, self.port, self.pad[0], self.pad[1], self.pad[2], self.pad[3], self.pad[4], self.pad[5], self.queue_id)
+    offset += 16
+    return offset
+
+def ofp_action_enqueue_unpack(self, binaryString):
+    if (len(binaryString) < 16):
+        return binaryString
+    (self.type, self.len, self.port, self.pad[0], self.pad[1], self.pad[2], self.pad[3], self.pad[4], self.pad[5], self.queue_id,) = ofp_action_enqueue_struct.unpack_from(binaryString)
+    return binaryString[16:]
+
+def ofp_action_enqueue_unpack_from(self, buffer, offset=0):
+    (self.type, self.len, self.port, self.pad[0], self.pad[1], self.pad[2], self.pad[3], self.pad[4], self.pad[5], self.queue_id,) = ofp_action_enqueue_struct.unpack_from(buffer, offset)
+    return offset+16
+
+##Struct of ofp_action_header
+ofp_action_header_struct = struct.Struct('!HHBBBB')
+
+def ofp_action_header_pack(self, assertstruct=True):
+    if (assertstruct):
+        if (not isinstance(self.pad, list) or len(self.pad) != 4):
+            return None
+    packed = ofp_action_header_struct.pack(self.type, self.len, self.pad[0], self.pad[1], self.pad[2], self.pad[3])
+    return packed
+
+def ofp_action_header_pack_into(self, buffer, offset=0):
+    ofp_action_header_struct.pack_into(buffer, offset, self.type, self.len, self.pad[0], self.pad[1], self.pad[2], self.pad[3])
+    offset += 8
+    return offset
+
+def ofp_action_header_unpack(self, binaryString):
+    if (len(binaryString) < 8):
+        return binaryString
+    (self.type, self.len, self.pad[0], self.pad[1], self.pad[2], self.pad[3],) = ofp_action_header_struct.unpack_from(binaryString)
+    return binaryString[8:]
+
+def ofp_action_header_unpack_from(self, buffer, offset=0):
+    (self.type, self.len, self.pad[0], self.pad[1], self.pad[2], self.pad[3],) = ofp_action_header_struct.unpack_from(buffer, offset)
+    return offset+8
+
+##Struct of ofp_action_nw_addr
+ofp_action_nw_addr_struct = struct.Struct('!HHL')
+
+def ofp_action_nw_addr_pack(self, assertstruct=True):
+    packed = ofp_action_nw_addr_struct.pack(self.type, self.len, self.nw_addr)
+    return packed
+
+def ofp_action_nw_addr_pack_into(self, buffer, offset=0):
+    ofp_action_nw_addr_struct.pack_into(buffer, offset, self.type, self.len, self.nw_addr)
+    offset += 8
+    return offset
+
+def ofp_action_nw_addr_unpack(self, binaryString):
+    if (len(binaryString) < 8):
+        return binaryString
+    (self.type, self.len, self.nw_addr,) = ofp_action_nw_addr_struct.unpack_from(binaryString)
+    return binaryString[8:]
+
+def ofp_action_nw_addr_unpack_from(self, buffer, offset=0):
+    (self.type, self.len, self.nw_addr,) = ofp_action_nw_addr_struct.unpack_from(buffer, offset)
+    return offset+8
+
+##Struct of ofp_action_nw_tos
+ofp_action_nw_tos_struct = struct.Struct('!HHBBBB')
+
+def ofp_action_nw_tos_pack(self, assertstruct=True):
+    if (assertstruct):
+        if (not isinstance(self.pad, list) or len(self.pad) != 3):
+            return None
+    packed = ofp_action_nw_tos_struct.pack(self.type, self.len, self.nw_tos, self.pad[0], self.pad[1], self.pad[2])
+    return packed
+
+def ofp_action_nw_tos_pack_into(self, buffer, offset=0):
+    ofp_action_nw_tos_struct.pack_into(buffer, offset, self.type, self.len, self.nw_tos, self.pad[0], self.pad[1], self.pad[2])
+    offset += 8
+    return offset
+
+def ofp_action_nw_tos_unpack(self, binaryString):
+    if (len(binaryString) < 8):
+        return binaryString
+    (self.type, self.len, self.nw_tos, self.pad[0], self.pad[1], self.pad[2],) = ofp_action_nw_tos_struct.unpack_from(binaryString)
+    return binaryString[8:]
+
+def ofp_action_nw_tos_unpack_from(self, buffer, offset=0):
+    (self.type, self.len, self.nw_tos, self.pad[0], self.pad[1], self.pad[2],) = ofp_action_nw_tos_struct.unpack_from(buffer, offset)
+    return offset+8
+
+##Struct of ofp_action_output
+ofp_action_output_struct = struct.Struct('!HHHH')
+
+def ofp_action_output_pack(self, assertstruct=True):
+    packed = ofp_action_output_struct.pack(self.type, self.len, self.port, self.max_len)
+    return packed
+
+def ofp_action_output_pack_into(self, buffer, offset=0):
+    ofp_action_output_struct.pack_into(buffer, offset, self.type, self.len, self.port, self.max_len)
+    offset += 8
+    return offset
+
+def ofp_action_output_unpack(self, binaryString):
+    if (len(binaryString) < 8):
+        return binaryString
+    (self.type, self.len, self.port, self.max_len,) = ofp_action_output_struct.unpack_from(binaryString)
+    return binaryString[8:]
+
+def ofp_action_output_unpack_from(self, buffer, offset=0):
+    (self.type, self.len, self.port, self.max_len,) = ofp_action_output_struct.unpack_from(buffer, offset)
+    return offset+8
+
+##Struct of ofp_action_tp_port
+ofp_action_tp_port_struct = struct.Struct('!HHHBB')
+
+def ofp_action_tp_port_pack(self, assertstruct=True):
+    if (assertstruct):
+        if (not isinstance(self.pad, list) or len(self.pad) != 2):
+            return None
+    packed = ofp_action_tp_port_struct.pack(self.type, self.len, self.tp_port, self.pad[0], self.pad[1])
+    return packed
+
+def ofp_action_tp_port_pack_into(self, buffer, offset=0):
+    ofp_action_tp_port_struct.pack_into(buffer, offset, self.type, self.len, self.tp_port, self.pad[0], self.pad[1])
+    offset += 8
+    return offset
+
+def ofp_action_tp_port_unpack(self, binaryString):
+    if (len(binaryString) < 8):
+        return binaryString
+    (self.type, self.len, self.tp_port, self.pad[0], self.pad[1],) = ofp_action_tp_port_struct.unpack_from(binaryString)
+    return binaryString[8:]
+
+def ofp_action_tp_port_unpack_from(self, buffer, offset=0):
+    (self.type, self.len, self.tp_port, self.pad[0], self.pad[1],) = ofp_action_tp_port_struct.unpack_from(buffer, offset)
+    return offset+8
+
+##Struct of ofp_action_vendor_header
+ofp_action_vendor_header_struct = struct.Struct('!HHL')
+
+def ofp_action_vendor_header_pack(self, assertstruct=True):
+    packed = ofp_action_vendor_header_struct.pack(self.type, self.len, self.vendor)
+    return packed
+
+def ofp_action_vendor_header_pack_into(self, buffer, offset=0):
+    ofp_action_vendor_header_struct.pack_into(buffer, offset, self.type, self.len, self.vendor)
+    offset += 8
+    return offset
+
+def ofp_action_vendor_header_unpack(self, binaryString):
+    if (len(binaryString) < 8):
+        return binaryString
+    (self.type, self.len, self.vendor,) = ofp_action_vendor_header_struct.unpack_from(binaryString)
+    return binaryString[8:]
+
+def ofp_action_vendor_header_unpack_from(self, buffer, offset=0):
+    (self.type, self.len, self.vendor,) = ofp_action_vendor_header_struct.unpack_from(buffer, offset)
+    return offset+8
+
+##Struct of ofp_action_vlan_pcp
+ofp_action_vlan_pcp_struct = struct.Struct('!HHBBBB')
+
+def ofp_action_vlan_pcp_pack(self, assertstruct=True):
+    if (assertstruct):
+        if (not isinstance(self.pad, list) or len(self.pad) != 3):
+            return None
+    packed = ofp_action_vlan_pcp_struct.pack(self.type, self.len, self.vlan_pcp, self.pad[0], self.pad[1], self.pad[2])
+    return packed
+
+def ofp_action_vlan_pcp_pack_into(self, buffer, offset=0):
+    ofp_action_vlan_pcp_struct.pack_into(buffer, offset, self.type, self.len, self.vlan_pcp, self.pad[0], self.pad[1], self.pad[2])
+    offset += 8
+    return offset
+
+def ofp_action_vlan_pcp_unpack(self, binaryString):
+    if (len(binaryString) < 8):
+        return binaryString
+    (self.type, self.len, self.vlan_pcp, self.pad[0], self.pad[1], self.pad[2],) = ofp_action_vlan_pcp_struct.unpack_from(binaryString)
+    return binaryString[8:]
+
+def ofp_action_vlan_pcp_unpack_from(self, buffer, offset=0):
+    (self.type, self.len, self.vlan_pcp, self.pad[0], self.pad[1], self.pad[2],) = ofp_action_vlan_pcp_struct.unpack_from(buffer, offset)
+    return offset+8
+
+##Struct of ofp_action_vlan_vid
+ofp_action_vlan_vid_struct = struct.Struct('!HHHBB')
+
+def ofp_action_vlan_vid_pack(self, assertstruct=True):
+    if (assertstruct):
+        if (not isinstance(self.pad, list) or len(self.pad) != 2):
+            return None
+    packed = ofp_action_vlan_vid_struct.pack(self.type, self.len, self.vlan_vid, self.pad[0], self.pad[1])
+    return packed
+
+def ofp_action_vlan_vid_pack_into(self, buffer, offset=0):
+    ofp_action_vlan_vid_struct.pack_into(buffer, offset, self.type, self.len, self.vlan_vid, self.pad[0], self.pad[1])
+    offset += 8
+    return offset
+
+def ofp_action_vlan_vid_unpack(self, binaryString):
+    if (len(binaryString) < 8):
+        return binaryString
+    (self.type, self.len, self.vlan_vid, self.pad[0], self.pad[1],) = ofp_action_vlan_vid_struct.unpack_from(binaryString)
+    return binaryString[8:]
+
+def ofp_action_vlan_vid_unpack_from(self, buffer, offset=0):
+    (self.type, self.len, self.vlan_vid, self.pad[0], self.pad[1],) = ofp_action_vlan_vid_struct.unpack_from(buffer, offset)
+    return offset+8
+
+##Struct of ofp_aggregate_stats_reply
+ofp_aggregate_stats_reply_struct = struct.Struct('!QQLBBBB')
+
+def ofp_aggregate_stats_reply_pack(self, assertstruct=True):
+    if (assertstruct):
+        if (not isinstance(self.pad, list) or len(self.pad) != 4):
+            return None
+    packed = ofp_aggregate_stats_reply_struct.pack(self.packet_count, self.byte_count, self.flow_count, self.pad[0], self.pad[1], self.pad[2], self.pad[3])
+    return packed
+
+def ofp_aggregate_stats_reply_pack_into(self, buffer, offset=0):
+    ofp_aggregate_stats_reply_struct.pack_into(buffer, offset, self.packet_count, self.byte_count, self.flow_count, self.pad[0], self.pad[1], self.pad[2], self.pad[3])
+    offset += 24
+    return offset
+
+def ofp_aggregate_stats_reply_unpack(self, binaryString):
+    if (len(binaryString) < 24):
+        return binaryString
+    (self.packet_count, self.byte_count, self.flow_count, self.pad[0], self.pad[1], self.pad[2], self.pad[3],) = ofp_aggregate_stats_reply_struct.unpack_from(binaryString)
+    return binaryString[24:]
+
+def ofp_aggregate_stats_reply_unpack_from(self, buffer, offset=0):
+    (self.packet_count, self.byte_count, self.flow_count, self.pad[0], self.pad[1], self.pad[2], self.pad[3],) = ofp_aggregate_stats_reply_struct.unpack_from(buffer, offset)
+    return offset+24
+
+##Struct of ofp_aggregate_stats_request
+ofp_aggregate_stats_request_struct = struct.Struct('!LHBBBBBBBBBBBBHBBHBBBBLLHHBBH')
+
+def ofp_aggregate_stats_request_pack(self, assertstruct=True):
+    _n0 = self.match
+    if (assertstruct):
+        if (not isinstance(self.match, ofp_match) or not isinstance(_n0.dl_src, list) or len(_n0.dl_src) != 6 or not isinstance(_n0.dl_dst, list) or len(_n0.dl_dst) != 6 or not isinstance(_n0.pad2, list) or len(_n0.pad2) != 2):
+            return None
+    packed = ofp_aggregate_stats_request_struct.pack(_n0.wildcards, _n0.in_port, _n0.dl_src[0], _n0.dl_src[1], _n0.dl_src[2], _n0.dl_src[3], _n0.dl_src[4], _n0.dl_src[5], _n0.dl_dst[0], _n0.dl_dst[1], _n0.dl_dst[2], _n0.dl_dst[3], _n0.dl_dst[4], _n0.dl_dst[5], _n0.dl_vlan, _n0.dl_vlan_pcp, _n0.pad1, _n0.dl_type, _n0.nw_tos, _n0.nw_proto, _n0.pad2[0], _n0.pad2[1], _n0.nw_src, _n0.nw_dst, _n0.tp_src, _n0.tp_dst, self.table_id, self.pad, self.out_port)
+    return packed
+
+def ofp_aggregate_stats_request_pack_into(self, buffer, offset=0):
+    _n0 = self.match
+    ofp_aggregate_stats_request_struct.pack_into(buffer, offset, _n0.wildcards, _n0.in_port, _n0.dl_src[0], _n0.dl_src[1], _n0.dl_src[2], _n0.dl_src[3], _n0.dl_src[4], _n0.dl_src[5], _n0.dl_dst[0], _n0.dl_dst[1], _n0.dl_dst[2], _n0.dl_dst[3], _n0.dl_dst[4], _n0.dl_dst[5], _n0.dl_vlan, _n0.dl_vlan_pcp, _n0.pad1, _n0.dl_type, _n0.nw_tos, _n0.nw_proto, _n0.pad2[0], _n0.pad2[1], _n0.nw_src, _n0.nw_dst, _n0.tp_src, _n0.tp_dst, self.table_id, self.pad, self.out_port)
+    offset += 44
+    return offset
+
+def ofp_aggregate_stats_request_unpack(self, binaryString):
+    if (len(binaryString) < 44):
+        return binaryString
+    _n0 = self.match
+    (_n0.wildcards, _n0.in_port, _n0.dl_src[0], _n0.dl_src[1], _n0.dl_src[2], _n0.dl_src[3], _n0.dl_src[4], _n0.dl_src[5], _n0.dl_dst[0], _n0.dl_dst[1], _n0.dl_dst[2], _n0.dl_dst[3], _n0.dl_dst[4], _n0.dl_dst[5], _n0.dl_vlan, _n0.dl_vlan_pcp, _n0.pad1, _n0.dl_type, _n0.nw_tos, _n0.nw_proto, _n0.pad2[0], _n0.pad2[1], _n0.nw_src, _n0.nw_dst, _n0.tp_src, _n0.tp_dst, self.table_id, self.pad, self.out_port,) = ofp_aggregate_stats_request_struct.unpack_from(binaryString)
+    return binaryString[44:]
+
+def ofp_aggregate_stats_request_unpack_from(self, buffer, offset=0):
+    _n0 = self.match
+    (_n0.wildcards, _n0.in_port, _n0.dl_src[0], _n0.dl_src[1], _n0.dl_src[2], _n0.dl_src[3], _n0.dl_src[4], _n0.dl_src[5], _n0.dl_dst[0], _n0.dl_dst[1], _n0.dl_dst[2], _n0.dl_dst[3], _n0.dl_dst[4], _n0.dl_dst[5], _n0.dl_vlan, _n0.dl_vlan_pcp, _n0.pad1, _n0.dl_type, _n0.nw_tos, _n0.nw_proto, _n0.pad2[0], _n0.pad2[1], _n0.nw_src, _n0.nw_dst, _n0.tp_src, _n0.tp_dst, self.table_id, self.pad, self.out_port,) = ofp_aggregate_stats_request_struct.unpack_from(buffer, offset)
+    return offset+44
+
+##Struct of ofp_desc_stats
+ofp_desc_stats_struct = struct.Struct('!256s256s256s32s256s')
+
+def ofp_desc_stats_pack(self, assertstruct=True):
+    if (assertstruct):
+        if (not isinstance(self.mfr_desc, str) or len(self.mfr_desc) > 256 or not isinstance(self.hw_desc, str) or len(self.hw_desc) > 256 or not isinstance(self.sw_desc, str) or len(self.sw_desc) > 256 or not isinstance(self.serial_num, str) or len(self.serial_num) > 32 or not isinstance(self.dp_desc, str) or len(self.dp_desc) > 256):
+            return None
+    packed = ofp_desc_stats_struct.pack(self.mfr_desc, self.hw_desc, self.sw_desc, self.serial_num, self.dp_desc)
+    return packed
+
+def ofp_desc_stats_pack_into(self, buffer, offset=0):
+    ofp_desc_stats_struct.pack_into(buffer, offset, self.mfr_desc, self.hw_desc, self.sw_desc, self.serial_num, self.dp_desc)
+    offset += 1056
+    return offset
+
+def ofp_desc_stats_unpack(self, binaryString):
+    if (len(binaryString) < 1056):
+        return binaryString
+    (self.mfr_desc, self.hw_desc, self.sw_desc, self.serial_num, self.dp_desc,) = ofp_desc_stats_struct.unpack_from(binaryString)
+    self.mfr_desc = self.mfr_desc[:self.mfr_desc.find('\0')]
+    self.hw_desc = self.hw_desc[:self.hw_desc.find('\0')]
+    self.sw_desc = self.sw_desc[:self.sw_desc.find('\0')]
+    self.serial_num = self.serial_num[:self.serial_num.find('\0')]
+    self.dp_desc = self.dp_desc[:self.dp_desc.find('\0')]
+    return binaryString[1056:]
+
+def ofp_desc_stats_unpack_from(self, buffer, offset=0):
+    (self.mfr_desc, self.hw_desc, self.sw_desc, self.serial_num, self.dp_desc,) = ofp_desc_stats_struct.unpack_from(buffer, offset)
+    self.mfr_desc = self.mfr_desc[:self.mfr_desc.find('\0')]
+    self.hw_desc = self.hw_desc[:self.hw_desc.find('\0')]
+    self.sw_desc = self.sw_desc[:self.sw_desc.find('\0')]
+    self.serial_num = self.serial_num[:self.serial_num.find('\0')]
+    self.dp_desc = self.dp_desc[:self.dp_desc.find('\0')]
+    return offset+1056
+
+##Struct of ofp_error_msg
+ofp_error_msg_struct = struct.Struct('!BBHLHH')
+
+def ofp_error_msg_pack(self, assertstruct=True):
+    _n0 = self.header
+    if (assertstruct):
+        if (not isinstance(self.header, ofp_header) or not (_n0.type in ofp_type_map)):
+            return None
+    packed = ofp_error_msg_struct.pack(_n0.version, _n0.type, _n0.length, _n0.xid, self.type, self.code)
+    if (len(self.data) > 0):
+        packed += struct.pack('!%dB' % len(self.data), *self.data)
+    return packed
+
+def ofp_error_msg_pack_into(self, buffer, offset=0):
+    _n0 = self.header
+    ofp_error_msg_struct.pack_into(buffer, offset, _n0.version, _n0.type, _n0.length, _n0.xid, self.type, self.code)
+    offset += 12
+    struct.pack_into('!%dB' % len(self.data), buffer, offset, *self.data)
+    offset += len(self.data)
+    return offset
+
+def ofp_error_msg_unpack(self, binaryString):
+    if (len(binaryString) < 12):
+        return binaryString
+    _n0 = self.header
+    (_n0.version, _n0.type, _n0.length, _n0.xid, self.type, self.code,) = ofp_error_msg_struct.unpack_from(binaryString)
+    return binaryString[12:]
+
+def ofp_error_msg_unpack_from(self, buffer, offset=0):
+    _n0 = self.header
+    (_n0.version, _n0.type, _n0.length, _n0.xid, self.type, self.code,) = ofp_error_msg_struct.unpack_from(buffer, offset)
+    return offset+12
+
+##Struct of ofp_flow_mod
+ofp_flow_mod_struct = struct.Struct('!BBHLLHBBBBBBBBBBBBHBBHBBBBLLHHQHHHHLHH')
+
+def ofp_flow_mod_pack(self, assertstruct=True):
+    _n0 = self.header
+    _n1 = self.match
+    if (assertstruct):
+        if (not isinstance(self.header, ofp_header) or not isinstance(self.match, ofp_match) or not (_n0.type in ofp_type_map) or not isinstance(_n1.dl_src, list) or len(_n1.dl_src) != 6 or not isinstance(_n1.dl_dst, list) or len(_n1.dl_dst) != 6 or not isinstance(_n1.pad2, list) or len(_n1.pad2) != 2):
+            return None
+    packed = ofp_flow_mod_struct.pack(_n0.version, _n0.type, _n0.length, _n0.xid, _n1.wildcards, _n1.in_port, _n1.dl_src[0], _n1.dl_src[1], _n1.dl_src[2], _n1.dl_src[3], _n1.dl_src[4], _n1.dl_src[5], _n1.dl_dst[0], _n1.dl_dst[1], _n1.dl_dst[2], _n1.dl_dst[3], _n1.dl_dst[4], _n1.dl_dst[5], _n1.dl_vlan, _n1.dl_vlan_pcp, _n1.pad1, _n1.dl_type, _n1.nw_tos, _n1.nw_proto, _n1.pad2[0], _n1.pad2[1], _n1.nw_src, _n1.nw_dst, _n1.tp_src, _n1.tp_dst, self.cookie, self.command, self.idle_timeout, self.hard_timeout, self.priority, self.buffer_id, self.out_port, self.flags)
+    for i in self.actions:
+        packed += i.pack(assertstruct)
+    return packed
+
+def ofp_flow_mod_pack_into(self, buffer, offset=0):
+    _n0 = self.header
+    _n1 = self.match
+    ofp_flow_mod_struct.pack_into(buffer, offset, _n0.version, _n0.type, _n0.length, _n0.xid, _n1.wildcards, _n1.in_port, _n1.dl_src[0], _n1.dl_src[1], _n1.dl_src[2], _n1.dl_src[3], _n1.dl_src[4], _n1.dl_src[5], _n1.dl_dst[0], _n1.dl_dst[1], _n1.dl_dst[2], _n1.dl_dst[3], _n1.dl_dst[4], _n1.dl_dst[5], _n1.dl_vlan, _n1.dl_vlan_pcp, _n1.pad1, _n1.dl_type, _n1.nw_tos, _n1.nw_proto, _n1.pad2[0], _n1.pad2[1], _n1.nw_src, _n1.nw_dst, _n1.tp_src, _n1.tp_dst, self.cookie, self.command, self.idle_timeout, self.hard_timeout, self.priority, self.buffer_id, self.out_port, self.flags)
+    offset += 72
+    for i in self.actions:
+        p = i.pack(False)
+        buffer[offset:offset+len(p)] = p
+        offset += len(p)
+    return offset
+
+def ofp_flow_mod_unpack(self, binaryString):
+    if (len(binaryString) < 72):
+        return binaryString
+    _n0 = self.header
+    _n1 = self.match
+    (_n0.version, _n0.type, _n0.length, _n0.xid, _n1.wildcards, _n1.in_port, _n1.dl_src[0], _n1.dl_src[1], _n1.dl_src[2], _n1.dl_src[3], _n1.dl_src[4], _n1.dl_src[5], _n1.dl_dst[0], _n1.dl_dst[1], _n1.dl_dst[2], _n1.dl_dst[3], _n1.dl_dst[4], _n1.dl_dst[5], _n1.dl_vlan, _n1.dl_vlan_pcp, _n1.pad1, _n1.dl_type, _n1.nw_tos, _n1.nw_proto, _n1.pad2[0], _n1.pad2[1], _n1.nw_src, _n1.nw_dst, _n1.tp_src, _n1.tp_dst, self.cookie, self.command, self.idle_timeout, self.hard_timeout, self.priority, self.buffer_id, self.out_port, self.flags,) = ofp_flow_mod_struct.unpack_from(binaryString)
+    return binaryString[72:]
+
+def ofp_flow_mod_unpack_from(self, buffer, offset=0):
+    _n0 = self.header
+    _n1 = self.match
+    (_n0.version, _n0.type, _n0.length, _n0.xid, _n1.wildcards, _n1.in_port, _n1.dl_src[0], _n1.dl_src[1], _n1.dl_src[2], _n1.dl_src[3], _n1.dl_src[4], _n1.dl_src[5], _n1.dl_dst[0], _n1.dl_dst[1], _n1.dl_dst[2], _n1.dl_dst[3], _n1.dl_dst[4], _n1.dl_dst[5], _n1.dl_vlan, _n1.dl_vlan_pcp, _n1.pad1, _n1.dl_type, _n1.nw_tos, _n1.nw_proto, _n1.pad2[0], _n1.pad2[1], _n1.nw_src, _n1.nw_dst, _n1.tp_src, _n1.tp_dst, self.cookie, self.command, self.idle_timeout, self.hard_timeout, self.priority, self.buffer_id, self.out_port, self.flags,) = ofp_flow_mod_struct.unpack_from(buffer, offset)
+    return offset+72
+
+##Struct of ofp_flow_removed
+ofp_flow_removed_struct = struct.Struct('!BBHLLHBBBBBBBBBBBBHBBHBBBBLLHHQHBBLLHBBQQ')
+
+def ofp_flow_removed_pack(self, assertstruct=True):
+    _n0 = self.header
+    _n1 = self.match
+    if (assertstruct):
+        if (not isinstance(self.header, ofp_header) or not isinstance(self.match, ofp_match) or not isinstance(self.pad2, list) or len(self.pad2) != 2 or not (_n0.type in ofp_type_map) or not isinstance(_n1.dl_src, list) or len(_n1.dl_src) != 6 or not isinstance(_n1.dl_dst, list) or len(_n1.dl_dst) != 6 or not isinstance(_n1.pad2, list) or len(_n1.pad2) != 2):
+            return None
+    packed = ofp_flow_removed_struct.pack(_n0.version, _n0.type, _n0.length, _n0.xid, _n1.wildcards, _n1.in_port, _n1.dl_src[0], _n1.dl_src[1], _n1.dl_src[2], _n1.dl_src[3], _n1.dl_src[4], _n1.dl_src[5], _n1.dl_dst[0], _n1.dl_dst[1], _n1.dl_dst[2], _n1.dl_dst[3], _n1.dl_dst[4], _n1.dl_dst[5], _n1.dl_vlan, _n1.dl_vlan_pcp, _n1.pad1, _n1.dl_type, _n1.nw_tos, _n1.nw_proto, _n1.pad2[0], _n1.pad2[1], _n1.nw_src, _n1.nw_dst, _n1.tp_src, _n1.tp_dst, self.cookie, self.priority, self.reason, self.pad, self.duration_sec, self.duration_nsec, self.idle_timeout, self.pad2[0], self.pad2[1], self.packet_count, self.byte_count)
+    return packed
+
+def ofp_flow_removed_pack_into(self, buffer, offset=0):
+    _n0 = self.header
+    _n1 = self.match
+    ofp_flow_removed_struct.pack_into(buffer, offset, _n0.version, _n0.type, _n0.length, _n0.xid, _n1.wildcards, _n1.in_port, _n1.dl_src[0], _n1.dl_src[1], _n1.dl_src[2], _n1.dl_src[3], _n1.dl_src[4], _n1.dl_src[5], _n1.dl_dst[0], _n1.dl_dst[1], _n1.dl_dst[2], _n1.dl_dst[3], _n1.dl_dst[4], _n1.dl_dst[5], _n1.dl_vlan, _n1.dl_vlan_pcp, _n1.pad1, _n1.dl_type, _n1.nw_tos, _n1.nw_proto, _n1.pad2[0], _n1.pad2[1], _n1.nw_src, _n1.nw_dst, _n1.tp_src, _n1.tp_dst, self.cookie, self.priority, self.reason, self.pad, self.duration_sec, self.duration_nsec, self.idle_timeout, self.pad2[0], self.pad2[1], self.packet_count, self.byte_count)
+    offset += 88
+    return offset
+
+def ofp_flow_removed_unpack(self, binaryString):
+    if (len(binaryString) < 88):
+        return binaryString
+    _n0 = self.header
+    _n1 = self.match
+    (_n0.version, _n0.type, _n0.length, _n0.xid, _n1.wildcards, _n1.in_port, _n1.dl_src[0], _n1.dl_src[1], _n1.dl_src[2], _n1.dl_src[3], _n1.dl_src[4], _n1.dl_src[5], _n1.dl_dst[0], _n1.dl_dst[1], _n1.dl_dst[2], _n1.dl_dst[3], _n1.dl_dst[4], _n1.dl_dst[5], _n1.dl_vlan, _n1.dl_vlan_pcp, _n1.pad1, _n1.dl_type, _n1.nw_tos, _n1.nw_proto, _n1.pad2[0], _n1.pad2[1], _n1.nw_src, _n1.nw_dst, _n1.tp_src, _n1.tp_dst, self.cookie, self.priority, self.reason, self.pad, self.duration_sec, self.duration_nsec, self.idle_timeout, self.pad2[0], self.pad2[1], self.packet_count, self.byte_count,) = ofp_flow_removed_struct.unpack_from(binaryString)
+    return binaryString[88:]
+
+def ofp_flow_removed_unpack_from(self, buffer, offset=0):
+    _n0 = self.header
+    _n1 = self.match
+    (_n0.version, _n0.type, _n0.length, _n0.xid, _n1.wildcards, _n1.in_port, _n1.dl_src[0], _n1.dl_src[1], _n1.dl_src[2], _n1.dl_src[3], _n1.dl_src[4], _n1.dl_src[5], _n1.dl_dst[0], _n1.dl_dst[1], _n1.dl_dst[2], _n1.dl_dst[3], _n1.dl_dst[4], _n1.dl_dst[5], _n1.dl_vlan, _n1.dl_vlan_pcp, _n1.pad1, _n1.dl_type, _n1.nw_tos, _n1.nw_proto, _n1.pad2[0], _n1.pad2[1], _n1.nw_src, _n1.nw_dst, _n1.tp_src, _n1.tp_dst, self.cookie, self.priority, self.reason, self.pad, self.duration_sec, self.duration_nsec, self.idle_timeout, self.pad2[0], self.pad2[1], self.packet_count, self.byte_count,) = ofp_flow_removed_struct.unpack_from(buffer, offset)
+    return offset+88
+
+##Struct of ofp_flow_stats
+ofp_flow_stats_struct = struct.Struct('!HBBLHBBBBBBBBBBBBHBBHBBBBLLHHLLHHHBBBBBBQQQ')
+
+def ofp_flow_stats_pack(self, assertstruct=True):
+    _n0 = self.match
+    if (assertstruct):
+        if (not isinstance(self.match, ofp_match) or not isinstance(self.pad2, list) or len(self.pad2) != 6 or not isinstance(_n0.dl_src, list) or len(_n0.dl_src) != 6 or not isinstance(_n0.dl_dst, list) or len(_n0.dl_dst) != 6 or not isinstance(_n0.pad2, list) or len(_n0.pad2) != 2):
+            return None
+    packed = ofp_flow_stats_struct.pack(self.length, self.table_id, self.pad, _n0.wildcards, _n0.in_port, _n0.dl_src[0], _n0.dl_src[1], _n0.dl_src[2], _n0.dl_src[3], _n0.dl_src[4], _n0.dl_src[5], _n0.dl_dst[0], _n0.dl_dst[1], _n0.dl_dst[2], _n0.dl_dst[3], _n0.dl_dst[4], _n0.dl_dst[5], _n0.dl_vlan, _n0.dl_vlan_pcp, _n0.pad1, _n0.dl_type, _n0.nw_tos, _n0.nw_proto, _n0.pad2[0], _n0.pad2[1], _n0.nw_src, _n0.nw_dst, _n0.tp_src, _n0.tp_dst, self.duration_sec, self.duration_nsec, self.priority, self.idle_timeout, self.hard_timeout, self.pad2[0], self.pad2[1], self.pad2[2], self.pad2[3], self.pad2[4], self.pad2[5], self.cookie, self.packet_count, self.byte_count)
+    for i in self.actions:
+        packed += i.pack(assertstruct)
+    return packed
+
+def ofp_flow_stats_pack_into(self, buffer, offset=0):
+    _n0 = self.match
+    ofp_flow_stats_struct.pack_into(buffer, offset, self.length, self.table_id, self.pad, _n0.wildcards, _n0.in_port, _n0.dl_src[0], _n0.dl_src[1], _n0.dl_src[2], _n0.dl_src[3], _n0.dl_src[4], _n0.dl_src[5], _n0.dl_dst[0], _n0.dl_dst[1], _n0.dl_dst[2], _n0.dl_dst[3], _n0.dl_dst[4], _n0.dl_dst[5], _n0.dl_vlan, _n0.dl_vlan_pcp, _n0.pad1, _n0.dl_type, _n0.nw_tos, _n0.nw_proto, _n0.pad2[0], _n0.pad2[1], _n0.nw_src, _n0.nw_dst, _n0.tp_src, _n0.tp_dst, self.duration_sec, self.duration_nsec, self.priority, self.idle_timeout, self.hard_timeout, self.pad2[0], self.pad2[1], self.pad2[2], self.pad2[3], self.pad2[4], self.pad2[5], self.cookie, self.packet_count, self.byte_count)
+    offset += 88
+    for i in self.actions:
+        p = i.pack(False)
+        buffer[offset:offset+len(p)] = p
+        offset += len(p)
+    return offset
+
+def ofp_flow_stats_unpack(self, binaryString):
+    if (len(binaryString) < 88):
+        return binaryString
+    _n0 = self.match
+    (self.length, self.table_id, self.pad, _n0.wildcards, _n0.in_port, _n0.dl_src[0], _n0.dl_src[1], _n0.dl_src[2], _n0.dl_src[3], _n0.dl_src[4], _n0.dl_src[5], _n0.dl_dst[0], _n0.dl_dst[1], _n0.dl_dst[2], _n0.dl_dst[3], _n0.dl_dst[4], _n0.dl_dst[5], _n0.dl_vlan, _n0.dl_vlan_pcp, _n0.pad1, _n0.dl_type, _n0.nw_tos, _n0.nw_proto, _n0.pad2[0], _n0.pad2[1], _n0.nw_src, _n0.nw_dst, _n0.tp_src, _n0.tp_dst, self.duration_sec, self.duration_nsec, self.priority, self.idle_timeout, self.hard_timeout, self.pad2[0], self.pad2[1], self.pad2[2], self.pad2[3], self.pad2[4], self.pad2[5], self.cookie, self.packet_count, self.byte_count,) = ofp_flow_stats_struct.unpack_from(binaryString)
+    return binaryString[88:]
+
+def ofp_flow_stats_unpack_from(self, buffer, offset=0):
+    _n0 = self.match
+    (self.length, self.table_id, self.pad, _n0.wildcards, _n0.in_port, _n0.dl_src[0], _n0.dl_src[1], _n0.dl_src[2], _n0.dl_src[3], _n0.dl_src[4], _n0.dl_src[5], _n0.dl_dst[0], _n0.dl_dst[1], _n0.dl_dst[2], _n0.dl_dst[3], _n0.dl_dst[4], _n0.dl_dst[5], _n0.dl_vlan, _n0.dl_vlan_pcp, _n0.pad1, _n0.dl_type, _n0.nw_tos, _n0.nw_proto, _n0.pad2[0], _n0.pad2[1], _n0.nw_src, _n0.nw_dst, _n0.tp_src, _n0.tp_dst, self.duration_sec, self.duration_nsec, self.priority, self.idle_timeout, self.hard_timeout, self.pad2[0], self.pad2[1], self.pad2[2], self.pad2[3], self.pad2[4], self.pad2[5], self.cookie, self.packet_count, self.byte_count,) = ofp_flow_stats_struct.unpack_from(buffer, offset)
+    return offset+88
+
+##Struct of ofp_flow_stats_request
+ofp_flow_stats_request_struct = struct.Struct('!LHBBBBBBBBBBBBHBBHBBBBLLHHBBH')
+
+def ofp_flow_stats_request_pack(self, assertstruct=True):
+    _n0 = self.match
+    if (assertstruct):
+        if (not isinstance(self.match, ofp_match) or not isinstance(_n0.dl_src, list) or len(_n0.dl_src) != 6 or not isinstance(_n0.dl_dst, list) or len(_n0.dl_dst) != 6 or not isinstance(_n0.pad2, list) or len(_n0.pad2) != 2):
+            return None
+    packed = ofp_flow_stats_request_struct.pack(_n0.wildcards, _n0.in_port, _n0.dl_src[0], _n0.dl_src[1], _n0.dl_src[2], _n0.dl_src[3], _n0.dl_src[4], _n0.dl_src[5], _n0.dl_dst[0], _n0.dl_dst[1], _n0.dl_dst[2], _n0.dl_dst[3], _n0.dl_dst[4], _n0.dl_dst[5], _n0.dl_vlan, _n0.dl_vlan_pcp, _n0.pad1, _n0.dl_type, _n0.nw_tos, _n0.nw_proto, _n0.pad2[0], _n0.pad2[1], _n0.nw_src, _n0.nw_dst, _n0.tp_src, _n0.tp_dst, self.table_id, self.pad, self.out_port)
+    return packed
+
+def ofp_flow_stats_request_pack_into(self, buffer, offset=0):
+    _n0 = self.match
+    ofp_flow_stats_request_struct.pack_into(buffer, offset, _n0.wildcards, _n0.in_port, _n0.dl_src[0], _n0.dl_src[1], _n0.dl_src[2], _n0.dl_src[3], _n0.dl_src[4], _n0.dl_src[5], _n0.dl_dst[0], _n0.dl_dst[1], _n0.dl_dst[2], _n0.dl_dst[3], _n0.dl_dst[4], _n0.dl_dst[5], _n0.dl_vlan, _n0.dl_vlan_pcp, _n0.pad1, _n0.dl_type, _n0.nw_tos, _n0.nw_proto, _n0.pad2[0], _n0.pad2[1], _n0.nw_src, _n0.nw_dst, _n0.tp_src, _n0.tp_dst, self.table_id, self.pad, self.out_port)
+    offset += 44
+    return offset
+
+def ofp_flow_stats_request_unpack(self, binaryString):
+    if (len(binaryString) < 44):
+        return binaryString
+    _n0 = self.match
+    (_n0.wildcards, _n0.in_port, _n0.dl_src[0], _n0.dl_src[1], _n0.dl_src[2], _n0.dl_src[3], _n0.dl_src[4], _n0.dl_src[5], _n0.dl_dst[0], _n0.dl_dst[1], _n0.dl_dst[2], _n0.dl_dst[3], _n0.dl_dst[4], _n0.dl_dst[5], _n0.dl_vlan, _n0.dl_vlan_pcp, _n0.pad1, _n0.dl_type, _n0.nw_tos, _n0.nw_proto, _n0.pad2[0], _n0.pad2[1], _n0.nw_src, _n0.nw_dst, _n0.tp_src, _n0.tp_dst, self.table_id, self.pad, self.out_port,) = ofp_flow_stats_request_struct.unpack_from(binaryString)
+    return binaryString[44:]
+
+def ofp_flow_stats_request_unpack_from(self, buffer, offset=0):
+    _n0 = self.match
+    (_n0.wildcards, _n0.in_port, _n0.dl_src[0], _n0.dl_src[1], _n0.dl_src[2], _n0.dl_src[3], _n0.dl_src[4], _n0.dl_src[5], _n0.dl_dst[0], _n0.dl_dst[1], _n0.dl_dst[2], _n0.dl_dst[3], _n0.dl_dst[4], _n0.dl_dst[5], _n0.dl_vlan, _n0.dl_vlan_pcp, _n0.pad1, _n0.dl_type, _n0.nw_tos, _n0.nw_proto, _n0.pad2[0], _n0.pad2[1], _n0.nw_src, _n0.nw_dst, _n0.tp_src, _n0.tp_dst, self.table_id, self.pad, self.out_port,) = ofp_flow_stats_request_struct.unpack_from(buffer, offset)
+    return offset+44
+
+##Struct of ofp_header
+ofp_header_struct = struct.Struct('!BBHL')
+
+def ofp_header_pack(self, assertstruct=True):
+    if (assertstruct):
+        if (not (self.type in ofp_type_map)):
+            return None
+    packed = ofp_header_struct.pack(self.version, self.type, self.length, self.xid)
+    return packed
+
+def ofp_header_pack_into(self, buffer, offset=0):
+    ofp_header_struct.pack_into(buffer, offset, self.version, self.type, self.length, self.xid)
+    offset += 8
+    return offset
+
+def ofp_header_unpack(self, binaryString):
+    if (len(binaryString) < 8):
+        return binaryString
+    (self.version, self.type, self.length, self.xid,) = ofp_header_struct.unpack_from(binaryString)
+    return binaryString[8:]
+
+def ofp_header_unpack_from(self, buffer, offset=0):
+    (self.version, self.type, self.length, self.xid,) = ofp_header_struct.unpack_from(buffer, offset)
+    return offset+8
+
+##Struct of ofp_hello
+ofp_hello_struct = struct.Struct('!BBHL')
+
+def ofp_hello_pack(self, assertstruct=True):
+    _n0 = self.header
+    if (assertstruct):
+        if (not isinstance(self.header, ofp_header) or not (_n0.type in ofp_type_map)):
+            return None
+    packed = ofp_hello_struct.pack(_n0.version, _n0.type, _n0.length, _n0.xid)
+    return packed
+
+def ofp_hello_pack_into(self, buffer, offset=0):
+    _n0 = self.header
+    ofp_hello_struct.pack_into(buffer, offset, _n0.version, _n0.type, _n0.length, _n0.xid)
+    offset += 8
+    return offset
+
+def ofp_hello_unpack(self, binaryString):
+    if (len(binaryString) < 8):
+        return binaryString
+    _n0 = self.header
+    (_n0.version, _n0.type, _n0.length, _n0.xid,) = ofp_hello_struct.unpack_from(binaryString)
+    return binaryString[8:]
+
+def ofp_hello_unpack_from(self, buffer, offset=0):
+    _n0 = self.header
+    (_n0.version, _n0.type, _n0.length, _n0.xid,) = ofp_hello_struct.unpack_from(buffer, offset)
+    return offset+8
+
+##Struct of ofp_match
+ofp_match_struct = struct.Struct('!LHBBBBBBBBBBBBHBBHBBBBLLHH')
+
+def ofp_match_pack(self, assertstruct=True):
+    if (assertstruct):
+        if (not isinstance(self.dl_src, list) or len(self.dl_src) != 6 or not isinstance(self.dl_dst, list) or len(self.dl_dst) != 6 or not isinstance(self.pad2, list) or len(self.pad2) != 2):
+            return None
+    packed = ofp_match_struct.pack(self.wildcards, self.in_port, self.dl_src[0], self.dl_src[1], self.dl_src[2], self.dl_src[3], self.dl_src[4], self.dl_src[5], self.dl_dst[0], self.dl_dst[1], self.dl_dst[2], self.dl_dst[3], self.dl_dst[4], self.dl_dst[5], self.dl_vlan, self.dl_vlan_pcp, self.pad1, self.dl_type, self.nw_tos, self.nw_proto, self.pad2[0], self.pad2[1], self.nw_src, self.nw_dst, self.tp_src, self.tp_dst)
+    return packed
+
+def ofp_match_pack_into(self, buffer, offset=0):
+    ofp_match_struct.pack_into(buffer, offset, self.wildcards, self.in_port, self.dl_src[0], self.dl_src[1], self.dl_src[2], self.dl_src[3], self.dl_src[4], self.dl_src[5], self.dl_dst[0], self.dl_dst[1], self.dl_dst[2], self.dl_dst[3], self.dl_dst[4], self.dl_dst[5], self.dl_vlan, self.dl_vlan_pcp, self.pad1, self.dl_type, self.nw_tos, self.nw_proto, self.pad2[0], self.pad2[1], self.nw_src, self.nw_dst, self.tp_src, self.tp_dst)
+    offset += 40
+    return offset
+
+def ofp_match_unpack(self, binaryString):
+    if (len(binaryString) < 40):
+        return binaryString
+    (self.wildcards, self.in_port, self.dl_src[0], self.dl_src[1], self.dl_src[2], self.dl_src[3], self.dl_src[4], self.dl_src[5], self.dl_dst[0], self.dl_dst[1], self.dl_dst[2], self.dl_dst[3], self.dl_dst[4], self.dl_dst[5], self.dl_vlan, self.dl_vlan_pcp, self.pad1, self.dl_type, self.nw_tos, self.nw_proto, self.pad2[0], self.pad2[1], self.nw_src, self.nw_dst, self.tp_src, self.tp_dst,) = ofp_match_struct.unpack_from(binaryString)
+    return binaryString[40:]
+
+def ofp_match_unpack_from(self, buffer, offset=0):
+    (self.wildcards, self.in_port, self.dl_src[0], self.dl_src[1], self.dl_src[2], self.dl_src[3], self.dl_src[4], self.dl_src[5], self.dl_dst[0], self.dl_dst[1], self.dl_dst[2], self.dl_dst[3], self.dl_dst[4], self.dl_dst[5], self.dl_vlan, self.dl_vlan_pcp, self.pad1, self.dl_type, self.nw_tos, self.nw_proto, self.pad2[0], self.pad2[1], self.nw_src, self.nw_dst, self.tp_src, self.tp_dst,) = ofp_match_struct.unpack_from(buffer, offset)
+    return offset+40
+
+##Struct of ofp_packet_in
+ofp_packet_in_struct = struct.Struct('!BBHLLHHBB')
+
+def ofp_packet_in_pack(self, assertstruct=True):
+    _n0 = self.header
+    if (assertstruct):
+        if (not isinstance(self.header, ofp_header) or not (_n0.type in ofp_type_map)):
+            return None
+    packed = ofp_packet_in_struct.pack(_n0.version, _n0.type, _n0.length, _n0.xid, self.buffer_id, self.total_len, self.in_port, self.reason, self.pad)
+    if (len(self.data) > 0):
+        packed += struct.pack('!%dB' % len(self.data), *self.data)
+    return packed
+
+def ofp_packet_in_pack_into(self, buffer, offset=0):
+    _n0 = self.header
+    ofp_packet_in_struct.pack_into(buffer, offset, _n0.version, _n0.type, _n0.length, _n0.xid, self.buffer_id, self.total_len, self.in_port, self.reason, self.pad)
+    offset += 18
+    struct.pack_into('!%dB' % len(self.data), buffer, offset, *self.data)
+    offset += len(self.data)
+    return offset
+
+def ofp_packet_in_unpack(self, binaryString):
+    if (len(binaryString) < 18):
+        return binaryString
+    _n0 = self.header
+    (_n0.version, _n0.type, _n0.length, _n0.xid, self.buffer_id, self.total_len, self.in_port, self.reason, self.pad,) = ofp_packet_in_struct.unpack_from(binaryString)
+    return binaryString[18:]
+
+def ofp_packet_in_unpack_from(self, buffer, offset=0):
+    _n0 = self.header
+    (_n0.version, _n0.type, _n0.length, _n0.xid, self.buffer_id, self.total_len, self.in_port, self.reason, self.pad,) = ofp_packet_in_struct.unpack_from(buffer, offset)
+    return offset+18
+
+##Struct of ofp_packet_out
+ofp_packet_out_struct = struct.Struct('!BBHLLHH')
+
+def ofp_packet_out_pack(self, assertstruct=True):
+    _n0 = self.header
+    if (assertstruct):
+        if (not isinstance(self.header, ofp_header) or not (_n0.type in ofp_type_map)):
+            return None
+    packed = ofp_packet_out_struct.pack(_n0.version, _n0.type, _n0.length, _n0.xid, self.buffer_id, self.in_port, self.actions_len)
+    for i in self.actions:
+        packed += i.pack(assertstruct)
+    return packed
+
+def ofp_packet_out_pack_into(self, buffer, offset=0):
+    _n0 = self.header
+    ofp_packet_out_struct.pack_into(buffer, offset, _n0.version, _n0.type, _n0.length, _n0.xid, self.buffer_id, self.in_port, self.actions_len)
+    offset += 16
+    for i in self.actions:
+        p = i.pack(False)
+        buffer[offset:offset+len(p)] = p
+        offset += len(p)
+    return offset
+
+def ofp_packet_out_unpack(self, binaryString):
+    if (len(binaryString) < 16):
+        return binaryString
+    _n0 = self.header
+    (_n0.version, _n0.type, _n0.length, _n0.xid, self.buffer_id, self.in_port, self.actions_len,) = ofp_packet_out_struct.unpack_from(binaryString)
+    return binaryString[16:]
+
+def ofp_packet_out_unpack_from(self, buffer, offset=0):
+    _n0 = self.header
+    (_n0.version, _n0.type, _n0.length, _n0.xid, self.buffer_id, self.in_port, self.actions_len,) = ofp_packet_out_struct.unpack_from(buffer, offset)
+    return offset+16
+
+##Struct of ofp_packet_queue
+ofp_packet_queue_struct = struct.Struct('!LHBB')
+
+def ofp_packet_queue_pack(self, assertstruct=True):
+    if (assertstruct):
+        if (not isinstance(self.pad, list) or len(self.pad) != 2):
+            return None
+    packed = ofp_packet_queue_struct.pack(self.queue_id, self.len, self.pad[0], self.pad[1])
+    for i in self.properties:
+        packed += i.pack(assertstruct)
+    return packed
+
+def ofp_packet_queue_pack_into(self, buffer, offset=0):
+    ofp_packet_queue_struct.pack_into(buffer, offset, self.queue_id, self.len, self.pad[0], self.pad[1])
+    offset += 8
+    for i in self.properties:
+        p = i.pack(False)
+        buffer[offset:offset+len(p)] = p
+        offset += len(p)
+    return offset
+
+def ofp_packet_queue_unpack(self, binaryString):
+    if (len(binaryString) < 8):
+        return binaryString
+    (self.queue_id, self.len, self.pad[0], self.pad[1],) = ofp_packet_queue_struct.unpack_from(binaryString)
+    return binaryString[8:]
+
+def ofp_packet_queue_unpack_from(self, buffer, offset=0):
+    (self.queue_id, self.len, self.pad[0], self.pad[1],) = ofp_packet_queue_struct.unpack_from(buffer, offset)
+    return offset+8
+
+##Struct of ofp_phy_port
+ofp_phy_port_struct = struct.Struct('!HBBBBBB16sLLLLLL')
+
+def ofp_phy_port_pack(self, assertstruct=True):
+    if (assertstruct):
+        if (not isinstance(self.hw_addr, list) or len(self.hw_addr) != 6 or not isinstance(self.name, str) or len(self.name) > 16):
+            return None
+    packed = ofp_phy_port_struct.pack(self.port_no, self.hw_addr[0], self.hw_addr[1], self.hw_addr[2], self.hw_addr[3], self.hw_addr[4], self.hw_addr[5], self.name, self.config, self.state, self.curr, self.advertised, self.supported, self.peer)
+    return packed
+
+def ofp_phy_port_pack_into(self, buffer, offset=0):
+    ofp_phy_port_struct.pack_into(buffer, offset, self.port_no, self.hw_addr[0], self.hw_addr[1], self.hw_addr[2], self.hw_addr[3], self.hw_addr[4], self.hw_addr[5], self.name, self.config, self.state, self.curr, self.advertised, self.supported, self.peer)
+    offset += 48
+    return offset
+
+def ofp_phy_port_unpack(self, binaryString):
+    if (len(binaryString) < 48):
+        return binaryString
+    (self.port_no, self.hw_addr[0], self.hw_addr[1], self.hw_addr[2], self.hw_addr[3], self.hw_addr[4], self.hw_addr[5], self.name, self.config, self.state, self.curr, self.advertised, self.supported, self.peer,) = ofp_phy_port_struct.unpack_from(binaryString)
+    self.name = self.name[:self.name.find('\0')]
+    return binaryString[48:]
+
+def ofp_phy_port_unpack_from(self, buffer, offset=0):
+    (self.port_no, self.hw_addr[0], self.hw_addr[1], self.hw_addr[2], self.hw_addr[3], self.hw_addr[4], self.hw_addr[5], self.name, self.config, self.state, self.curr, self.advertised, self.supported, self.peer,) = ofp_phy_port_struct.unpack_from(buffer, offset)
+    self.name = self.name[:self.name.find('\0')]
+    return offset+48
+
+##Struct of ofp_port_mod
+ofp_port_mod_struct = struct.Struct('!BBHLHBBBBBBLLLBBBB')
+
+def ofp_port_mod_pack(self, assertstruct=True):
+    _n0 = self.header
+    if (assertstruct):
+        if (not isinstance(self.header, ofp_header) or not isinstance(self.hw_addr, list) or len(self.hw_addr) != 6 or not isinstance(self.pad, list) or len(self.pad) != 4 or not (_n0.type in ofp_type_map)):
+            return None
+    packed = ofp_port_mod_struct.pack(_n0.version, _n0.type, _n0.length, _n0.xid, self.port_no, self.hw_addr[0], self.hw_addr[1], self.hw_addr[2], self.hw_addr[3], self.hw_addr[4], self.hw_addr[5], self.config, self.mask, self.advertise, self.pad[0], self.pad[1], self.pad[2], self.pad[3])
+    return packed
+
+def ofp_port_mod_pack_into(self, buffer, offset=0):
+    _n0 = self.header
+    ofp_port_mod_struct.pack_into(buffer, offset, _n0.version, _n0.type, _n0.length, _n0.xid, self.port_no, self.hw_addr[0], self.hw_addr[1], self.hw_addr[2], self.hw_addr[3], self.hw_addr[4], self.hw_addr[5], self.config, self.mask, self.advertise, self.pad[0], self.pad[1], self.pad[2], self.pad[3])
+    offset += 32
+    return offset
+
+def ofp_port_mod_unpack(self, binaryString):
+    if (len(binaryString) < 32):
+        return binaryString
+    _n0 = self.header
+    (_n0.version, _n0.type, _n0.length, _n0.xid, self.port_no, self.hw_addr[0], self.hw_addr[1], self.hw_addr[2], self.hw_addr[3], self.hw_addr[4], self.hw_addr[5], self.config, self.mask, self.advertise, self.pad[0], self.pad[1], self.pad[2], self.pad[3],) = ofp_port_mod_struct.unpack_from(binaryString)
+    return binaryString[32:]
+
+def ofp_port_mod_unpack_from(self, buffer, offset=0):
+    _n0 = self.header
+    (_n0.version, _n0.type, _n0.length, _n0.xid, self.port_no, self.hw_addr[0], self.hw_addr[1], self.hw_addr[2], self.hw_addr[3], self.hw_addr[4], self.hw_addr[5], self.config, self.mask, self.advertise, self.pad[0], self.pad[1], self.pad[2], self.pad[3],) = ofp_port_mod_struct.unpack_from(buffer, offset)
+    return offset+32
+
+##Struct of ofp_port_stats
+ofp_port_stats_struct = struct.Struct('!HBBBBBBQQQQQQQQQQQQ')
+
+def ofp_port_stats_pack(self, assertstruct=True):
+    if (assertstruct):
+        if (not isinstance(self.pad, list) or len(self.pad) != 6):
+            return None
+    packed = ofp_port_stats_struct.pack(self.port_no, self.pad[0], self.pad[1], self.pad[2], self.pad[3], self.pad[4], self.pad[5], self.rx_packets, self.tx_packets, self.rx_bytes, self.tx_bytes, self.rx_dropped, self.tx_dropped, self.rx_errors, self.tx_errors, self.rx_frame_err, self.rx_over_err, self.rx_crc_err, self.collisions)
+    return packed
+
+def ofp_port_stats_pack_into(self, buffer, offset=0):
+    ofp_port_stats_struct.pack_into(buffer, offset, self.port_no, self.pad[0], self.pad[1], self.pad[2], self.pad[3], self.pad[4], self.pad[5], self.rx_packets, self.tx_packets, self.rx_bytes, self.tx_bytes, self.rx_dropped, self.tx_dropped, self.rx_errors, self.tx_errors, self.rx_frame_err, self.rx_over_err, self.rx_crc_err, self.collisions)
+    offset += 104
+    return offset
+
+def ofp_port_stats_unpack(self, binaryString):
+    if (len(binaryString) < 104):
+        return binaryString
+    (self.port_no, self.pad[0], self.pad[1], self.pad[2], self.pad[3], self.pad[4], self.pad[5], self.rx_packets, self.tx_packets, self.rx_bytes, self.tx_bytes, self.rx_dropped, self.tx_dropped, self.rx_errors, self.tx_errors, self.rx_frame_err, self.rx_over_err, self.rx_crc_err, self.collisions,) = ofp_port_stats_struct.unpack_from(binaryString)
+    return binaryString[104:]
+
+def ofp_port_stats_unpack_from(self, buffer, offset=0):
+    (self.port_no, self.pad[0], self.pad[1], self.pad[2], self.pad[3], self.pad[4], self.pad[5], self.rx_packets, self.tx_packets, self.rx_bytes, self.tx_bytes, self.rx_dropped, self.tx_dropped, self.rx_errors, self.tx_errors, self.rx_frame_err, self.rx_over_err, self.rx_crc_err, self.collisions,) = ofp_port_stats_struct.unpack_from(buffer, offset)
+    return offset+104
+
+##Struct of ofp_port_stats_request
+ofp_port_stats_request_struct = struct.Struct('!HBBBBBB')
+
+def ofp_port_stats_request_pack(self, assertstruct=True):
+    if (assertstruct):
+        if (not isinstance(self.pad, list) or len(self.pad) != 6):
+            return None
+    packed = ofp_port_stats_request_struct.pack(self.port_no, self.pad[0], self.pad[1], self.pad[2], self.pad[3], self.pad[4], self.pad[5])
+    return packed
+
+def ofp_port_stats_request_pack_into(self, buffer, offset=0):
+    ofp_port_stats_request_struct.pack_into(buffer, offset, self.port_no, self.pad[0], self.pad[1], self.pad[2], self.pad[3], self.pad[4], self.pad[5])
+    offset += 8
+    return offset
+
+def ofp_port_stats_request_unpack(self, binaryString):
+    if (len(binaryString) < 8):
+        return binaryString
+    (self.port_no, self.pad[0], self.pad[1], self.pad[2], self.pad[3], self.pad[4], self.pad[5],) = ofp_port_stats_request_struct.unpack_from(binaryString)
+    return binaryString[8:]
+
+def ofp_port_stats_request_unpack_from(self, buffer, offset=0):
+    (self.port_no, self.pad[0], self.pad[1], self.pad[2], self.pad[3], self.pad[4], self.pad[5],) = ofp_port_stats_request_struct.unpack_from(buffer, offset)
+    return offset+8
+
+##Struct of ofp_port_status
+ofp_port_status_struct = struct.Struct('!BBHLBBBBBBBBHBBBBBB16sLLLLLL')
+
+def ofp_port_status_pack(self, assertstruct=True):
+    _n0 = self.header
+    _n1 = self.desc
+    if (assertstruct):
+        if (not isinstance(self.header, ofp_header) or not isinstance(self.pad, list) or len(self.pad) != 7 or not isinstance(self.desc, ofp_phy_port) or not (_n0.type in ofp_type_map) or not isinstance(_n1.hw_addr, list) or len(_n1.hw_addr) != 6 or not isinstance(_n1.name, str) or len(_n1.name) > 16):
+            return None
+    packed = ofp_port_status_struct.pack(_n0.version, _n0.type, _n0.length, _n0.xid, self.reason, self.pad[0], self.pad[1], self.pad[2], self.pad[3], self.pad[4], self.pad[5], self.pad[6], _n1.port_no, _n1.hw_addr[0], _n1.hw_addr[1], _n1.hw_addr[2], _n1.hw_addr[3], _n1.hw_addr[4], _n1.hw_addr[5], _n1.name, _n1.config, _n1.state, _n1.curr, _n1.advertised, _n1.supported, _n1.peer)
+    return packed
+
+def ofp_port_status_pack_into(self, buffer, offset=0):
+    _n0 = self.header
+    _n1 = self.desc
+    ofp_port_status_struct.pack_into(buffer, offset, _n0.version, _n0.type, _n0.length, _n0.xid, self.reason, self.pad[0], self.pad[1], self.pad[2], self.pad[3], self.pad[4], self.pad[5], self.pad[6], _n1.port_no, _n1.hw_addr[0], _n1.hw_addr[1], _n1.hw_addr[2], _n1.hw_addr[3], _n1.hw_addr[4], _n1.hw_addr[5], _n1.name, _n1.config, _n1.state, _n1.curr, _n1.advertised, _n1.supported, _n1.peer)
+    offset += 64
+    return offset
+
+def ofp_port_status_unpack(self, binaryString):
+    if (len(binaryString) < 64):
+        return binaryString
+    _n0 = self.header
+    _n1 = self.desc
+    (_n0.version, _n0.type, _n0.length, _n0.xid, self.reason, self.pad[0], self.pad[1], self.pad[2], self.pad[3], self.pad[4], self.pad[5], self.pad[6], _n1.port_no, _n1.hw_addr[0], _n1.hw_addr[1], _n1.hw_addr[2], _n1.hw_addr[3], _n1.hw_addr[4], _n1.hw_addr[5], _n1.name, _n1.config, _n1.state, _n1.curr, _n1.advertised, _n1.supported, _n1.peer,) = ofp_port_status_struct.unpack_from(binaryString)
+    _n1.name = _n1.name[:_n1.name.find('\0')]
+    return binaryString[64:]
+
+def ofp_port_status_unpack_from(self, buffer, offset=0):
+    _n0 = self.header
+    _n1 = self.desc
+    (_n0.version, _n0.type, _n0.length, _n0.xid, self.reason, self.pad[0], self.pad[1], self.pad[2], self.pad[3], self.pad[4], self.pad[5], self.pad[6], _n1.port_no, _n1.hw_addr[0], _n1.hw_addr[1], _n1.hw_addr[2], _n1.hw_addr[3], _n1.hw_addr[4], _n1.hw_addr[5], _n1.name, _n1.config, _n1.state, _n1.curr, _n1.advertised, _n1.supported, _n1.peer,) = ofp_port_status_struct.unpack_from(buffer, offset)
+    _n1.name = _n1.name[:_n1.name.find('\0')]
+    return offset+64
+
+##Struct of ofp_queue_get_config_reply
+ofp_queue_get_config_reply_struct = struct.Struct('!BBHLHBBBBBB')
+
+def ofp_queue_get_config_reply_pack(self, assertstruct=True):
+    _n0 = self.header
+    if (assertstruct):
+        if (not isinstance(self.header, ofp_header) or not isinstance(self.pad, list) or len(self.pad) != 6 or not (_n0.type in ofp_type_map)):
+            return None
+    packed = ofp_queue_get_config_reply_struct.pack(_n0.version, _n0.type, _n0.length, _n0.xid, self.port, self.pad[0], self.pad[1], self.pad[2], self.pad[3], self.pad[4], self.pad[5])
+    for i in self.queues:
+        packed += i.pack(assertstruct)
+    return packed
+
+def ofp_queue_get_config_reply_pack_into(self, buffer, offset=0):
+    _n0 = self.header
+    ofp_queue_get_config_reply_struct.pack_into(buffer, offset, _n0.version, _n0.type, _n0.length, _n0.xid, self.port, self.pad[0], self.pad[1], self.pad[2], self.pad[3], self.pad[4], self.pad[5])
+    offset += 16
+    for i in self.queues:
+        p = i.pack(False)
+        buffer[offset:offset+len(p)] = p
+        offset += len(p)
+    return offset
+
+def ofp_queue_get_config_reply_unpack(self, binaryString):
+    if (len(binaryString) < 16):
+        return binaryString
+    _n0 = self.header
+    (_n0.version, _n0.type, _n0.length, _n0.xid, self.port, self.pad[0], self.pad[1], self.pad[2], self.pad[3], self.pad[4], self.pad[5],) = ofp_queue_get_config_reply_struct.unpack_from(binaryString)
+    return binaryString[16:]
+
+def ofp_queue_get_config_reply_unpack_from(self, buffer, offset=0):
+    _n0 = self.header
+    (_n0.version, _n0.type, _n0.length, _n0.xid, self.port, self.pad[0], self.pad[1], self.pad[2], self.pad[3], self.pad[4], self.pad[5],) = ofp_queue_get_config_reply_struct.unpack_from(buffer, offset)
+    return offset+16
+
+##Struct of ofp_queue_get_config_request
+ofp_queue_get_config_request_struct = struct.Struct('!BBHLHBB')
+
+def ofp_queue_get_config_request_pack(self, assertstruct=True):
+    _n0 = self.header
+    if (assertstruct):
+        if (not isinstance(self.header, ofp_header) or not isinstance(self.pad, list) or len(self.pad) != 2 or not (_n0.type in ofp_type_map)):
+            return None
+    packed = ofp_queue_get_config_request_struct.pack(_n0.version, _n0.type, _n0.length, _n0.xid, self.port, self.pad[0], self.pad[1])
+    return packed
+
+def ofp_queue_get_config_request_pack_into(self, buffer, offset=0):
+    _n0 = self.header
+    ofp_queue_get_config_request_struct.pack_into(buffer, offset, _n0.version, _n0.type, _n0.length, _n0.xid, self.port, self.pad[0], self.pad[1])
+    offset += 12
+    return offset
+
+def ofp_queue_get_config_request_unpack(self, binaryString):
+    if (len(binaryString) < 12):
+        return binaryString
+    _n0 = self.header
+    (_n0.version, _n0.type, _n0.length, _n0.xid, self.port, self.pad[0], self.pad[1],) = ofp_queue_get_config_request_struct.unpack_from(binaryString)
+    return binaryString[12:]
+
+def ofp_queue_get_config_request_unpack_from(self, buffer, offset=0):
+    _n0 = self.header
+    (_n0.version, _n0.type, _n0.length, _n0.xid, self.port, self.pad[0], self.pad[1],) = ofp_queue_get_config_request_struct.unpack_from(buffer, offset)
+    return offset+12
+
+##Struct of ofp_queue_prop_header
+ofp_queue_prop_header_struct = struct.Struct('!HHBBBB')
+
+def ofp_queue_prop_header_pack(self, assertstruct=True):
+    if (assertstruct):
+        if (not isinstance(self.pad, list) or len(self.pad) != 4):
+            return None
+    packed = ofp_queue_prop_header_struct.pack(self.property, self.len, self.pad[0], self.pad[1], self.pad[2], self.pad[3])
+    return packed
+
+def ofp_queue_prop_header_pack_into(self, buffer, offset=0):
+    ofp_queue_prop_header_struct.pack_into(buffer, offset, self.property, self.len, self.pad[0], self.pad[1], self.pad[2], self.pad[3])
+    offset += 8
+    return offset
+
+def ofp_queue_prop_header_unpack(self, binaryString):
+    if (len(binaryString) < 8):
+        return binaryString
+    (self.property, self.len, self.pad[0], self.pad[1], self.pad[2], self.pad[3],) = ofp_queue_prop_header_struct.unpack_from(binaryString)
+    return binaryString[8:]
+
+def ofp_queue_prop_header_unpack_from(self, buffer, offset=0):
+    (self.property, self.len, self.pad[0], self.pad[1], self.pad[2], self.pad[3],) = ofp_queue_prop_header_struct.unpack_from(buffer, offset)
+    return offset+8
+
+##Struct of ofp_queue_prop_min_rate
+ofp_queue_prop_min_rate_struct = struct.Struct('!HHBBBBHBBBBBB')
+
+def ofp_queue_prop_min_rate_pack(self, assertstruct=True):
+    _n0 = self.prop_header
+    if (assertstruct):
+        if (not isinstance(self.prop_header, ofp_queue_prop_header) or not isinstance(self.pad, list) or len(self.pad) != 6 or not isinstance(_n0.pad, list) or len(_n0.pad) != 4):
+            return None
+    packed = ofp_queue_prop_min_rate_struct.pack(_n0.property, _n0.len, _n0.pad[0], _n0.pad[1], _n0.pad[2], _n0.pad[3], self.rate, self.pad[0], self.pad[1], self.pad[2], self.pad[3], self.pad[4], self.pad[5])
+    return packed
+
+def ofp_queue_prop_min_rate_pack_into(self, buffer, offset=0):
+    _n0 = self.prop_header
+    ofp_queue_prop_min_rate_struct.pack_into(buffer, offset, _n0.property, _n0.len, _n0.pad[0], _n0.pad[1], _n0.pad[2], _n0.pad[3], self.rate, self.pad[0], self.pad[1], self.pad[2], self.pad[3], self.pad[4], self.pad[5])
+    offset += 16
+    return offset
+
+def ofp_queue_prop_min_rate_unpack(self, binaryString):
+    if (len(binaryString) < 16):
+        return binaryString
+    _n0 = self.prop_header
+    (_n0.property, _n0.len, _n0.pad[0], _n0.pad[1], _n0.pad[2], _n0.pad[3], self.rate, self.pad[0], self.pad[1], self.pad[2], self.pad[3], self.pad[4], self.pad[5],) = ofp_queue_prop_min_rate_struct.unpack_from(binaryString)
+    return binaryString[16:]
+
+def ofp_queue_prop_min_rate_unpack_from(self, buffer, offset=0):
+    _n0 = self.prop_header
+    (_n0.property, _n0.len, _n0.pad[0], _n0.pad[1], _n0.pad[2], _n0.pad[3], self.rate, self.pad[0], self.pad[1], self.pad[2], self.pad[3], self.pad[4], self.pad[5],) = ofp_queue_prop_min_rate_struct.unpack_from(buffer, offset)
+    return offset+16
+
+##Struct of ofp_queue_stats
+ofp_queue_stats_struct = struct.Struct('!HBBLQQQ')
+
+def ofp_queue_stats_pack(self, assertstruct=True):
+    if (assertstruct):
+        if (not isinstance(self.pad, list) or len(self.pad) != 2):
+            return None
+    packed = ofp_queue_stats_struct.pack(self.port_no, self.pad[0], self.pad[1], self.queue_id, self.tx_bytes, self.tx_packets, self.tx_errors)
+    return packed
+
+def ofp_queue_stats_pack_into(self, buffer, offset=0):
+    ofp_queue_stats_struct.pack_into(buffer, offset, self.port_no, self.pad[0], self.pad[1], self.queue_id, self.tx_bytes, self.tx_packets, self.tx_errors)
+    offset += 32
+    return offset
+
+def ofp_queue_stats_unpack(self, binaryString):
+    if (len(binaryString) < 32):
+        return binaryString
+    (self.port_no, self.pad[0], self.pad[1], self.queue_id, self.tx_bytes, self.tx_packets, self.tx_errors,) = ofp_queue_stats_struct.unpack_from(binaryString)
+    return binaryString[32:]
+
+def ofp_queue_stats_unpack_from(self, buffer, offset=0):
+    (self.port_no, self.pad[0], self.pad[1], self.queue_id, self.tx_bytes, self.tx_packets, self.tx_errors,) = ofp_queue_stats_struct.unpack_from(buffer, offset)
+    return offset+32
+
+##Struct of ofp_queue_stats_request
+ofp_queue_stats_request_struct = struct.Struct('!HBBL')
+
+def ofp_queue_stats_request_pack(self, assertstruct=True):
+    if (assertstruct):
+        if (not isinstance(self.pad, list) or len(self.pad) != 2):
+            return None
+    packed = ofp_queue_stats_request_struct.pack(self.port_no, self.pad[0], self.pad[1], self.queue_id)
+    return packed
+
+def ofp_queue_stats_request_pack_into(self, buffer, offset=0):
+    ofp_queue_stats_request_struct.pack_into(buffer, offset, self.port_no, self.pad[0], self.pad[1], self.queue_id)
+    offset += 8
+    return offset
+
+def ofp_queue_stats_request_unpack(self, binaryString):
+    if (len(binaryString) < 8):
+        return binaryString
+    (self.port_no, self.pad[0], self.pad[1], self.queue_id,) = ofp_queue_stats_request_struct.unpack_from(binaryString)
+    return binaryString[8:]
+
+def ofp_queue_stats_request_unpack_from(self, buffer, offset=0):
+    (self.port_no, self.pad[0], self.pad[1], self.queue_id,) = ofp_queue_stats_request_struct.unpack_from(buffer, offset)
+    return offset+8
+
+##Struct of ofp_stats_reply
+ofp_stats_reply_struct = struct.Struct('!BBHLHH')
+
+def ofp_stats_reply_pack(self, assertstruct=True):
+    _n0 = self.header
+    if (assertstruct):
+        if (not isinstance(self.header, ofp_header) or not (_n0.type in ofp_type_map)):
+            return None
+    packed = ofp_stats_reply_struct.pack(_n0.version, _n0.type, _n0.length, _n0.xid, self.type, self.flags)
+    if (len(self.body) > 0):
+        packed += struct.pack('!%dB' % len(self.body), *self.body)
+    return packed
+
+def ofp_stats_reply_pack_into(self, buffer, offset=0):
+    _n0 = self.header
+    ofp_stats_reply_struct.pack_into(buffer, offset, _n0.version, _n0.type, _n0.length, _n0.xid, self.type, self.flags)
+    offset += 12
+    struct.pack_into('!%dB' % len(self.body), buffer, offset, *self.body)
+    offset += len(self.body)
+    return offset
+
+def ofp_stats_reply_unpack(self, binaryString):
+    if (len(binaryString) < 12):
+        return binaryString
+    _n0 = self.header
+    (_n0.version, _n0.type, _n0.length, _n0.xid, self.type, self.flags,) = ofp_stats_reply_struct.unpack_from(binaryString)
+    return binaryString[12:]
+
+def ofp_stats_reply_unpack_from(self, buffer, offset=0):
+    _n0 = self.header
+    (_n0.version, _n0.type, _n0.length, _n0.xid, self.type, self.flags,) = ofp_stats_reply_struct.unpack_from(buffer, offset)
+    return offset+12
+
+##Struct of ofp_stats_request
+ofp_stats_request_struct = struct.Struct('!BBHLHH')
+
+def ofp_stats_request_pack(self, assertstruct=True):
+    _n0 = self.header
+    if (assertstruct):
+        if (not isinstance(self.header, ofp_header) or not (_n0.type in ofp_type_map)):
+            return None
+    packed = ofp_stats_request_struct.pack(_n0.version, _n0.type, _n0.length, _n0.xid, self.type, self.flags)
+    if (len(self.body) > 0):
+        packed += struct.pack('!%dB' % len(self.body), *self.body)
+    return packed
+
+def ofp_stats_request_pack_into(self, buffer, offset=0):
+    _n0 = self.header
+    ofp_stats_request_struct.pack_into(buffer, offset, _n0.version, _n0.type, _n0.length, _n0.xid, self.type, self.flags)
+    offset += 12
+    struct.pack_into('!%dB' % len(self.body), buffer, offset, *self.body)
+    offset += len(self.body)
+    return offset
+
+def ofp_stats_request_unpack(self, binaryString):
+    if (len(binaryString) < 12):
+        return binaryString
+    _n0 = self.header
+    (_n0.version, _n0.type, _n0.length, _n0.xid, self.type, self.flags,) = ofp_stats_request_struct.unpack_from(binaryString)
+    return binaryString[12:]
+
+def ofp_stats_request_unpack_from(self, buffer, offset=0):
+    _n0 = self.header
+    (_n0.version, _n0.type, _n0.length, _n0.xid, self.type, self.flags,) = ofp_stats_request_struct.unpack_from(buffer, offset)
+    return offset+12
+
+##Struct of ofp_switch_config
+ofp_switch_config_struct = struct.Struct('!BBHLHH')
+
+def ofp_switch_config_pack(self, assertstruct=True):
+    _n0 = self.header
+    if (assertstruct):
+        if (not isinstance(self.header, ofp_header) or not (_n0.type in ofp_type_map)):
+            return None
+    packed = ofp_switch_config_struct.pack(_n0.version, _n0.type, _n0.length, _n0.xid, self.flags, self.miss_send_len)
+    return packed
+
+def ofp_switch_config_pack_into(self, buffer, offset=0):
+    _n0 = self.header
+    ofp_switch_config_struct.pack_into(buffer, offset, _n0.version, _n0.type, _n0.length, _n0.xid, self.flags, self.miss_send_len)
+    offset += 12
+    return offset
+
+def ofp_switch_config_unpack(self, binaryString):
+    if (len(binaryString) < 12):
+        return binaryString
+    _n0 = self.header
+    (_n0.version, _n0.type, _n0.length, _n0.xid, self.flags, self.miss_send_len,) = ofp_switch_config_struct.unpack_from(binaryString)
+    return binaryString[12:]
+
+def ofp_switch_config_unpack_from(self, buffer, offset=0):
+    _n0 = self.header
+    (_n0.version, _n0.type, _n0.length, _n0.xid, self.flags, self.miss_send_len,) = ofp_switch_config_struct.unpack_from(buffer, offset)
+    return offset+12
+
+##Struct of ofp_switch_features
+ofp_switch_features_struct = struct.Struct('!BBHLQLBBBBLL')
+
+def ofp_switch_features_pack(self, assertstruct=True):
+    _n0 = self.header
+    if (assertstruct):
+        if (not isinstance(self.header, ofp_header) or not isinstance(self.pad, list) or len(self.pad) != 3 or not (_n0.type in ofp_type_map)):
+            return None
+    packed = ofp_switch_features_struct.pack(_n0.version, _n0.type, _n0.length, _n0.xid, self.datapath_id, self.n_buffers, self.n_tables, self.pad[0], self.pad[1], self.pad[2], self.capabilities, self.actions)
+    for i in self.ports:
+        packed += i.pack(assertstruct)
+    return packed
+
+def ofp_switch_features_pack_into(self, buffer, offset=0):
+    _n0 = self.header
+    ofp_switch_features_struct.pack_into(buffer, offset, _n0.version, _n0.type, _n0.length, _n0.xid, self.datapath_id, self.n_buffers, self.n_tables, self.pad[0], self.pad[1], self.pad[2], self.capabilities, self.actions)
+    offset += 32
+    for i in self.ports:
+        p = i.pack(False)
+        buffer[offset:offset+len(p)] = p
+        offset += len(p)
+    return offset
+
+def ofp_switch_features_unpack(self, binaryString):
+    if (len(binaryString) < 32):
+        return binaryString
+    _n0 = self.header
+    (_n0.version, _n0.type, _n0.length, _n0.xid, self.datapath_id, self.n_buffers, self.n_tables, self.pad[0], self.pad[1], self.pad[2], self.capabilities, self.actions,) = ofp_switch_features_struct.unpack_from(binaryString)
+    return binaryString[32:]
+
+def ofp_switch_features_unpack_from(self, buffer, offset=0):
+    _n0 = self.header
+    (_n0.version, _n0.type, _n0.length, _n0.xid, self.datapath_id, self.n_buffers, self.n_tables, self.pad[0], self.pad[1], self.pad[2], self.capabilities, self.actions,) = ofp_switch_features_struct.unpack_from(buffer, offset)
+    return offset+32
+
+##Struct of ofp_table_stats
+ofp_table_stats_struct = struct.Struct('!BBBB32sLLLQQ')
+
+def ofp_table_stats_pack(self, assertstruct=True):
+    if (assertstruct):
+        if (not isinstance(self.pad, list) or len(self.pad) != 3 or not isinstance(self.name, str) or len(self.name) > 32):
+            return None
+    packed = ofp_table_stats_struct.pack(self.table_id, self.pad[0], self.pad[1], self.pad[2], self.name, self.wildcards, self.max_entries, self.active_count, self.lookup_count, self.matched_count)
+    return packed
+
+def ofp_table_stats_pack_into(self, buffer, offset=0):
+    ofp_table_stats_struct.pack_into(buffer, offset, self.table_id, self.pad[0], self.pad[1], self.pad[2], self.name, self.wildcards, self.max_entries, self.active_count, self.lookup_count, self.matched_count)
+    offset += 64
+    return offset
+
+def ofp_table_stats_unpack(self, binaryString):
+    if (len(binaryString) < 64):
+        return binaryString
+    (self.table_id, self.pad[0], self.pad[1], self.pad[2], self.name, self.wildcards, self.max_entries, self.active_count, self.lookup_count, self.matched_count,) = ofp_table_stats_struct.unpack_from(binaryString)
+    self.name = self.name[:self.name.find('\0')]
+    return binaryString[64:]
+
+def ofp_table_stats_unpack_from(self, buffer, offset=0):
+    (self.table_id, self.pad[0], self.pad[1], self.pad[2], self.name, self.wildcards, self.max_entries, self.active_count, self.lookup_count, self.matched_count,) = ofp_table_stats_struct.unpack_from(buffer, offset)
+    self.name = self.name[:self.name.find('\0')]
+    return offset+64
+
+##Struct of ofp_vendor_header
+ofp_vendor_header_struct = struct.Struct('!BBHLL')
+
+def ofp_vendor_header_pack(self, assertstruct=True):
+    _n0 = self.header
+    if (assertstruct):
+        if (not isinstance(self.header, ofp_header) or not (_n0.type in ofp_type_map)):
+            return None
+    packed = ofp_vendor_header_struct.pack(_n0.version, _n0.type, _n0.length, _n0.xid, self.vendor)
+    return packed
+
+def ofp_vendor_header_pack_into(self, buffer, offset=0):
+    _n0 = self.header
+    ofp_vendor_header_struct.pack_into(buffer, offset, _n0.version, _n0.type, _n0.length, _n0.xid, self.vendor)
+    offset += 12
+    return offset
+
+def ofp_vendor_header_unpack(self, binaryString):
+    if (len(binaryString) < 12):
+        return binaryString
+    _n0 = self.header
+    (_n0.version, _n0.type, _n0.length, _n0.xid, self.vendor,) = ofp_vendor_header_struct.unpack_from(binaryString)
+    return binaryString[12:]
+
+def ofp_vendor_header_unpack_from(self, buffer, offset=0):
+    _n0 = self.header
+    (_n0.version, _n0.type, _n0.length, _n0.xid, self.vendor,) = ofp_vendor_header_struct.unpack_from(buffer, offset)
+    return offset+12
+
+##Dictionary of (format, attributes, methods) by class name
+CODECS = {
+    'ofp_action_dl_addr': ('HHBBBBBBBBBBBB',
+        [('type', 'field', 'H', 0),
+         ('len', 'field', 'H', 2),
+         ('dl_addr', 'array', 'BBBBBB', 4),
+         ('pad', 'array', 'BBBBBB', 10)],
+        {'pack': ofp_action_dl_addr_pack, 'unpack': ofp_action_dl_addr_unpack, 'pack_into': ofp_action_dl_addr_pack_into, 'unpack_from': ofp_action_dl_addr_unpack_from}),
+    'ofp_action_enqueue': ('HHHBBBBBBL',
+        [('type', 'field', 'H', 0),
+         ('len', 'field', 'H', 2),
+         ('port', 'field', 'H', 4),
+         ('pad', 'array', 'BBBBBB', 6),
+         ('queue_id', 'field', 'L', 12)],
+        {'pack': ofp_action_enqueue_pack, 'unpack': ofp_action_enqueue_unpack, 'pack_into': ofp_action_enqueue_pack_into, 'unpack_from': ofp_action_enqueue_unpack_from}),
+    'ofp_action_header': ('HHBBBB',
+        [('type', 'field', 'H', 0),
+         ('len', 'field', 'H', 2),
+         ('pad', 'array', 'BBBB', 4)],
+        {'pack': ofp_action_header_pack, 'unpack': ofp_action_header_unpack, 'pack_into': ofp_action_header_pack_into, 'unpack_from': ofp_action_header_unpack_from}),
+    'ofp_action_nw_addr': ('HHL',
+        [('type', 'field', 'H', 0),
+         ('len', 'field', 'H', 2),
+         ('nw_addr', 'field', 'L', 4)],
+        {'pack': ofp_action_nw_addr_pack, 'unpack': ofp_action_nw_addr_unpack, 'pack_into': ofp_action_nw_addr_pack_into, 'unpack_from': ofp_action_nw_addr_unpack_from}),
+    'ofp_action_nw_tos': ('HHBBBB',
+        [('type', 'field', 'H', 0),
+         ('len', 'field', 'H', 2),
+         ('nw_tos', 'field', 'B', 4),
+         ('pad', 'array', 'BBB', 5)],
+        {'pack': ofp_action_nw_tos_pack, 'unpack': ofp_action_nw_tos_unpack, 'pack_into': ofp_action_nw_tos_pack_into, 'unpack_from': ofp_action_nw_tos_unpack_from}),
+    'ofp_action_output': ('HHHH',
+        [('type', 'field', 'H', 0),
+         ('len', 'field', 'H', 2),
+         ('port', 'field', 'H', 4),
+         ('max_len', 'field', 'H', 6)],
+        {'pack': ofp_action_output_pack, 'unpack': ofp_action_output_unpack, 'pack_into': ofp_action_output_pack_into, 'unpack_from': ofp_action_output_unpack_from}),
+    'ofp_action_tp_port': ('HHHBB',
+        [('type', 'field', 'H', 0),
+         ('len', 'field', 'H', 2),
+         ('tp_port', 'field', 'H', 4),
+         ('pad', 'array', 'BB', 6)],
+        {'pack': ofp_action_tp_port_pack, 'unpack': ofp_action_tp_port_unpack, 'pack_into': ofp_action_tp_port_pack_into, 'unpack_from': ofp_action_tp_port_unpack_from}),
+    'ofp_action_vendor_header': ('HHL',
+        [('type', 'field', 'H', 0),
+         ('len', 'field', 'H', 2),
+         ('vendor', 'field', 'L', 4)],
+        {'pack': ofp_action_vendor_header_pack, 'unpack': ofp_action_vendor_header_unpack, 'pack_into': ofp_action_vendor_header_pack_into, 'unpack_from': ofp_action_vendor_header_unpack_from}),
+    'ofp_action_vlan_pcp': ('HHBBBB',
+        [('type', 'field', 'H', 0),
+         ('len', 'field', 'H', 2),
+         ('vlan_pcp', 'field', 'B', 4),
+         ('pad', 'array', 'BBB', 5)],
+        {'pack': ofp_action_vlan_pcp_pack, 'unpack': ofp_action_vlan_pcp_unpack, 'pack_into': ofp_action_vlan_pcp_pack_into, 'unpack_from': ofp_action_vlan_pcp_unpack_from}),
+    'ofp_action_vlan_vid': ('HHHBB',
+        [('type', 'field', 'H', 0),
+         ('len', 'field', 'H', 2),
+         ('vlan_vid', 'field', 'H', 4),
+         ('pad', 'array', 'BB', 6)],
+        {'pack': ofp_action_vlan_vid_pack, 'unpack': ofp_action_vlan_vid_unpack, 'pack_into': ofp_action_vlan_vid_pack_into, 'unpack_from': ofp_action_vlan_vid_unpack_from}),
+    'ofp_aggregate_stats_reply': ('QQLBBBB',
+        [('packet_count', 'field', 'Q', 0),
+         ('byte_count', 'field', 'Q', 8),
+         ('flow_count', 'field', 'L', 16),
+         ('pad', 'array', 'BBBB', 20)],
+        {'pack': ofp_aggregate_stats_reply_pack, 'unpack': ofp_aggregate_stats_reply_unpack, 'pack_into': ofp_aggregate_stats_reply_pack_into, 'unpack_from': ofp_aggregate_stats_reply_unpack_from}),
+    'ofp_aggregate_stats_request': ('LHBBBBBBBBBBBBHBBHBBBBLLHHBBH',
+        [('match', 'nested', ofp_match, 0),
+         ('table_id', 'field', 'B', 40),
+         ('pad', 'field', 'B', 41),
+         ('out_port', 'field', 'H', 42)],
+        {'pack': ofp_aggregate_stats_request_pack, 'unpack': ofp_aggregate_stats_request_unpack, 'pack_into': ofp_aggregate_stats_request_pack_into, 'unpack_from': ofp_aggregate_stats_request_unpack_from}),
+    'ofp_desc_stats': ('256s256s256s32s256s',
+        [('mfr_desc', 'string', '256s', 0),
+         ('hw_desc', 'string', '256s', 256),
+         ('sw_desc', 'string', '256s', 512),
+         ('serial_num', 'string', '32s', 768),
+         ('dp_desc', 'string', '256s', 800)],
+        {'pack': ofp_desc_stats_pack, 'unpack': ofp_desc_stats_unpack, 'pack_into': ofp_desc_stats_pack_into, 'unpack_from': ofp_desc_stats_unpack_from}),
+    'ofp_error_msg': ('BBHLHH',
+        [('header', 'nested', ofp_header, 0),
+         ('type', 'field', 'H', 8),
+         ('code', 'field', 'H', 10),
+         ('data', 'tail', None, None)],
+        {'pack': ofp_error_msg_pack, 'unpack': ofp_error_msg_unpack, 'pack_into': ofp_error_msg_pack_into, 'unpack_from': ofp_error_msg_unpack_from}),
+    'ofp_flow_mod': ('BBHLLHBBBBBBBBBBBBHBBHBBBBLLHHQHHHHLHH',
+        [('header', 'nested', ofp_header, 0),
+         ('match', 'nested', ofp_match, 8),
+         ('cookie', 'field', 'Q', 48),
+         ('command', 'field', 'H', 56),
+         ('idle_timeout', 'field', 'H', 58),
+         ('hard_timeout', 'field', 'H', 60),
+         ('priority', 'field', 'H', 62),
+         ('buffer_id', 'field', 'L', 64),
+         ('out_port', 'field', 'H', 68),
+         ('flags', 'field', 'H', 70),
+         ('actions', 'tail', None, None)],
+        {'pack': ofp_flow_mod_pack, 'unpack': ofp_flow_mod_unpack, 'pack_into': ofp_flow_mod_pack_into, 'unpack_from': ofp_flow_mod_unpack_from}),
+    'ofp_flow_removed': ('BBHLLHBBBBBBBBBBBBHBBHBBBBLLHHQHBBLLHBBQQ',
+        [('header', 'nested', ofp_header, 0),
+         ('match', 'nested', ofp_match, 8),
+         ('cookie', 'field', 'Q', 48),
+         ('priority', 'field', 'H', 56),
+         ('reason', 'field', 'B', 58),
+         ('pad', 'field', 'B', 59),
+         ('duration_sec', 'field', 'L', 60),
+         ('duration_nsec', 'field', 'L', 64),
+         ('idle_timeout', 'field', 'H', 68),
+         ('pad2', 'array', 'BB', 70),
+         ('packet_count', 'field', 'Q', 72),
+         ('byte_count', 'field', 'Q', 80)],
+        {'pack': ofp_flow_removed_pack, 'unpack': ofp_flow_removed_unpack, 'pack_into': ofp_flow_removed_pack_into, 'unpack_from': ofp_flow_removed_unpack_from}),
+    'ofp_flow_stats': ('HBBLHBBBBBBBBBBBBHBBHBBBBLLHHLLHHHBBBBBBQQQ',
+        [('length', 'field', 'H', 0),
+         ('table_id', 'field', 'B', 2),
+         ('pad', 'field', 'B', 3),
+         ('match', 'nested', ofp_match, 4),
+         ('duration_sec', 'field', 'L', 44),
+         ('duration_nsec', 'field', 'L', 48),
+         ('priority', 'field', 'H', 52),
+         ('idle_timeout', 'field', 'H', 54),
+         ('hard_timeout', 'field', 'H', 56),
+         ('pad2', 'array', 'BBBBBB', 58),
+         ('cookie', 'field', 'Q', 64),
+         ('packet_count', 'field', 'Q', 72),
+         ('byte_count', 'field', 'Q', 80),
+         ('actions', 'tail', None, None)],
+        {'pack': ofp_flow_stats_pack, 'unpack': ofp_flow_stats_unpack, 'pack_into': ofp_flow_stats_pack_into, 'unpack_from': ofp_flow_stats_unpack_from}),
+    'ofp_flow_stats_request': ('LHBBBBBBBBBBBBHBBHBBBBLLHHBBH',
+        [('match', 'nested', ofp_match, 0),
+         ('table_id', 'field', 'B', 40),
+         ('pad', 'field', 'B', 41),
+         ('out_port', 'field', 'H', 42)],
+        {'pack': ofp_flow_stats_request_pack, 'unpack': ofp_flow_stats_request_unpack, 'pack_into': ofp_flow_stats_request_pack_into, 'unpack_from': ofp_flow_stats_request_unpack_from}),
+    'ofp_header': ('BBHL',
+        [('version', 'field', 'B', 0),
+         ('type', 'field', 'B', 1),
+         ('length', 'field', 'H', 2),
+         ('xid', 'field', 'L', 4)],
+        {'pack': ofp_header_pack, 'unpack': ofp_header_unpack, 'pack_into': ofp_header_pack_into, 'unpack_from': ofp_header_unpack_from}),
+    'ofp_hello': ('BBHL',
+        [('header', 'nested', ofp_header, 0)],
+        {'pack': ofp_hello_pack, 'unpack': ofp_hello_unpack, 'pack_into': ofp_hello_pack_into, 'unpack_from': ofp_hello_unpack_from}),
+    'ofp_match': ('LHBBBBBBBBBBBBHBBHBBBBLLHH',
+        [('wildcards', 'field', 'L', 0),
+         ('in_port', 'field', 'H', 4),
+         ('dl_src', 'array', 'BBBBBB', 6),
+         ('dl_dst', 'array', 'BBBBBB', 12),
+         ('dl_vlan', 'field', 'H', 18),
+         ('dl_vlan_pcp', 'field', 'B', 20),
+         ('pad1', 'field', 'B', 21),
+         ('dl_type', 'field', 'H', 22),
+         ('nw_tos', 'field', 'B', 24),
+         ('nw_proto', 'field', 'B', 25),
+         ('pad2', 'array', 'BB', 26),
+         ('nw_src', 'field', 'L', 28),
+         ('nw_dst', 'field', 'L', 32),
+         ('tp_src', 'field', 'H', 36),
+         ('tp_dst', 'field', 'H', 38)],
+        {'pack': ofp_match_pack, 'unpack': ofp_match_unpack, 'pack_into': ofp_match_pack_into, 'unpack_from': ofp_match_unpack_from}),
+    'ofp_packet_in': ('BBHLLHHBB',
+        [('header', 'nested', ofp_header, 0),
+         ('buffer_id', 'field', 'L', 8),
+         ('total_len', 'field', 'H', 12),
+         ('in_port', 'field', 'H', 14),
+         ('reason', 'field', 'B', 16),
+         ('pad', 'field', 'B', 17),
+         ('data', 'tail', None, None)],
+        {'pack': ofp_packet_in_pack, 'unpack': ofp_packet_in_unpack, 'pack_into': ofp_packet_in_pack_into, 'unpack_from': ofp_packet_in_unpack_from}),
+    'ofp_packet_out': ('BBHLLHH',
+        [('header', 'nested', ofp_header, 0),
+         ('buffer_id', 'field', 'L', 8),
+         ('in_port', 'field', 'H', 12),
+         ('actions_len', 'field', 'H', 14),
+         ('actions', 'tail', None, None)],
+        {'pack': ofp_packet_out_pack, 'unpack': ofp_packet_out_unpack, 'pack_into': ofp_packet_out_pack_into, 'unpack_from': ofp_packet_out_unpack_from}),
+    'ofp_packet_queue': ('LHBB',
+        [('queue_id', 'field', 'L', 0),
+         ('len', 'field', 'H', 4),
+         ('pad', 'array', 'BB', 6),
+         ('properties', 'tail', None, None)],
+        {'pack': ofp_packet_queue_pack, 'unpack': ofp_packet_queue_unpack, 'pack_into': ofp_packet_queue_pack_into, 'unpack_from': ofp_packet_queue_unpack_from}),
+    'ofp_phy_port': ('HBBBBBB16sLLLLLL',
+        [('port_no', 'field', 'H', 0),
+         ('hw_addr', 'array', 'BBBBBB', 2),
+         ('name', 'string', '16s', 8),
+         ('config', 'field', 'L', 24),
+         ('state', 'field', 'L', 28),
+         ('curr', 'field', 'L', 32),
+         ('advertised', 'field', 'L', 36),
+         ('supported', 'field', 'L', 40),
+         ('peer', 'field', 'L', 44)],
+        {'pack': ofp_phy_port_pack, 'unpack': ofp_phy_port_unpack, 'pack_into': ofp_phy_port_pack_into, 'unpack_from': ofp_phy_port_unpack_from}),
+    'ofp_port_mod': ('BBHLHBBBBBBLLLBBBB',
+        [('header', 'nested', ofp_header, 0),
+         ('port_no', 'field', 'H', 8),
+         ('hw_addr', 'array', 'BBBBBB', 10),
+         ('config', 'field', 'L', 16),
+         ('mask', 'field', 'L', 20),
+         ('advertise', 'field', 'L', 24),
+         ('pad', 'array', 'BBBB', 28)],
+        {'pack': ofp_port_mod_pack, 'unpack': ofp_port_mod_unpack, 'pack_into': ofp_port_mod_pack_into, 'unpack_from': ofp_port_mod_unpack_from}),
+    'ofp_port_stats': ('HBBBBBBQQQQQQQQQQQQ',
+        [('port_no', 'field', 'H', 0),
+         ('pad', 'array', 'BBBBBB', 2),
+         ('rx_packets', 'field', 'Q', 8),
+         ('tx_packets', 'field', 'Q', 16),
+         ('rx_bytes', 'field', 'Q', 24),
+         ('tx_bytes', 'field', 'Q', 32),
+         ('rx_dropped', 'field', 'Q', 40),
+         ('tx_dropped', 'field', 'Q', 48),
+         ('rx_errors', 'field', 'Q', 56),
+         ('tx_errors', 'field', 'Q', 64),
+         ('rx_frame_err', 'field', 'Q', 72),
+         ('rx_over_err', 'field', 'Q', 80),
+         ('rx_crc_err', 'field', 'Q', 88),
+         ('collisions', 'field', 'Q', 96)],
+        {'pack': ofp_port_stats_pack, 'unpack': ofp_port_stats_unpack, 'pack_into': ofp_port_stats_pack_into, 'unpack_from': ofp_port_stats_unpack_from}),
+    'ofp_port_stats_request': ('HBBBBBB',
+        [('port_no', 'field', 'H', 0),
+         ('pad', 'array', 'BBBBBB', 2)],
+        {'pack': ofp_port_stats_request_pack, 'unpack': ofp_port_stats_request_unpack, 'pack_into': ofp_port_stats_request_pack_into, 'unpack_from': ofp_port_stats_request_unpack_from}),
+    'ofp_port_status': ('BBHLBBBBBBBBHBBBBBB16sLLLLLL',
+        [('header', 'nested', ofp_header, 0),
+         ('reason', 'field', 'B', 8),
+         ('pad', 'array', 'BBBBBBB', 9),
+         ('desc', 'nested', ofp_phy_port, 16)],
+        {'pack': ofp_port_status_pack, 'unpack': ofp_port_status_unpack, 'pack_into': ofp_port_status_pack_into, 'unpack_from': ofp_port_status_unpack_from}),
+    'ofp_queue_get_config_reply': ('BBHLHBBBBBB',
+        [('header', 'nested', ofp_header, 0),
+         ('port', 'field', 'H', 8),
+         ('pad', 'array', 'BBBBBB', 10),
+         ('queues', 'tail', None, None)],
+        {'pack': ofp_queue_get_config_reply_pack, 'unpack': ofp_queue_get_config_reply_unpack, 'pack_into': ofp_queue_get_config_reply_pack_into, 'unpack_from': ofp_queue_get_config_reply_unpack_from}),
+    'ofp_queue_get_config_request': ('BBHLHBB',
+        [('header', 'nested', ofp_header, 0),
+         ('port', 'field', 'H', 8),
+         ('pad', 'array', 'BB', 10)],
+        {'pack': ofp_queue_get_config_request_pack, 'unpack': ofp_queue_get_config_request_unpack, 'pack_into': ofp_queue_get_config_request_pack_into, 'unpack_from': ofp_queue_get_config_request_unpack_from}),
+    'ofp_queue_prop_header': ('HHBBBB',
+        [('property', 'field', 'H', 0),
+         ('len', 'field', 'H', 2),
+         ('pad', 'array', 'BBBB', 4)],
+        {'pack': ofp_queue_prop_header_pack, 'unpack': ofp_queue_prop_header_unpack, 'pack_into': ofp_queue_prop_header_pack_into, 'unpack_from': ofp_queue_prop_header_unpack_from}),
+    'ofp_queue_prop_min_rate': ('HHBBBBHBBBBBB',
+        [('prop_header', 'nested', ofp_queue_prop_header, 0),
+         ('rate', 'field', 'H', 8),
+         ('pad', 'array', 'BBBBBB', 10)],
+        {'pack': ofp_queue_prop_min_rate_pack, 'unpack': ofp_queue_prop_min_rate_unpack, 'pack_into': ofp_queue_prop_min_rate_pack_into, 'unpack_from': ofp_queue_prop_min_rate_unpack_from}),
+    'ofp_queue_stats': ('HBBLQQQ',
+        [('port_no', 'field', 'H', 0),
+         ('pad', 'array', 'BB', 2),
+         ('queue_id', 'field', 'L', 4),
+         ('tx_bytes', 'field', 'Q', 8),
+         ('tx_packets', 'field', 'Q', 16),
+         ('tx_errors', 'field', 'Q', 24)],
+        {'pack': ofp_queue_stats_pack, 'unpack': ofp_queue_stats_unpack, 'pack_into': ofp_queue_stats_pack_into, 'unpack_from': ofp_queue_stats_unpack_from}),
+    'ofp_queue_stats_request': ('HBBL',
+        [('port_no', 'field', 'H', 0),
+         ('pad', 'array', 'BB', 2),
+         ('queue_id', 'field', 'L', 4)],
+        {'pack': ofp_queue_stats_request_pack, 'unpack': ofp_queue_stats_request_unpack, 'pack_into': ofp_queue_stats_request_pack_into, 'unpack_from': ofp_queue_stats_request_unpack_from}),
+    'ofp_stats_reply': ('BBHLHH',
+        [('header', 'nested', ofp_header, 0),
+         ('type', 'field', 'H', 8),
+         ('flags', 'field', 'H', 10),
+         ('body', 'tail', None, None)],
+        {'pack': ofp_stats_reply_pack, 'unpack': ofp_stats_reply_unpack, 'pack_into': ofp_stats_reply_pack_into, 'unpack_from': ofp_stats_reply_unpack_from}),
+    'ofp_stats_request': ('BBHLHH',
+        [('header', 'nested', ofp_header, 0),
+         ('type', 'field', 'H', 8),
+         ('flags', 'field', 'H', 10),
+         ('body', 'tail', None, None)],
+        {'pack': ofp_stats_request_pack, 'unpack': ofp_stats_request_unpack, 'pack_into': ofp_stats_request_pack_into, 'unpack_from': ofp_stats_request_unpack_from}),
+    'ofp_switch_config': ('BBHLHH',
+        [('header', 'nested', ofp_header, 0),
+         ('flags', 'field', 'H', 8),
+         ('miss_send_len', 'field', 'H', 10)],
+        {'pack': ofp_switch_config_pack, 'unpack': ofp_switch_config_unpack, 'pack_into': ofp_switch_config_pack_into, 'unpack_from': ofp_switch_config_unpack_from}),
+    'ofp_switch_features': ('BBHLQLBBBBLL',
+        [('header', 'nested', ofp_header, 0),
+         ('datapath_id', 'field', 'Q', 8),
+         ('n_buffers', 'field', 'L', 16),
+         ('n_tables', 'field', 'B', 20),
+         ('pad', 'array', 'BBB', 21),
+         ('capabilities', 'field', 'L', 24),
+         ('actions', 'field', 'L', 28),
+         ('ports', 'tail', None, None)],
+        {'pack': ofp_switch_features_pack, 'unpack': ofp_switch_features_unpack, 'pack_into': ofp_switch_features_pack_into, 'unpack_from': ofp_switch_features_unpack_from}),
+    'ofp_table_stats': ('BBBB32sLLLQQ',
+        [('table_id', 'field', 'B', 0),
+         ('pad', 'array', 'BBB', 1),
+         ('name', 'string', '32s', 4),
+         ('wildcards', 'field', 'L', 36),
+         ('max_entries', 'field', 'L', 40),
+         ('active_count', 'field', 'L', 44),
+         ('lookup_count', 'field', 'Q', 48),
+         ('matched_count', 'field', 'Q', 56)],
+        {'pack': ofp_table_stats_pack, 'unpack': ofp_table_stats_unpack, 'pack_into': ofp_table_stats_pack_into, 'unpack_from': ofp_table_stats_unpack_from}),
+    'ofp_vendor_header': ('BBHLL',
+        [('header', 'nested', ofp_header, 0),
+         ('vendor', 'field', 'L', 8)],
+        {'pack': ofp_vendor_header_pack, 'unpack': ofp_vendor_header_unpack, 'pack_into': ofp_vendor_header_pack_into, 'unpack_from': ofp_vendor_header_unpack_from}),
+    }
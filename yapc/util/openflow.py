@@ -8,12 +8,17 @@
 import dpkt
 import struct
 import socket
+import bisect
+import threading
+import collections
 import yapc.pyopenflow as pyof
 import yapc.log.output as output
 import yapc.util.parse as pu
 
 ##Next transaction id to use
 last_xid = 0
+##Lock for transaction id
+xid_lock = threading.Lock()
 
 ##XID modes
 XID_MODES = {'SEQ': 0,
@@ -37,6 +42,30 @@ PRIORITY = {'HIGHEST':65535,
             'MUCH LOWER':8192,
             'LOWEST':0}
 
+##Struct of ofp_match on the wire (with MAC address as 16 and 32 bits)
+MATCH_STRUCT = struct.Struct("!LHHLHLHBxHBBxxLLHH")
+
+##Length of Ethernet header
+ETH_HEADER_LEN = 14
+##Struct of Ethernet addresses (as bytes)
+ETH_ADDR_BYTES = struct.Struct("!12B")
+##Struct of Ethernet addresses (as 16 and 32 bits)
+ETH_ADDR = struct.Struct("!HLHL")
+##Struct of 16-bit field (Ethernet type and VLAN tag)
+UINT16 = struct.Struct("!H")
+##Struct of 32-bit field (e.g., xid)
+UINT32 = struct.Struct("!L")
+##Struct of IPv4 header (version and header length, ToS, total length,
+##fragment offset, protocol, source and destination)
+IP_HEADER = struct.Struct("!BBHxxHxBxxLL")
+##Struct of ARP packet (operation, sender IP and target IP)
+ARP_HEADER = struct.Struct("!6xH6xL6xL")
+##Struct of TCP header (ports and data offset)
+TCP_HEADER = struct.Struct("!HH8xB7x")
+##Struct of UDP header (ports)
+UDP_HEADER = struct.Struct("!HH4x")
+##Struct of ICMP header (type and code)
+ICMP_HEADER = struct.Struct("!BB2x")
 
 
 class xid_reservation:
@@ -50,6 +79,7 @@ class xid_reservation:
     def __init__(self):
         """Initialize
         """
+        ##Sorted list of reserved ranges (start, end)
         self.reserved = []
 
     def reserve(self, start, end):
@@ -66,17 +96,24 @@ class xid_reservation:
         if (end > xid_reservation.END):
             return False
 
-        #Check overlap
-        okay = True
-        for (s,e) in self.reserved:
-            if not((e < start) or (s > end)):
-                okay = False
-
-        if (okay):
-            self.reserved.append((start,end))
-            return True
-        else:
+        #Check overlap with neighboring ranges
+        i = bisect.bisect_left(self.reserved, (start, end))
+        if ((i > 0) and (self.reserved[i-1][1] >= start)):
+            return False
+        if ((i < len(self.reserved)) and (self.reserved[i][0] <= end)):
             return False
+
+        self.reserved.insert(i, (start, end))
+        return True
+
+    def is_reserved(self, xid):
+        """Check if XID is reserved
+
+        @param xid xid to check
+        @return if xid is in a reserved range
+        """
+        i = bisect.bisect_right(self.reserved, (xid, xid_reservation.END))
+        return ((i > 0) and (self.reserved[i-1][1] >= xid))
             
 def get_xid():
     """Retrieve XID to use
@@ -86,23 +123,28 @@ def get_xid():
 
     In SEQ mode, simply start from 0 and add one each time
     In PRIVPUBLIC, the first bit = 1 is resereved
+
+    XID is never 0 and is safe to get from different threads.
     """
     global last_xid
     global xid_mode
 
+    xid_lock.acquire()
     if (xid_mode == XID_MODES['SEQ']):
         last_xid += 1
         if (last_xid > xid_reservation.END):
-            last_xid = 0
+            last_xid = 1
     elif xid_mode == XID_MODES['PRIVPUBLIC']:
         last_xid += 1
         if (last_xid >= xid_reservation.START):
-            last_xid = 0
+            last_xid = 1
+    xid = last_xid
+    xid_lock.release()
         
-    return last_xid
+    return xid
 
 def get_flow_id(ofp_match, ignore_l2=False):
-    """Generate flow id based on ofp_match
+    """Generate flow id based on ofp_match (or match)
 
     id has the following properties:
     * is the same for packets of the same TCP/UDP flow
@@ -110,7 +152,11 @@ def get_flow_id(ofp_match, ignore_l2=False):
     """
     t1 = ofp_match.dl_type
     t2 = ofp_match.nw_proto
-    daddr = [pu.array2val(ofp_match.dl_src), pu.array2val(ofp_match.dl_src)]
+    if (isinstance(ofp_match, match)):
+        daddr = [ofp_match.dl_src, ofp_match.dl_src]
+    else:
+        daddr = [pu.array2val(ofp_match.dl_src), 
+                 pu.array2val(ofp_match.dl_src)]
     d1 = min(daddr)
     d2 = max(daddr)
     naddr = [ofp_match.nw_src, ofp_match.nw_dst]
@@ -124,6 +170,252 @@ def get_flow_id(ofp_match, ignore_l2=False):
     else:
         return hash((t1,t2,d1,d2,n1,n2,t1,t2))
 
+def mac_array2val(mac):
+    """Get MAC address in array as 48-bit integer
+
+    @param mac MAC address as array of 6 bytes
+    @return MAC address as integer
+    """
+    return (mac[0] << 40) | (mac[1] << 32) | (mac[2] << 24) |\
+        (mac[3] << 16) | (mac[4] << 8) | mac[5]
+
+def mac_val2array(mac):
+    """Get MAC address as 48-bit integer in array
+
+    @param mac MAC address as integer
+    @return MAC address as array of 6 bytes
+    """
+    return [(mac >> 40) & 0xff, (mac >> 32) & 0xff, (mac >> 24) & 0xff,
+            (mac >> 16) & 0xff, (mac >> 8) & 0xff, mac & 0xff]
+
+##Fields of match (in order on the wire)
+MATCH_FIELDS = ["wildcards", "in_port", "dl_src", "dl_dst", 
+                "dl_vlan", "dl_vlan_pcp", "dl_type", "nw_tos", "nw_proto",
+                "nw_src", "nw_dst", "tp_src", "tp_dst"]
+
+class match(collections.namedtuple("match", MATCH_FIELDS+["key"])):
+    """Compact and hashable equivalent of ofp_match
+
+    MAC addresses are 48-bit integers, and the key is the match
+    packed as on the wire (40 bytes, with pads zeroed), which is
+    used for hashing and equality.  The key is computed when the
+    match is created, so fields are read-only (as for a tuple).
+
+    @author ykk
+    @date Oct 2011
+    """
+    __slots__ = ()
+    def __new__(cls, wildcards=0, in_port=0, dl_src=0, dl_dst=0,
+                dl_vlan=pyof.OFP_VLAN_NONE, dl_vlan_pcp=0, dl_type=0,
+                nw_tos=0, nw_proto=0, nw_src=0, nw_dst=0, 
+                tp_src=0, tp_dst=0):
+        """Create match
+
+        @param dl_src source MAC address as integer
+        @param dl_dst destination MAC address as integer
+        """
+        return tuple.__new__(cls, (wildcards, in_port, dl_src, dl_dst,
+                                   dl_vlan, dl_vlan_pcp, dl_type,
+                                   nw_tos, nw_proto, nw_src, nw_dst,
+                                   tp_src, tp_dst,
+                                   MATCH_STRUCT.pack(wildcards, in_port,
+                                                     dl_src >> 32, 
+                                                     dl_src & 0xffffffff,
+                                                     dl_dst >> 32, 
+                                                     dl_dst & 0xffffffff,
+                                                     dl_vlan, dl_vlan_pcp,
+                                                     dl_type, nw_tos, 
+                                                     nw_proto, nw_src,
+                                                     nw_dst, tp_src, tp_dst)))
+
+    def __hash__(self):
+        """Hash of match
+        """
+        return hash(self.key)
+
+    def __eq__(self, other):
+        """Return True if other is match with the same key
+        """
+        return (isinstance(other, match) and (self.key == other.key))
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __len__(self):
+        """Return length of match on the wire
+        """
+        return pyof.OFP_MATCH_BYTES
+
+    def pack(self):
+        """Pack match
+
+        @return match packed as on the wire
+        """
+        return self.key
+
+    def to_ofp_match(self):
+        """Get ofp_match equivalent
+
+        @return ofp_match
+        """
+        ofm = pyof.ofp_match()
+        ofm.wildcards = self.wildcards
+        ofm.in_port = self.in_port
+        ofm.dl_src = mac_val2array(self.dl_src)
+        ofm.dl_dst = mac_val2array(self.dl_dst)
+        ofm.dl_vlan = self.dl_vlan
+        ofm.dl_vlan_pcp = self.dl_vlan_pcp
+        ofm.dl_type = self.dl_type
+        ofm.nw_tos = self.nw_tos
+        ofm.nw_proto = self.nw_proto
+        ofm.nw_src = self.nw_src
+        ofm.nw_dst = self.nw_dst
+        ofm.tp_src = self.tp_src
+        ofm.tp_dst = self.tp_dst
+        return ofm
+
+    def show(self, prefix=''):
+        """Generate string showing members of match
+        """
+        outstr = ''
+        for name in MATCH_FIELDS:
+            value = getattr(self, name)
+            if (name in ["dl_src", "dl_dst"]):
+                outstr += prefix+name+': '+\
+                    pu.array2hex_str(mac_val2array(value))+'\n'
+            else:
+                outstr += prefix+name+': '+str(value)+'\n'
+        return outstr
+
+    def __repr__(self):
+        return "match("+self.show().strip().replace("\n", ", ")+")"
+
+def get_match(ofm):
+    """Get match from ofp_match
+
+    @param ofm ofp_match
+    @return match
+    """
+    return match(ofm.wildcards, ofm.in_port, 
+                 mac_array2val(ofm.dl_src), mac_array2val(ofm.dl_dst),
+                 ofm.dl_vlan, ofm.dl_vlan_pcp, ofm.dl_type,
+                 ofm.nw_tos, ofm.nw_proto, ofm.nw_src, ofm.nw_dst,
+                 ofm.tp_src, ofm.tp_dst)
+
+def key2match(key, offset=0):
+    """Get match from key (i.e., match packed as on the wire)
+
+    @param key buffer with match packed
+    @param offset offset of match in buffer
+    @return match
+    """
+    (wildcards, in_port, src_hi, src_lo, dst_hi, dst_lo, 
+     dl_vlan, dl_vlan_pcp, dl_type, nw_tos, nw_proto, 
+     nw_src, nw_dst, tp_src, tp_dst) = MATCH_STRUCT.unpack_from(key, offset)
+    return match(wildcards, in_port, 
+                 (src_hi << 32) | src_lo, (dst_hi << 32) | dst_lo,
+                 dl_vlan, dl_vlan_pcp, dl_type, nw_tos, nw_proto, 
+                 nw_src, nw_dst, tp_src, tp_dst)
+
+def get_packet_fields(packet):
+    """Get fields of packet after Ethernet addresses for match
+
+    Fields are read from fixed offsets of Ethernet, 802.1Q VLAN,
+    IPv4, ARP, TCP, UDP and ICMP headers, with the same result as 
+    get_ofp_match (i.e., using outermost Ethertype).  Transport ports
+    are not read from IP fragments (other than the first).
+
+    @param packet raw packet (at least ETH_HEADER_LEN long)
+    @return (dl_vlan, dl_vlan_pcp, dl_type, nw_tos, nw_proto, 
+             nw_src, nw_dst, tp_src, tp_dst)
+    """
+    dl_vlan = pyof.OFP_VLAN_NONE
+    dl_vlan_pcp = 0
+    nw_tos = nw_proto = nw_src = nw_dst = tp_src = tp_dst = 0
+    plen = len(packet)
+
+    #Ethernet and 802.1Q VLAN
+    dl_type = UINT16.unpack_from(packet, 12)[0]
+    ethtype = dl_type
+    offset = ETH_HEADER_LEN
+    if ((dl_type == dpkt.ethernet.ETH_TYPE_8021Q) and (plen >= offset+4)):
+        tag = UINT16.unpack_from(packet, offset)[0]
+        dl_vlan = tag & VLAN_ID_MASK
+        dl_vlan_pcp = (tag & VLAN_PRIORITY_MASK) >> VLAN_PRIORITY_SHIFT
+        ethtype = UINT16.unpack_from(packet, offset+2)[0]
+        offset += 4
+
+    if ((ethtype == dpkt.ethernet.ETH_TYPE_IP) and 
+        (plen >= offset+IP_HEADER.size)):
+        #IP
+        (vhl, tos, iplen, frag, proto, src, dst) = \
+            IP_HEADER.unpack_from(packet, offset)
+        hlen = (vhl & 0xf) << 2
+        if (hlen >= IP_HEADER.size):
+            nw_tos = tos
+            nw_proto = proto
+            nw_src = src
+            nw_dst = dst
+            #Transport within IP total length
+            l4len = min(plen, offset+iplen) - offset - hlen
+            offset += hlen
+            if (frag & 0x1fff):
+                pass
+            elif (proto == dpkt.ip.IP_PROTO_TCP):
+                if (l4len >= TCP_HEADER.size):
+                    (sport, dport, off) = TCP_HEADER.unpack_from(packet, offset)
+                    if ((off >> 4) >= 5):
+                        tp_src = sport
+                        tp_dst = dport
+            elif (proto == dpkt.ip.IP_PROTO_UDP):
+                if (l4len >= UDP_HEADER.size):
+                    (tp_src, tp_dst) = UDP_HEADER.unpack_from(packet, offset)
+            elif (proto == dpkt.ip.IP_PROTO_ICMP):
+                if (l4len >= ICMP_HEADER.size):
+                    (tp_src, tp_dst) = ICMP_HEADER.unpack_from(packet, offset)
+
+    elif ((ethtype == dpkt.ethernet.ETH_TYPE_ARP) and
+          (plen >= offset+ARP_HEADER.size)):
+        #ARP
+        (nw_proto, nw_src, nw_dst) = ARP_HEADER.unpack_from(packet, offset)
+
+    return (dl_vlan, dl_vlan_pcp, dl_type, nw_tos, nw_proto,
+            nw_src, nw_dst, tp_src, tp_dst)
+
+def get_fast_ofp_match(in_port, packet):
+    """Generate ofp_match from raw packet without parsing it with dpkt
+
+    @param in_port input port of packet
+    @param packet raw packet
+    @return ofp match
+    """
+    if (len(packet) < ETH_HEADER_LEN):
+        packet = str(packet).ljust(ETH_HEADER_LEN, "\0")
+    ofm = pyof.ofp_match()
+    ofm.in_port = in_port
+    addr = ETH_ADDR_BYTES.unpack_from(packet)
+    ofm.dl_dst = list(addr[:6])
+    ofm.dl_src = list(addr[6:])
+    (ofm.dl_vlan, ofm.dl_vlan_pcp, ofm.dl_type, ofm.nw_tos, ofm.nw_proto,
+     ofm.nw_src, ofm.nw_dst, ofm.tp_src, ofm.tp_dst) = get_packet_fields(packet)
+    return ofm
+
+def get_fast_match(in_port, packet):
+    """Generate match from raw packet without parsing it with dpkt
+
+    @param in_port input port of packet
+    @param packet raw packet
+    @return match
+    """
+    if (len(packet) < ETH_HEADER_LEN):
+        packet = str(packet).ljust(ETH_HEADER_LEN, "\0")
+    (dst_hi, dst_lo, src_hi, src_lo) = ETH_ADDR.unpack_from(packet)
+    (dl_vlan, dl_vlan_pcp, dl_type, nw_tos, nw_proto,
+     nw_src, nw_dst, tp_src, tp_dst) = get_packet_fields(packet)
+    return match(0, in_port, (src_hi << 32) | src_lo, (dst_hi << 32) | dst_lo,
+                 dl_vlan, dl_vlan_pcp, dl_type, nw_tos, nw_proto,
+                 nw_src, nw_dst, tp_src, tp_dst)
+
 def get_ofp_match(in_port, packet):
     """Generate ofp_match from raw packet
 